@@ -0,0 +1,232 @@
+import sys
+import time
+import inspect
+import traceback
+from Common_Functions import *
+from Plotting_Objects import headless_backend_func
+from Box_Plot import BoxPlotConstants, box_plot_func
+from Wind_Ready_Data_Generator import WindReadyConstants, wind_ready_func
+
+JOB_TYPE_DICT = {'box plot': (BoxPlotConstants, box_plot_func),
+                 'wind ready': (WindReadyConstants, wind_ready_func)}
+# job type: (constants class, function that runs the job)
+
+
+def job_parameters_func(job, defaults):
+    """
+    Builds the BoxPlotConstants or WindReadyConstants object for a job from the job file
+
+    Parameters
+    ----------
+    job : dict
+        job from the job file with a 'type' ('box plot' or 'wind ready'), an optional 'name' and the arguments of the
+        job type's constants class (EX: {'type': 'box plot', 'sites': ['BSE'], 'species': 'ch4', ...})
+    defaults : dict
+        arguments shared by all jobs (EX: {'file_path': 'E:/IDAT'}), only the ones the job type's constants class
+        takes are used and the job's own arguments take precedence
+
+    Returns
+    -------
+    str, str, object
+        job type, job name and the constants object
+    """
+    job = dict(job)
+    job_type = job.pop('type')
+    name = job.pop('name', None)
+    constants_class = JOB_TYPE_DICT[job_type][0]
+    arguments = inspect.signature(constants_class).parameters
+    job_arguments = {key: value for key, value in defaults.items() if key in arguments}
+    job_arguments.update(job)
+    data_parameters = constants_class(**job_arguments)
+    if name is None:
+        species = data_parameters.species
+        name = (job_type + ' ' + '_'.join(data_parameters.sites) + ' ' +
+                (species if isinstance(species, str) else '_'.join(species)))
+        if job_type == 'box plot':
+            name += ' ' + data_parameters.plot_type
+        name += ' ' + data_parameters.start_time[:10] + '__' + data_parameters.end_time[:10]
+        # naming the job after its parameters if the job file does not
+    return job_type, name, data_parameters
+
+
+def job_input_files_func(job_type, data_parameters):
+    """
+    Lists the CSV_out files a job will import
+
+    Parameters
+    ----------
+    job_type : str
+        'box plot' or 'wind ready'
+    data_parameters : object
+        BoxPlotConstants or WindReadyConstants object of the job
+
+    Returns
+    -------
+    list of str
+        list of file paths
+    """
+    file_paths = []
+    if job_type == 'box plot':
+        file_paths += file_path_generator_func(data_parameters.file_path, data_parameters.sites,
+                                               data_parameters.species, data_parameters.start_time,
+                                               data_parameters.end_time, catalog_path=data_parameters.catalog_path)
+        if data_parameters.plot_type == 'quarterly report' and data_parameters.history_path is None:
+            file_paths += file_path_generator_func(data_parameters.file_path, [data_parameters.sites[0]],
+                                                   data_parameters.species, ('2017' + data_parameters.start_time[4:]),
+                                                   data_parameters.end_time,
+                                                   catalog_path=data_parameters.catalog_path)
+            # historical data for the year quarter comparison (the history store only imports new quarters)
+    else:
+        species_list = data_parameters.species
+        if isinstance(species_list, str):
+            species_list = [species_list]
+        path_species_list = []
+        for species in species_list:
+            path_species = species_path_func(species)
+            if path_species is not None and path_species != 'met' and path_species not in path_species_list:
+                path_species_list.append(path_species)
+                file_paths += file_path_generator_func(data_parameters.file_path, data_parameters.sites, species,
+                                                       data_parameters.start_time, data_parameters.end_time,
+                                                       catalog_path=data_parameters.catalog_path)
+        if data_parameters.methane_match is True and 'voc' in path_species_list and 'ch4' not in path_species_list:
+            file_paths += file_path_generator_func(data_parameters.file_path, data_parameters.sites, 'ch4',
+                                                   data_parameters.start_time, data_parameters.end_time,
+                                                   catalog_path=data_parameters.catalog_path)
+        file_paths += wind_file_path_generator_func(data_parameters.file_path, data_parameters.sites,
+                                                    data_parameters.start_time, data_parameters.end_time,
+                                                    catalog_path=data_parameters.catalog_path)
+    return [os.path.normpath(path) for path in file_paths]
+
+
+def batch_job_func(job_type, name, data_parameters):
+    """
+    Runs a single job and catches any error so one failed job does not stop the batch
+
+    Parameters
+    ----------
+    job_type : str
+        'box plot' or 'wind ready'
+    name : str
+        name of the job
+    data_parameters : object
+        BoxPlotConstants or WindReadyConstants object of the job
+
+    Returns
+    -------
+    dict
+        job report with 'name', 'type', 'status' ('ok' or 'failed'), 'seconds' and 'error' keys
+    """
+    start = time.perf_counter()
+    try:
+        JOB_TYPE_DICT[job_type][1](data_parameters)
+        status, error = 'ok', ''
+    except Exception:
+        status, error = 'failed', traceback.format_exc()
+    return {'name': name, 'type': job_type, 'status': status, 'seconds': round(time.perf_counter() - start, 3),
+            'error': error}
+
+
+def batch_run_func(job_file_path):
+    """
+    Runs every job in a job file, parsing each input file only once for all of the jobs that need it
+
+    The job file is a json file:
+    {"defaults": {"file_path": "E:/IDAT", "zero_filter": false},
+     "cache_dir": "E:/BA_cache", "output_dir": "E:/figures", "workers": 4, "report_path": "E:/batch_report.csv",
+     "jobs": [{"type": "box plot", "sites": ["BSE", "LUR"], "species": "ch4", "plot_type": "quarterly report",
+               "bin_time_interval": "month", "start_time": "2022-04-01 00:00:00", "end_time": "2022-06-30 23:59:00"},
+              {"type": "wind ready", "name": "q2 vocs", "sites": ["BSE"], "species": ["ethane", "propane"], ...}]}
+
+    The input files of all jobs are planned together and every distinct file is parsed once into the feather cache
+    (cache_dir, jobs without their own cache_dir use it) with the file parsing spread over workers processes.  The
+    jobs then run in a process pool of workers processes and only read the cache.  Box plot figures are rendered
+    without a display and saved to output_dir (jobs without their own output_dir use it).  Every job is reported as
+    'ok' or 'failed' (with the error) and the report is printed and written to report_path as a CSV if given.
+
+    Parameters
+    ----------
+    job_file_path : str
+        file path of the job json file
+
+    Returns
+    -------
+    object
+        DF with one row per job ('name', 'type', 'status', 'seconds' and 'error' columns)
+    """
+    with open(job_file_path, 'r', encoding='utf-8') as job_file:
+        batch = json.load(job_file)
+    defaults = batch.get('defaults', {})
+    workers = batch.get('workers')
+    cache_dir = batch.get('cache_dir', os.path.join(os.path.dirname(os.path.abspath(job_file_path)), 'BA_cache'))
+    output_dir = batch.get('output_dir', os.path.join(os.path.dirname(os.path.abspath(job_file_path)), 'figures'))
+
+    reports = []
+    jobs = []
+    for job_num, job in enumerate(batch['jobs']):
+        try:
+            job_type, name, data_parameters = job_parameters_func(job, defaults)
+        except Exception:
+            reports.append({'name': job.get('name', 'job ' + str(job_num)), 'type': job.get('type'),
+                            'status': 'failed', 'seconds': 0, 'error': traceback.format_exc()})
+            continue
+            # a job with bad parameters is reported and skipped
+        if data_parameters.cache_dir is None:
+            data_parameters.cache_dir = cache_dir
+        data_parameters.workers = None
+        # the jobs only read the cache so their files do not need to be parsed in parallel
+        if job_type == 'box plot' and data_parameters.output_dir is None:
+            data_parameters.output_dir = output_dir
+            # jobs run without a display so the figures are saved
+        jobs.append((job_type, name, data_parameters))
+
+    file_jobs = {}
+    for job_type, name, data_parameters in jobs:
+        try:
+            file_paths = job_input_files_func(job_type, data_parameters)
+        except Exception:
+            continue
+            # the job reports the error when it runs
+        for path in file_paths:
+            file_jobs.setdefault((path, data_parameters.cache_dir), set()).add(name)
+    # planning the input files of every job together
+
+    shared_count = len([path for path in file_jobs if len(file_jobs[path]) > 1])
+    for job_cache_dir in set(key[1] for key in file_jobs):
+        file_paths = [path for path, path_cache_dir in file_jobs if path_cache_dir == job_cache_dir]
+        parsed_count = cache_warm_func(file_paths, job_cache_dir, workers=workers)
+        print(str(parsed_count) + ' files parsed into ' + job_cache_dir)
+    print(str(len(file_jobs)) + ' input files (' + str(shared_count) + ' shared by more than one job)')
+    # parsing each input file once for all jobs
+
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=headless_backend_func) as executor:
+            reports += list(executor.map(batch_job_func, *zip(*jobs)))
+        # running independent jobs in parallel
+    else:
+        reports += [batch_job_func(job_type, name, data_parameters) for job_type, name, data_parameters in jobs]
+
+    report = pd.DataFrame(reports, columns=['name', 'type', 'status', 'seconds', 'error'])
+    for row in report.itertuples():
+        print(row.status.upper() + ' ' + row.name + ' (' + str(row.seconds) + ' s)')
+        if row.status != 'ok':
+            print(row.error)
+    if batch.get('report_path') is not None:
+        report.to_csv(batch['report_path'], index=False, encoding='utf-8')
+    return report
+
+
+def main():
+    """
+    main function for running Batch_Runner script.  Runs the jobs in a job file (see batch_run_func for the format)
+
+    Pass the job file path as the first command line argument (EX: python Batch_Runner.py E:/batch_jobs.json) or fill
+    in job_file_path below.
+    """
+    job_file_path = r'E:/batch_jobs.json'
+    if len(sys.argv) > 1:
+        job_file_path = sys.argv[1]
+    batch_run_func(job_file_path)
+
+
+if __name__ == "__main__":
+    main()
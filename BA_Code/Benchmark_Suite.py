@@ -0,0 +1,272 @@
+import sys
+import time
+import platform
+import subprocess
+from Common_Functions import *
+from Run_Profiler import profile_rows_func
+from Synthetic_IDAT import synthetic_idat_func
+from Wind_Ready_Data_Generator import WindReadyConstants
+
+BENCHMARK_SIZE_DICT = {'small': {'sites': ['BSE'], 'years': [2022]},
+                       'medium': {'sites': ['BSE', 'CCF'], 'years': [2021, 2022]},
+                       'large': {'sites': ['BSE', 'CCF', 'LUR', 'LMA'], 'years': [2020, 2021, 2022]}}
+# data size name: synthetic IDAT sites and years
+
+BENCHMARK_SLOWER_RATIO = 1.2
+# a stage whose best time is this many times the previous run's is flagged as slower
+
+
+def benchmark_stage_func(stage, func, setup=None, repeats=3):
+    """
+    Times a benchmark stage
+
+    Parameters
+    ----------
+    stage : str
+        name of the stage
+    func : function
+        function timed, called with the output of setup (or without arguments)
+    setup : function
+        function making fresh inputs for every repeat (not timed) default None
+    repeats : int
+        number of timed calls (default 3)
+
+    Returns
+    -------
+    dict, object
+        stage record ('stage', 'rows', 'best_s', 'median_s' and 'repeats') and the output of the last call
+    """
+    seconds = []
+    result = None
+    for _ in range(repeats):
+        inputs = setup() if setup is not None else ()
+        start = time.perf_counter()
+        result = func(*inputs)
+        seconds.append(time.perf_counter() - start)
+    rows = profile_rows_func(result)
+    if rows is None and isinstance(result, list):
+        rows = len(result)
+        # file lists
+    record = {'stage': stage, 'rows': rows, 'best_s': round(min(seconds), 6),
+              'median_s': round(float(np.median(seconds)), 6), 'repeats': repeats}
+    print('  ' + stage + ': ' + format(record['best_s'], '.3f') + ' s best of ' + str(repeats))
+    return record, result
+
+
+def benchmark_size_func(data_path, sites, years, repeats=3):
+    """
+    Times file discovery, csv_import_func (parsing the CSV files and reading the time series store), the wind pairing
+    and combine functions and the box plot preparation on one synthetic IDAT tree
+
+    The VOC store is written next to the tree (data_path + '_store') the first time and reused after that.
+
+    Parameters
+    ----------
+    data_path : str
+        base directory of the synthetic IDAT tree
+    sites : list of str
+        site codes in the tree
+    years : list of int
+        years in the tree
+    repeats : int
+        number of timed calls of every stage (default 3)
+
+    Returns
+    -------
+    list of dict
+        one stage record per stage (see benchmark_stage_func)
+    """
+    start_time = str(years[0]) + '-01-01 00:00:00'
+    end_time = str(years[-1] + 1) + '-01-01 00:00:00'
+    parameters = WindReadyConstants(file_path=data_path, sites=sites, species='ethane', start_time=start_time,
+                                    end_time=end_time, wsp_filter=0, methane_match=False, zero_filter=False,
+                                    export_dir=None)
+    records = []
+
+    record, voc_paths = benchmark_stage_func('file_path_generator_func', lambda: file_path_generator_func(
+        data_path, sites, 'ethane', start_time, end_time), repeats=repeats)
+    records.append(record)
+    record, met_paths = benchmark_stage_func('wind_file_path_generator_func', lambda: wind_file_path_generator_func(
+        data_path, sites, start_time, end_time), repeats=repeats)
+    records.append(record)
+    radon_paths = file_path_generator_func(data_path, sites, 'radon', start_time, end_time)
+    methane_paths = file_path_generator_func(data_path, sites, 'ch4', start_time, end_time)
+    # file discovery
+
+    record, wind_list = benchmark_stage_func('csv_import_func met', lambda: csv_import_func(
+        met_paths, sites, columns=wind_columns_func()), repeats=repeats)
+    records.append(record)
+    record, voc_list = benchmark_stage_func('csv_import_func voc', lambda: csv_import_func(voc_paths, sites),
+                                            repeats=repeats)
+    records.append(record)
+    record, radon_list = benchmark_stage_func('csv_import_func radon', lambda: csv_import_func(radon_paths, sites),
+                                              repeats=repeats)
+    records.append(record)
+    record, methane_list = benchmark_stage_func('csv_import_func ch4', lambda: csv_import_func(
+        methane_paths, sites, columns=species_columns_func('ch4')), repeats=repeats)
+    records.append(record)
+    store_dir = data_path.rstrip('/\\') + '_store'
+    store_build_all_func(data_path, store_dir, sites, ['voc'])
+    record = benchmark_stage_func('csv_import_func voc store', lambda: csv_import_func(
+        voc_paths, sites, store_dir=store_dir), repeats=repeats)[0]
+    records.append(record)
+    # the same import read from the memory mapped time series stores (built once, not timed)
+    wind_list = wind_column_correction_func(wind_list)
+    # importing
+
+    record = benchmark_stage_func('voc_wind_pairing_func', voc_wind_pairing_func,
+                                  lambda: (wind_list[0].copy(), voc_list[0].copy()), repeats=repeats)[0]
+    records.append(record)
+    record = benchmark_stage_func('radon_wind_pairing_func', radon_wind_pairing_func,
+                                  lambda: (wind_list[0].copy(), radon_list[0].copy()), repeats=repeats)[0]
+    records.append(record)
+    copy_func = lambda *df_lists: tuple([df.copy() for df in df_list] for df_list in df_lists)
+    record = benchmark_stage_func('met_voc_combine_func', lambda wind, data: met_voc_combine_func(
+        parameters, wind, data), lambda: copy_func(wind_list, voc_list), repeats=repeats)[0]
+    records.append(record)
+    record = benchmark_stage_func('met_radon_combine_func', lambda wind, data: met_radon_combine_func(
+        parameters, wind, data), lambda: copy_func(wind_list, radon_list), repeats=repeats)[0]
+    records.append(record)
+    record, met_methane_list = benchmark_stage_func('met_methane_combine_func', lambda wind, data:
+                                                    met_methane_combine_func(parameters, wind, data),
+                                                    lambda: copy_func(wind_list, methane_list), repeats=repeats)
+    records.append(record)
+    record = benchmark_stage_func('met_methane_voc_combine_func', lambda wind, data: met_methane_voc_combine_func(
+        parameters, wind, data), lambda: copy_func(met_methane_list, voc_list), repeats=repeats)[0]
+    records.append(record)
+    record = benchmark_stage_func('met_non_voc_combine_func', lambda wind, data: met_non_voc_combine_func(
+        parameters, wind, data), lambda: copy_func(wind_list, methane_list), repeats=repeats)[0]
+    records.append(record)
+    # pairing and combining
+
+    def box_prep_func(data_list):
+        data_list = [df_timeloc_func(df, start_time, end_time) for df in data_list]
+        data = concat_with_site_func(sites, data_list)
+        data = interval_binning_func(data, 'month')
+        return box_stats_func(data, 'ch4', ['time', 'site'])
+    record = benchmark_stage_func('box plot preparation', box_prep_func, lambda: (methane_list,), repeats=repeats)[0]
+    records.append(record)
+    record = benchmark_stage_func('time_variation_stats_func', lambda data: time_variation_stats_func(
+        data, ['ch4']), lambda: (concat_with_site_func(sites, methane_list),), repeats=repeats)[0]
+    records.append(record)
+    # box plots
+    return records
+
+
+def benchmark_compare_func(results, run_id):
+    """
+    Compares a benchmark run with the previous run in the results (same size and stage)
+
+    Parameters
+    ----------
+    results : object
+        DF of every saved benchmark run (see benchmark_func)
+    run_id : str
+        id of the run compared
+
+    Returns
+    -------
+    object
+        DF of the run's stages with 'previous_best_s', 'ratio' and 'slower' columns
+    """
+    run = results.loc[results['run_id'] == run_id]
+    previous_runs = results.loc[results['run_id'] < run_id]
+    previous = previous_runs.drop_duplicates(['size', 'stage'], keep='last')[['size', 'stage', 'best_s']]
+    previous = previous.rename(columns={'best_s': 'previous_best_s'})
+    comparison = run.merge(previous, on=['size', 'stage'], how='left')
+    comparison['ratio'] = (comparison['best_s'] / comparison['previous_best_s']).round(3)
+    comparison['slower'] = comparison['ratio'] > BENCHMARK_SLOWER_RATIO
+    return comparison
+
+
+def benchmark_func(data_dir, results_path, sizes=None, repeats=3):
+    """
+    Runs the benchmark suite on synthetic IDAT trees of several sizes, appends the timings to the results CSV and
+    prints the comparison with the previous run
+
+    The synthetic trees are written to data_dir/size the first time a size is run and reused after that (the same
+    seed always writes the same data).  Every run is saved with its time, git commit and python/pandas/numpy versions
+    so the timings of different commits can be compared.
+
+    Parameters
+    ----------
+    data_dir : str
+        directory of the synthetic IDAT trees
+    results_path : str
+        file path of the results CSV file (appended to)
+    sizes : list of str
+        data sizes to run (keys of BENCHMARK_SIZE_DICT, default None, every size)
+    repeats : int
+        number of timed calls of every stage (default 3)
+
+    Returns
+    -------
+    object
+        DF comparing this run with the previous one (see benchmark_compare_func)
+    """
+    sizes = list(BENCHMARK_SIZE_DICT) if sizes is None else sizes
+    run_id = time.strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+        # git is not installed
+    records = []
+    for size in sizes:
+        data_path = os.path.join(data_dir, size)
+        if not os.path.exists(os.path.join(data_path, 'complete')):
+            print('writing ' + size + ' synthetic IDAT data to ' + data_path)
+            synthetic_idat_func(data_path, sites=BENCHMARK_SIZE_DICT[size]['sites'],
+                                years=BENCHMARK_SIZE_DICT[size]['years'])
+            open(os.path.join(data_path, 'complete'), 'w').close()
+            # marks the tree as fully written
+        print(size)
+        for record in benchmark_size_func(data_path, BENCHMARK_SIZE_DICT[size]['sites'],
+                                          BENCHMARK_SIZE_DICT[size]['years'], repeats):
+            record.update({'run_id': run_id, 'commit': commit, 'size': size})
+            records.append(record)
+
+    run = pd.DataFrame(records)
+    run['python'] = platform.python_version()
+    run['pandas'] = pd.__version__
+    run['numpy'] = np.__version__
+    run = run[['run_id', 'commit', 'size', 'stage', 'rows', 'best_s', 'median_s', 'repeats', 'python', 'pandas',
+               'numpy']]
+    if os.path.exists(results_path):
+        results = pd.concat([pd.read_csv(results_path, dtype={'commit': str}), run], ignore_index=True)
+    else:
+        results = run
+    if os.path.dirname(results_path) != '':
+        os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    results.to_csv(results_path, index=False, encoding='utf-8')
+
+    comparison = benchmark_compare_func(results, run_id)
+    print(comparison[['size', 'stage', 'rows', 'best_s', 'previous_best_s', 'ratio', 'slower']].to_string(
+        index=False))
+    if comparison['slower'].any():
+        print(str(comparison['slower'].sum()) + ' stage(s) more than ' + str(BENCHMARK_SLOWER_RATIO) +
+              ' times slower than the previous run')
+    return comparison
+
+
+def main():
+    """
+    main function for running Benchmark_Suite script.  Times the import, pairing and box plot stages on synthetic data
+
+    Pass the synthetic data directory and the results CSV file path as command line arguments (EX: python
+    Benchmark_Suite.py E:/benchmark_data E:/benchmark_results.csv small medium) or fill them in below.  Any further
+    arguments are the data sizes to run (default every size in BENCHMARK_SIZE_DICT).
+    """
+    data_dir = r'E:/benchmark_data'
+    results_path = r'E:/benchmark_results.csv'
+    sizes = None
+    if len(sys.argv) > 2:
+        data_dir = sys.argv[1]
+        results_path = sys.argv[2]
+        sizes = sys.argv[3:] if len(sys.argv) > 3 else None
+    benchmark_func(data_dir, results_path, sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from Common_Functions import *
 from Plotting_Objects import *
 from Common_Constants import *
+from Run_Profiler import profile_enabled_func, profile_run_func, profile_stage_func
 
 
 class BoxPlotConstants:
@@ -17,7 +18,7 @@ class BoxPlotConstants:
         String of species as it appears in the data column (EX: 'ethane')
     plot_type : str
         String of Box Plot Type (must be one of the options) Options: 'quarterly report', 'diurnal comparison',
-        'custom time comparison', or 'year quarter comparison'.
+        'custom time comparison', 'time variation', or 'year quarter comparison'.
     bin_time_interval : str
         Time interval as string in which the box plots are binned (must be one of the options) Options: 'year',
         'month', 'week', 'day', or 'all time'
@@ -25,9 +26,43 @@ class BoxPlotConstants:
         Start time as a string in datetime format (EX '2020-01-22 00:00:00')
     end_time : str
         End time as a string in datetime format (EX '2020-08-28 05:00:00')
+    zero_filter: bool
+        (True or False) used to specify weather or not to replace all negative and zero values in df with NAN's
+    cache_dir: str
+        Directory used to cache parsed CSV files between runs (default None, no caching)
+    workers: int
+        Number of worker processes used to parse CSV files in parallel (default None, serial import)
+    catalog_path: str
+        File path of the IDAT catalog json file used to look up file paths (default None, glob the site directories)
+    history_path: str
+        File path of the history store CSV file the year quarter comparison is drawn from (default None, import the
+        first site's full history on every report) see history_store_func
+    output_dir: str
+        Directory the figures are saved to without a display (default None, show the figures) see figure_path_func
+    formats: list of str
+        File formats the figures are saved in when output_dir is set (EX: ['png', 'svg', 'pdf'], default None, png)
+    compact: bool
+        (True or False) store the data with compact dtypes (float32 values and categorical site, diurnal and month
+        columns) and print a memory report (default False) see compact_dtypes_func
+    resample_freq: str
+        pandas frequency the data is averaged to before plotting (EX: 'h' for hourly means, default None plots the
+        raw data), zero_filter masks values before they are averaged and the quarterly report's yearly comparison
+        uses the same bins, see box_resample_func
+    min_coverage: float
+        minimum fraction (0 to 1) of 1 minute values an averaged bin needs, bins with less data are left out (default
+        None keeps every bin, only used with resample_freq)
+    profile_path: str
+        File path the run profile (wall time, rows in and out and peak memory of every stage) is written to, '.json'
+        for a JSON file or '.csv' for a CSV file (default None, no profiling) see Run_Profiler
+    store_dir: str
+        Base directory of the time series stores the data is read from instead of the CSV files (default None, parse
+        the CSV files) see store_build_func and Time_Series_Store
     """
 
-    def __init__(self, file_path, sites, species, plot_type, bin_time_interval, start_time, end_time, zero_filter):
+    def __init__(self, file_path, sites, species, plot_type, bin_time_interval, start_time, end_time, zero_filter,
+                 cache_dir=None, workers=None, catalog_path=None, history_path=None,
+                 output_dir=None, formats=None, compact=False, resample_freq=None, min_coverage=None,
+                 profile_path=None, store_dir=None):
         self.file_path = file_path
         self.sites = sites
         self.species = species
@@ -36,8 +71,20 @@ class BoxPlotConstants:
         self.start_time = start_time
         self.end_time = end_time
         self.zero_filter = zero_filter
-
-
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.catalog_path = catalog_path
+        self.history_path = history_path
+        self.output_dir = output_dir
+        self.formats = formats
+        self.compact = compact
+        self.resample_freq = resample_freq
+        self.min_coverage = min_coverage
+        self.profile_path = profile_path
+        self.store_dir = store_dir
+
+
+@profile_stage_func
 def diurnal_comparison_func(data_list, data_parameters):
     """
     Creates a Diurnal Box Plot over a user specified time interval
@@ -58,24 +105,16 @@ def diurnal_comparison_func(data_list, data_parameters):
     None
         Plots
     """
-    data = concat_with_site_func(data_parameters.sites, data_list)
-    # converts data list into single df with a site column
-
-    data = df_timeloc_func(data, data_parameters.start_time, data_parameters.end_time)
-    # locks data into specified time interval
+    data_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in data_list]
+    # locks each site's (time sorted) data into specified time interval
 
-    data = to_denver_tz_func(data)
-    # converts UTC data to Denver (MST or MDT) timezone
-
-    data['hour'] = data['time'].dt.hour
-    # creates an hour column from time data
+    data = concat_with_site_func(data_parameters.sites, data_list, compact=data_parameters.compact)
+    # converts data list into single df with a site column
 
-    hour_list = data['hour'].tolist()
-    # convert hour column to list for quicker iteration
-    night_day_list = ['Day' if ((hour >= 8) and (hour < 20)) else 'Night' for hour in hour_list]
-    # create list with 'night' or 'day' values. day == 8am-8pm (inclusive), night == 9pm to 7am (inclusive)
-    data['diurnal'] = night_day_list
-    # add new diurnal list to df as a column
+    data = calendar_features_func(data)
+    # adds Denver (MST or MDT) local calendar columns, 'diurnal' is 'Day' from 8am through 7pm and 'Night' otherwise
+    if data_parameters.compact:
+        data['diurnal'] = category_column_func(data['diurnal'])
 
     if data_parameters.zero_filter:
         data = box_zero_filter_func(data)
@@ -101,9 +140,11 @@ def diurnal_comparison_func(data_list, data_parameters):
     box_plot = GeneralBoxPlot(data, data['diurnal'], data[data_parameters.species], data['site'])
     box_plot.plotting_func(x_label='',
                            y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT), title=(SITE_TITLE_STRING + ' ' + SPECIES_NAME +
-                                                                               ' ' + TITLE_TIME), palette=PALETTE)
+                                                                               ' ' + TITLE_TIME), palette=PALETTE,
+                           output_path=figure_path_func(data_parameters), formats=data_parameters.formats)
 
 
+@profile_stage_func
 def custom_time_comparison_func(data_list, data_parameters):
     """
     Creates a Box Plot over a user specified time interval
@@ -123,14 +164,17 @@ def custom_time_comparison_func(data_list, data_parameters):
     None
         Plots
     """
-    data = concat_with_site_func(data_parameters.sites, data_list)
-    # converts data list into single df with a site column
+    data_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in data_list]
+    # locks each site's (time sorted) data into specified time interval
 
-    data = df_timeloc_func(data, data_parameters.start_time, data_parameters.end_time)
-    # locks data into specified time interval
+    data = concat_with_site_func(data_parameters.sites, data_list, compact=data_parameters.compact)
+    # converts data list into single df with a site column
 
     data = interval_binning_func(data, data_parameters.bin_time_interval)
     # bins data['time'] column into new time interval EX: months
+    if data_parameters.compact and string_column_func(data['time']):
+        data['time'] = category_column_func(data['time'])
+        # 'all time' labels as a categorical column (the other intervals are already ordered categoricals)
 
     if data_parameters.zero_filter:
         data = box_zero_filter_func(data)
@@ -158,10 +202,72 @@ def custom_time_comparison_func(data_list, data_parameters):
     box_plot.plotting_func(x_label=data_parameters.bin_time_interval.title(),
                            y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT), title=(SITE_TITLE_STRING + ' ' + SPECIES_NAME +
                                                                                ' ' + TITLE_TIME), palette=PALETTE,
-                           showfliers=False, hue_order=data_parameters.sites)
+                           showfliers=False, hue_order=data_parameters.sites,
+                           output_path=figure_path_func(data_parameters), formats=data_parameters.formats)
     # plots the data as box_box
 
 
+@profile_stage_func
+def time_variation_func(data_list, data_parameters):
+    """
+    Creates an OpenAir style time variation plot (hour of every weekday, hour of day and month profiles with the
+    mean, median and a 25th to 75th percentile band of each site) over a user specified time interval
+
+    All profiles of all sites are computed from the raw rows at once (see time_variation_stats_func) and only the
+    profile points are drawn.  Hours, weekdays and months are Denver local time.
+
+    Parameters
+    ----------
+    data_list : list of object
+        List of sites data frames
+    data_parameters : object
+        class object storing parameters essential for constructing the plot
+
+    Returns
+    -------
+    None
+        Plots
+    """
+    data_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in data_list]
+    # locks each site's (time sorted) data into specified time interval
+
+    data = concat_with_site_func(data_parameters.sites, data_list, compact=data_parameters.compact)
+    # converts data list into single df with a site column
+
+    data = calendar_features_func(data)
+    # adds Denver (MST or MDT) local calendar columns
+
+    if data_parameters.zero_filter:
+        data = box_zero_filter_func(data)
+    # replaces 0's and - values in df with NaN's if zero_filter parameter is set to true
+
+    stats_df = time_variation_stats_func(data, [data_parameters.species])
+    # hour, weekday hour and month profiles of every site
+
+    TITLE_TIME = time_title_func(data_parameters.start_time, data_parameters.end_time)
+    # formats time interval to be used in title
+
+    PALETTE = [COLOR_DICT[site] for site in data_parameters.sites]
+    # sets line colors to site colors
+
+    SPECIES_NAME = NAME_DICT[data_parameters.species]
+    # get name of species for title and y_axis label
+
+    SPECIES_UNIT = UNIT_DICT[data_parameters.species]
+    # get units of species for y_axis label
+
+    SITE_TITLE_STRING = site_title_string_func(data_parameters.sites)
+    # creats a site string to be used in the plot title
+
+    time_variation_plot = TimeVariationPlot(stats_df, data_parameters.species, 'site')
+    time_variation_plot.plotting_func(y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT),
+                                      title=(SITE_TITLE_STRING + ' ' + SPECIES_NAME + ' ' + TITLE_TIME),
+                                      palette=PALETTE, hue_order=data_parameters.sites,
+                                      output_path=figure_path_func(data_parameters), formats=data_parameters.formats)
+    # plots the profiles
+
+
+@profile_stage_func
 def quarterly_report_box_plot_func(data_list, data_parameters):
     """
     Creates two boxplots one standard with the quarterly title and a second quarter year comparison boxplot
@@ -182,11 +288,11 @@ def quarterly_report_box_plot_func(data_list, data_parameters):
     None
         two boxplots are produced (one standared with quarter header and one quarter year comparison)
     """
-    data = concat_with_site_func(data_parameters.sites, data_list)
-    # converts data list into single df with a site column
+    data_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in data_list]
+    # locks each site's (time sorted) data into specified time interval
 
-    data = df_timeloc_func(data, data_parameters.start_time, data_parameters.end_time)
-    # locks data into specified time interval
+    data = concat_with_site_func(data_parameters.sites, data_list, compact=data_parameters.compact)
+    # converts data list into single df with a site column
 
     if data_parameters.zero_filter:
         data = box_zero_filter_func(data)
@@ -194,6 +300,9 @@ def quarterly_report_box_plot_func(data_list, data_parameters):
 
     data = interval_binning_func(data, data_parameters.bin_time_interval)
     # bins data['time'] column into new time interval EX: months
+    if data_parameters.compact and string_column_func(data['time']):
+        data['time'] = category_column_func(data['time'])
+        # 'all time' labels as a categorical column (the other intervals are already ordered categoricals)
 
     quarter_year = get_quarters_and_years_func(data_parameters.start_time, data_parameters.end_time)
     # gets the quarter and year for the title
@@ -219,30 +328,53 @@ def quarterly_report_box_plot_func(data_list, data_parameters):
     box_plot.plotting_func(x_label=data_parameters.bin_time_interval.title(),
                            y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT), title=(SITE_TITLE_STRING + ' ' + SPECIES_NAME +
                                                                                ' ' + quarter_year), palette=PALETTE,
-                           showfliers=False, hue_order=data_parameters.sites)
+                           showfliers=False, hue_order=data_parameters.sites,
+                           output_path=figure_path_func(data_parameters), formats=data_parameters.formats)
     # plots the data as box_box
 
     ###
     # Yearly Quarter Comparison Box-plots Section
     ###
 
+    if data_parameters.history_path is not None:
+        good_months, quarter = quarter_loc_func(quarter_year)
+        # get the quarter title sting
+        history = history_store_func(data_parameters, data_parameters.sites[0], int(quarter[1]), HISTORY_START_YEAR,
+                                     int(data_parameters.end_time[:4]))
+        # get the first site's box plot statistics for the quarter of every year (only new quarters are imported)
+
+        PALETTE = [COLOR_DICT[data_parameters.sites[0]]]
+        # sets box colors to site colors
+
+        box_plot = StatsBoxPlot(history, 'year', 'site')
+        # instantiate box plot class from the precomputed statistics
+        box_plot.plotting_func(x_label=data_parameters.bin_time_interval.title(),
+                               y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT), title=(data_parameters.sites[0] + ' ' +
+                                                                                   SPECIES_NAME + ' ' + quarter +
+                                                                                   ' Yearly Comparison'),
+                               palette=PALETTE, showfliers=False,
+                               output_path=figure_path_func(data_parameters, '_yearly_comparison'),
+                               formats=data_parameters.formats)
+        # plots the statistics as box_box
+        return
+
     data_file_paths = file_path_generator_func(data_parameters.file_path, [data_parameters.sites[0]],
                                                data_parameters.species, ('2017' + data_parameters.start_time[4:]),
-                                               data_parameters.end_time)
+                                               data_parameters.end_time, catalog_path=data_parameters.catalog_path)
     # get file paths for first site's full historical data
 
-    data_list = csv_import_func(data_file_paths, [data_parameters.sites[0]])
+    data_list = csv_import_func(data_file_paths, [data_parameters.sites[0]], cache_dir=data_parameters.cache_dir,
+                                workers=data_parameters.workers, store_dir=data_parameters.store_dir,
+                                columns=species_columns_func(data_parameters.species))
     # import all historic data for first site in data_parameters site list
+    data_list = [box_resample_func(df, data_parameters) for df in data_list]
+    # the same bins as the quarterly box plot (if resample_freq is set)
 
     data = concat_with_site_func([data_parameters.sites[0]], data_list)
     # converts data list into single df with a site column
 
-    data['dt'] = data['time']
-    # duplicate the time column as 'dt'
-    data['year'] = data['dt'].dt.year
-    # create year column
-    data['month'] = data['dt'].dt.month
-    # create month column
+    data = calendar_features_func(data, local=False)
+    # adds UTC calendar columns (year, month, ...)
 
     good_months, quarter = quarter_loc_func(quarter_year)
     # create a list of wanted months from quarter_year string and get the quarter title sting
@@ -262,36 +394,60 @@ def quarterly_report_box_plot_func(data_list, data_parameters):
                            y_label=(SPECIES_NAME + ' ' + SPECIES_UNIT), title=(data_parameters.sites[0] + ' ' +
                                                                                SPECIES_NAME +
                                                                                ' ' + quarter + ' Yearly Comparison'),
-                           palette=PALETTE, showfliers=False)
+                           palette=PALETTE, showfliers=False,
+                           output_path=figure_path_func(data_parameters, '_yearly_comparison'),
+                           formats=data_parameters.formats)
     # plots the data as box_box
 
 
-def main():
+@profile_stage_func
+def box_plot_func(data_parameters):
     """
-    Main fucntion for running Box_Plot script instanciates BoxPlotConstants Class
+    Imports the data for a BoxPlotConstants object and makes the box plots for its plot_type (used by main and
+    Batch_Runner)
 
-    Fill in data_parameters with your file path (r'file_path_str') sites as a list of strings ['BSE', 'LUR'],
-    species as str 'ch4', plot_type as string (different plot types are specified in BoxPlotConstants doc string)
-    Options: 'quarterly report', 'diurnal comparison', or 'custom time comparison'.
-    Time interval as string in which the box plots are binned (must be one of the options) Options: 'year',
-    'month', 'week', 'day', or 'all time'.  Lastly imput your start_time and end_time as a str:
-    start_time='2022-02-01 00:00:00', end_time='2022-06-06 00:00:00'.
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters essential for constructing the box plot
+
+    Returns
+    -------
+    None
+        Plots
     """
-    data_parameters = BoxPlotConstants(file_path=r'E:/IDAT', sites=['BSE', 'LUR', 'ECC', 'CCF'],
-                                       species='pm10', plot_type='quarterly report', bin_time_interval='month',
-                                       start_time='2022-04-01 00:00:00', end_time='2022-06-30 23:59:00',
-                                       zero_filter=False)
-    # ending dates of each quarter: q1: 03-31 23:59:00, q2: 06-30 23:59:00,
-    # q3: 09-30 23:59:00, q4: 12-31 23:59:00,
+    if getattr(data_parameters, 'profile_path', None) is not None and not profile_enabled_func():
+        with profile_run_func(data_parameters.profile_path):
+            return box_plot_func(data_parameters)
+        # records every stage of the run and writes the run profile when it is done
+
+    if data_parameters.output_dir is not None:
+        headless_backend_func()
+        # figures are saved to output_dir so no display is needed
 
     data_file_paths = file_path_generator_func(data_parameters.file_path, data_parameters.sites,
                                                data_parameters.species, data_parameters.start_time,
-                                               data_parameters.end_time)
+                                               data_parameters.end_time, catalog_path=data_parameters.catalog_path)
     # constructing list of file_paths
     print(data_file_paths)
 
-    data_list = csv_import_func(data_file_paths, data_parameters.sites)
-    # importing relivent files from file_paths list as a list of Data Frames
+    data_list = csv_import_func(data_file_paths, data_parameters.sites, cache_dir=data_parameters.cache_dir,
+                                workers=data_parameters.workers,
+                                columns=species_columns_func(data_parameters.species),
+                                start_time=data_parameters.start_time, end_time=data_parameters.end_time,
+                                store_dir=data_parameters.store_dir)
+    # importing relivent files from file_paths list as a list of Data Frames (only the time and species columns
+    # and only the rows between start_time and end_time)
+
+    if data_parameters.resample_freq is not None:
+        data_list = [box_resample_func(df, data_parameters) for df in data_list]
+        # averages each site's data into resample_freq bins (bins are labeled by their start time), zero filtered first
+
+    if data_parameters.compact:
+        loaded_bytes = memory_usage_func(data_list)
+        data_list = [compact_dtypes_func(df) for df in data_list]
+        memory_report_func('loaded data', loaded_bytes, memory_usage_func(data_list))
+        # float32 species columns
 
     if data_parameters.plot_type == 'custom time comparison':
         # calls plotting function based on plot_type parameter
@@ -300,11 +456,65 @@ def main():
     elif data_parameters.plot_type == 'diurnal comparison':
         diurnal_comparison_func(data_list, data_parameters)
         # plots data
+    elif data_parameters.plot_type == 'time variation':
+        time_variation_func(data_list, data_parameters)
+        # plots data
     elif data_parameters.plot_type == 'quarterly report':
         quarterly_report_box_plot_func(data_list, data_parameters)
         # makes plots for quarterly reports (the first one is a standared quarerly box plot and the second is a month-
         # year boxplot that uses the firs site in the list as its input.
 
 
+def box_plot_render_func(data_parameters_list, workers=None):
+    """
+    Makes the box plots of many BoxPlotConstants objects without a display, in parallel worker processes
+
+    Every object needs an output_dir.  Each worker process uses the non-interactive Agg backend and every figure gets
+    its own style state (see figure_context_func) so figures can be rendered at the same time on a server.
+
+    Parameters
+    ----------
+    data_parameters_list : list of objects
+        list of class objects storing parameters essential for constructing the box plots
+    workers : int
+        Number of worker processes (default None, one figure set after another)
+
+    Returns
+    -------
+    None
+        saves the figures to each object's output_dir
+    """
+    if workers is not None and workers > 1 and len(data_parameters_list) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(data_parameters_list)),
+                                 initializer=headless_backend_func) as executor:
+            list(executor.map(box_plot_func, data_parameters_list))
+    else:
+        headless_backend_func()
+        for data_parameters in data_parameters_list:
+            box_plot_func(data_parameters)
+
+
+def main():
+    """
+    Main fucntion for running Box_Plot script instanciates BoxPlotConstants Class
+
+    Fill in data_parameters with your file path (r'file_path_str') sites as a list of strings ['BSE', 'LUR'],
+    species as str 'ch4', plot_type as string (different plot types are specified in BoxPlotConstants doc string)
+    Options: 'quarterly report', 'diurnal comparison', 'custom time comparison', or 'time variation'.
+    Time interval as string in which the box plots are binned (must be one of the options) Options: 'year',
+    'month', 'week', 'day', or 'all time'.  Lastly imput your start_time and end_time as a str:
+    start_time='2022-02-01 00:00:00', end_time='2022-06-06 00:00:00'.
+    """
+    data_parameters = BoxPlotConstants(file_path=r'E:/IDAT', sites=['BSE', 'LUR', 'ECC', 'CCF'],
+                                       species='pm10', plot_type='quarterly report', bin_time_interval='month',
+                                       start_time='2022-04-01 00:00:00', end_time='2022-06-30 23:59:00',
+                                       zero_filter=False)
+    # ending dates of each quarter: q1: 03-31 23:59:00, q2: 06-30 23:59:00,
+    # q3: 09-30 23:59:00, q4: 12-31 23:59:00,
+
+    box_plot_func(data_parameters)
+    # imports the data and makes the plots
+
+
 if __name__ == "__main__":
     main()
@@ -54,3 +54,34 @@ VOC_LIST = ['ethane', 'ethene', 'propane', 'propene', '1_3-butadiene', 'i-butane
             'toluene', 'cyclopentane', 'ethyl-benzene', 'm&p-xylene', 'o-xylene']
 
 MET_LIST = ['solr', 'temp_f', 'relh', 'wsp_avg_ms', 'wdr_avg', 'ptemp_f', 'tempinstr_f', 'wsp', 'wdr']
+
+WIND_COLUMN_LIST = ['wsp', 'wdr', 'wsp_avg_ms', 'wdr_avg']
+
+WIND_DIRECTION_LIST = ['wdr', 'wdr_avg']
+# angles in degrees, averaged as unit vectors (see wind_statistics_func) and never arithmetically
+
+VOC_RATIO_LIST = ['benzene', 'toluene', 'propane', 'ethane', 'i-pentane', 'n-pentane', 'i-butane', 'n-butane']
+
+NOX_MET_SITE_LIST = ['BSE', 'CCF', 'ESF', 'CCM', 'LUR']
+
+STREAM_CARRY_ROWS = 10
+
+HISTORY_START_YEAR = 2017
+
+HISTORY_STATS_VERSION = 2
+# version of the box plot statistics in the history store, rows of another version are computed again (2: whiskers
+# clamped to the box edges)
+
+FIGURE_SIZE = (19.2, 10.8)
+
+CSV_CHUNK_ROWS = 50000
+
+CSV_ENGINE = 'pyarrow'
+
+CALENDAR_FEATURE_LIST = ['hour', 'weekday', 'month', 'year', 'quarter', 'diurnal']
+
+TIME_VARIATION_PROFILE_DICT = {'hour': ['hour'], 'weekday hour': ['weekday', 'hour'], 'month': ['month']}
+
+WEEKDAY_NAME_LIST = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+MONTH_NAME_LIST = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
@@ -3,18 +3,57 @@ import numpy as np
 import datetime as dt
 import numpy as np
 import glob
+import os
+import hashlib
+import json
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import lru_cache
 import scipy
 import scipy.odr as odr
 from scipy import stats
 from statistics import mean
 from dateutil.relativedelta import relativedelta
 from Common_Constants import *
+from Wind_Statistics import group_sum_func, wind_statistics_func
+from Run_Profiler import profile_stage_func
+from Time_Series_Store import store_frame_func, store_meta_func, store_path_func, store_write_func
+
+try:
+    import pyarrow.csv
+    PYARROW_CSV = True
+except ImportError:
+    PYARROW_CSV = False
+    # csv_read_func falls back to the default pandas parser
+
+
+@lru_cache(maxsize=256)
+def time_string_func(time_string):
+    """
+    Parses a time string once (the same start and end times are parsed for every site and every call)
+
+    Parameters
+    ----------
+    time_string : str
+        Time as a string in datetime format (EX '2020-01-22 00:00:00')
+
+    Returns
+    -------
+    object
+        pandas Timestamp
+    """
+    return pd.Timestamp(dt.datetime.strptime(time_string, '%Y-%m-%d %H:%M:%S'))
 
 
 def df_timeloc_func(df, start_time, end_time, df_time_col='time'):
     """
     Crops DF's into specified time intervals
 
+    DF's from csv_import_func are sorted by time, so the bounds are found with a binary search (searchsorted) and the
+    DF is cut with one iloc slice instead of building two boolean masks over the whole column.  DF's that are not
+    sorted by time (EX: several sites concatenated) are cropped with the boolean masks.
+
     Parameters
     ----------
     df : object
@@ -31,12 +70,62 @@ def df_timeloc_func(df, start_time, end_time, df_time_col='time'):
     object
         DF object cropped by specified start and end time bounds
     """
-    start = dt.datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
-    end = dt.datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S')
-    df = df.loc[(df[df_time_col] >= start) & (df[df_time_col] < end)]
+    start = time_string_func(start_time)
+    end = time_string_func(end_time)
+    time_column = df[df_time_col]
+    if time_column.is_monotonic_increasing:
+        start_index = time_column.searchsorted(start, side='left')
+        end_index = time_column.searchsorted(end, side='left')
+        return df.iloc[start_index:end_index]
+    df = df.loc[(time_column >= start) & (time_column < end)]
     return df
 
 
+@lru_cache(maxsize=32)
+def denver_offset_table_func(first_hour, hour_count):
+    """
+    Makes a table of the Denver UTC offset (MST or MDT) of every hour starting at first_hour
+
+    Parameters
+    ----------
+    first_hour : int
+        first UTC hour as nanoseconds since the epoch (pandas Timestamp.value)
+    hour_count : int
+        number of hours in the table
+
+    Returns
+    -------
+    array of timedelta64
+        offset to add to the UTC time of each hour to get Denver local time
+    """
+    hours = pd.date_range(pd.Timestamp(first_hour), periods=hour_count, freq='h', tz='UTC')
+    return (hours.tz_convert('America/Denver').tz_localize(None) - hours.tz_localize(None)).to_numpy()
+
+
+def denver_offset_func(times):
+    """
+    Looks up the Denver UTC offset of every time (the offset only changes on the hour so it is looked up per UTC hour
+    from a cached table instead of converting every row)
+
+    Parameters
+    ----------
+    times : object
+        pandas data frame column of UTC times (without time zone)
+
+    Returns
+    -------
+    object
+        pandas column of offsets (timedelta) to add to the times to get Denver local time
+    """
+    hours = times.dt.floor('h')
+    if hours.isna().all():
+        return pd.Series(pd.NaT, index=times.index, dtype='timedelta64[ns]')
+    first_hour = hours.min()
+    hour_index = ((hours - first_hour) // pd.Timedelta(hours=1)).fillna(0).to_numpy(dtype=np.int64)
+    offset_table = denver_offset_table_func(first_hour.value, int(hour_index.max()) + 1)
+    return pd.Series(offset_table[hour_index], index=times.index)
+
+
 def to_denver_tz_func(df, time_column_header='time'):
     """
     Converts DF['time'] column data timezone from UTC to local(Denver) time
@@ -53,13 +142,50 @@ def to_denver_tz_func(df, time_column_header='time'):
         DF object with time column converted to local (Denver) timezone
     """
     try:
-        df[time_column_header] = df[time_column_header].dt.tz_localize('UTC').dt.tz_convert('America/Denver')
-        df[time_column_header] = df[time_column_header].dt.tz_localize(None)
+        df[time_column_header] = df[time_column_header] + denver_offset_func(df[time_column_header])
+        # adding the MST or MDT offset looked up per hour (see denver_offset_func)
         return df
     except:
         raise Exception('to_denver_tz_func takes two arguments (df, time column header (default "time"))')
 
 
+@profile_stage_func
+def calendar_features_func(df, local=True, time_column_header='time'):
+    """
+    Adds calendar feature columns to a DF: 'hour', 'weekday' (0 is Monday), 'month', 'year', 'quarter' and 'diurnal'
+    ('Day' from 8am through 7pm, 'Night' otherwise)
+
+    The features are computed with vectorized datetime accessors (local time uses the cached per hour offset lookup
+    of denver_offset_func) from the current time column every call, so they always match it.  The time column itself
+    is not changed.  Rows with a NaT time get NaN features (the columns are then float) and are 'Night'.
+
+    Parameters
+    ----------
+    df : object
+        DF with a UTC time column
+    local : bool
+        True (default) computes the features in Denver local time, False in UTC
+    time_column_header: str
+        name of time column as string (default 'time')
+
+    Returns
+    -------
+    object
+        DF with the calendar feature columns
+    """
+    times = df[time_column_header]
+    if local:
+        times = times + denver_offset_func(times)
+    small_int, year_int = (np.float64, np.float64) if times.isna().any() else (np.int8, np.int16)
+    # NaT rows have no calendar values, the features stay float with NaN's
+    hour = times.dt.hour
+    month = times.dt.month
+    return df.assign(hour=hour.astype(small_int), weekday=times.dt.dayofweek.astype(small_int),
+                     month=month.astype(small_int), year=times.dt.year.astype(year_int),
+                     quarter=((month - 1) // 3 + 1).astype(small_int),
+                     diurnal=np.where((hour >= 8) & (hour < 20), 'Day', 'Night').astype(object))
+
+
 def time_title_func(start_time, end_time):
     """
     Convert the start and end times time to a title format
@@ -110,16 +236,40 @@ def site_title_string_func(sites_name_list):
         return sites_name_list[0]
 
 
+def ordered_label_func(codes, labels=None):
+    """
+    Converts integer time codes (EX: month numbers) into an ordered categorical column whose categories are the codes
+    present, in increasing order (so bins plot in time order without sorting the data)
+
+    Parameters
+    ----------
+    codes : object
+        pandas data frame column of integer codes (EX: df['time'].dt.month)
+    labels : list of str
+        label of every code, code 1 is labels[0] (EX: MONTH_NAME_LIST) default None keeps the codes as labels
+
+    Returns
+    -------
+    object
+        pandas ordered categorical column
+    """
+    categories = np.sort(codes.dropna().unique().astype(np.int64))
+    labeled = pd.Categorical(codes, categories=categories, ordered=True)
+    if labels is not None:
+        labeled = labeled.rename_categories([labels[code - 1] for code in categories])
+    return pd.Series(labeled, index=codes.index, name=codes.name)
+
+
 def interval_binning_func(df, bin_time_interval):
     """
-    Converts time column to binned frequency
+    Converts time column to binned frequency labels (ordered categorical, EX: 'Jan' < 'Feb' < ... for 'month')
 
     Parameters
     ----------
     df : object
         Your data frame must have 'time' column in datetime format
     bin_time_interval : str
-        datetime binging string (EX: 'month', 'week', 'day', 'year', or 'all time')
+        datetime binging string (EX: 'month', 'week' (ISO week), 'day', 'year', or 'all time')
 
     Returns
     -------
@@ -127,17 +277,13 @@ def interval_binning_func(df, bin_time_interval):
         DF with binned time column on specified time interval
     """
     if bin_time_interval == 'year':  # setting up bin intervals ex every month, every year, ect...
-        df['time'] = df['time'].dt.year
+        df['time'] = ordered_label_func(df['time'].dt.year)
     elif bin_time_interval == 'month':
-        df['time'] = df['time'].dt.month
-        df.sort_values(by='time', inplace=True)
-        df['time'].replace(
-            {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun", 7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct",
-             11: "Nov", 12: "Dec"}, inplace=True)
+        df['time'] = ordered_label_func(df['time'].dt.month, MONTH_NAME_LIST)
     elif bin_time_interval == 'week':
-        df['time'] = df['time'].dt.week
+        df['time'] = ordered_label_func(df['time'].dt.isocalendar().week)
     elif bin_time_interval == 'day':
-        df['time'] = df['time'].dt.day
+        df['time'] = ordered_label_func(df['time'].dt.day)
     elif bin_time_interval == 'all time':
         df['time'] = ''
     else:
@@ -148,7 +294,352 @@ def interval_binning_func(df, bin_time_interval):
     return df
 
 
-def concat_with_site_func(sites_list, df_list):
+@profile_stage_func
+def resample_func(df, value_columns, freq, group_columns=None, how='mean', min_coverage=None, base_freq='1min',
+                  time_column_header='time'):
+    """
+    Aggregates data (EX: 1 minute data) into bins of any pandas frequency (EX: 'h', 'D', 'W', 'MS', '15min')
+
+    Bins are labeled by their start time, so frequencies anchored on the end of a period (EX: 'ME', 'QE', 'YE') are
+    not accepted, use the start anchored ones ('MS', 'QS', 'YS').  The coverage of a bin is the number of values in it
+    divided by the number of base_freq time steps the bin spans, and bins with a coverage below min_coverage are set
+    to NaN (the count and coverage columns are kept).
+
+    Wind direction columns (WIND_DIRECTION_LIST) are averaged as unit vectors with wind_statistics_func (350 and 10
+    degrees average to 0, not 180), only 'mean' and 'count' can be computed for them.
+
+    Parameters
+    ----------
+    df : object
+        DF with a time column and the value columns
+    value_columns : list of str
+        columns with the values (EX: ['ethane', 'propane'])
+    freq : str
+        pandas frequency string of the bins (EX: 'h', 'D', 'W', 'MS')
+    group_columns : list of str
+        columns the data is also grouped by (EX: ['site']) default None
+    how : str or list of str
+        aggregate(s) computed for every value column: 'mean', 'median', 'max', 'min', 'count', ... (default 'mean'),
+        wind directions only 'mean' or 'count'
+    min_coverage : float
+        minimum coverage (0 to 1) of a bin, default None keeps every bin
+    base_freq : str
+        time step of the data used for the coverage (default '1min')
+    time_column_header: str
+        name of time column as string (default 'time')
+
+    Returns
+    -------
+    object
+        DF with one row per (group,) bin: the group columns, the time column (bin start), one column per value column
+        and aggregate (named like the value column if how is a str, EX: 'ethane', otherwise EX: 'ethane_max') and a
+        '<value column>_count' and '<value column>_coverage' column per value column
+    """
+    group_columns = [] if group_columns is None else list(group_columns)
+    how_list = [how] if isinstance(how, str) else list(how)
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if type(offset).__name__.endswith('End'):
+        raise ValueError('resample_func labels bins by their start, use a start anchored frequency (EX: \'MS\' '
+                         'instead of \'ME\') not ' + str(freq))
+    direction_columns = [col for col in value_columns if col in WIND_DIRECTION_LIST]
+    if len(direction_columns) > 0 and not set(how_list) <= {'mean', 'count'}:
+        raise ValueError('wind directions (' + ', '.join(direction_columns) + ') can only be averaged (vector mean) '
+                         'or counted, not ' + ', '.join(how_list))
+    grouped = df.groupby(group_columns + [pd.Grouper(key=time_column_header, freq=freq, closed='left',
+                                                     label='left')], sort=True, observed=True)[value_columns]
+    aggregates = grouped.agg(how_list)
+    if isinstance(how, str):
+        aggregates.columns = [col for col, _ in aggregates.columns]
+    else:
+        aggregates.columns = [col + '_' + func for col, func in aggregates.columns]
+    counts = grouped.count()
+    if len(direction_columns) > 0 and 'mean' in how_list:
+        bin_codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        # row number of every row's bin in aggregates (-1 for a NaT time)
+        for col in direction_columns:
+            wind_stats = wind_statistics_func(df[col], np.ones(len(df)), bin_codes)
+            aggregates[col if isinstance(how, str) else col + '_mean'] = \
+                wind_stats['wdr'].reindex(range(len(aggregates))).to_numpy()
+        # unit vector mean of the directions in every bin (the same kernel as the wind pairing functions)
+
+    bin_start = pd.DatetimeIndex(counts.index.get_level_values(time_column_header))
+    bin_steps = (bin_start + offset - bin_start) / pd.Timedelta(base_freq)
+    # number of base_freq time steps in every bin (months and weeks do not all have the same length)
+    for col in value_columns:
+        coverage = counts[col].to_numpy() / bin_steps.to_numpy()
+        if min_coverage is not None:
+            low_coverage = coverage < min_coverage
+            for agg_col in ([col] if isinstance(how, str) else [col + '_' + func for func in how_list]):
+                aggregates.loc[low_coverage, agg_col] = np.nan
+            # not enough data in the bin
+        aggregates[col + '_count'] = counts[col].to_numpy()
+        aggregates[col + '_coverage'] = coverage
+    aggregates = aggregates.loc[counts.max(axis=1).to_numpy() > 0]
+    return aggregates.reset_index()
+
+
+def box_resample_func(df, data_parameters):
+    """
+    Averages a site DF into data_parameters.resample_freq bins for the box plots, zero and negative values are masked
+    first when zero_filter is set so they are not averaged into the bins (see resample_func)
+
+    Parameters
+    ----------
+    df : object
+        DF with a time column and the species column (EX: one site DF from csv_import_func)
+    data_parameters : object
+        class object storing parameters essential for constructing the box plot
+
+    Returns
+    -------
+    object
+        DF with the time (bin start) and species columns, df itself if resample_freq is None
+    """
+    if data_parameters.resample_freq is None:
+        return df
+    if data_parameters.zero_filter:
+        df = box_zero_filter_func(df)
+    return resample_func(df, [data_parameters.species], data_parameters.resample_freq,
+                         min_coverage=data_parameters.min_coverage)[['time', data_parameters.species]]
+
+
+def box_resample_key_func(data_parameters):
+    """
+    Describes the resampling of the box plot data as a string (the history store keeps the statistics of every
+    resampling apart)
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters essential for constructing the box plot
+
+    Returns
+    -------
+    str
+        '' for raw data, otherwise the resample_freq and the min_coverage (EX: 'h', 'h 0.75')
+    """
+    if data_parameters.resample_freq is None:
+        return ''
+    if data_parameters.min_coverage is None:
+        return str(data_parameters.resample_freq)
+    return str(data_parameters.resample_freq) + ' ' + str(data_parameters.min_coverage)
+
+
+@profile_stage_func
+def box_stats_func(df, value_column, group_columns):
+    """
+    Computes the box plot statistics of every group in one vectorized groupby (same statistics as sns.boxplot with
+    whis=[5, 95])
+
+    The whiskers end at the most extreme data values inside the 5th and 95th percentiles but never inside the box (the
+    way matplotlib.cbook.boxplot_stats places percentile whiskers) and the quartiles use linear interpolation like
+    np.percentile.  NaN values are left out.
+
+    Parameters
+    ----------
+    df : object
+        DF with the data
+    value_column : str
+        column with the values (EX: 'ethane')
+    group_columns : list of str
+        columns the data is grouped by (EX: ['time', 'site'])
+
+    Returns
+    -------
+    object
+        DF with one row per group: the group columns and 'count', 'mean', 'p5', 'p25', 'p50', 'p75', 'p95', 'whislo'
+        and 'whishi' columns
+    """
+    data = df[group_columns + [value_column]].dropna(subset=[value_column])
+    grouped = data.groupby(group_columns, sort=True, observed=True)[value_column]
+    stats_df = grouped.agg(['count', 'mean'])
+    percentiles = grouped.quantile([0.05, 0.25, 0.5, 0.75, 0.95]).unstack()
+    stats_df[['p5', 'p25', 'p50', 'p75', 'p95']] = percentiles.to_numpy()
+    # percentiles of every group
+
+    low = grouped.transform('quantile', 0.05)
+    high = grouped.transform('quantile', 0.95)
+    values = data[value_column]
+    group_keys = [data[col] for col in group_columns]
+    whislo = values.where(values >= low).groupby(group_keys, sort=True, observed=True).min()
+    whishi = values.where(values <= high).groupby(group_keys, sort=True, observed=True).max()
+    stats_df['whislo'] = np.fmin(whislo.to_numpy(), stats_df['p25'].to_numpy())
+    stats_df['whishi'] = np.fmax(whishi.to_numpy(), stats_df['p75'].to_numpy())
+    # whiskers end at the data values closest to the 5th and 95th percentiles on the inside, small groups have
+    # interpolated quartiles outside those values so the whiskers are clamped to the box edges
+    return stats_df.reset_index()
+
+
+@profile_stage_func
+def time_variation_stats_func(df, value_columns, group_columns=None, quantiles=(0.05, 0.25, 0.75, 0.95)):
+    """
+    Computes OpenAir style time variation profiles (hour of day, hour of every weekday and month) of every group and
+    value column
+
+    The Denver local calendar columns are added once (see calendar_features_func) and every profile is one groupby
+    that aggregates all groups (EX: sites) and all value columns (EX: species) together.  NaN values are left out and
+    the quantiles use linear interpolation like np.percentile.
+
+    Parameters
+    ----------
+    df : object
+        DF with a UTC time column and the value columns
+    value_columns : list of str
+        columns with the values (EX: ['ethane', 'propane'])
+    group_columns : list of str
+        columns the data is grouped by (default None, ['site'])
+    quantiles : tuple of float
+        quantiles computed for the bands, the median is always computed (default (0.05, 0.25, 0.75, 0.95))
+
+    Returns
+    -------
+    object
+        DF with one row per profile point: 'profile' ('hour', 'weekday hour' or 'month'), the group columns,
+        'species', 'hour', 'weekday' and 'month' (NaN if not part of the profile), 'count', 'mean', 'p50' and one
+        column per quantile (EX: 'p5', 'p25', 'p75', 'p95')
+    """
+    group_columns = ['site'] if group_columns is None else list(group_columns)
+    df = calendar_features_func(df)
+    levels = sorted(set(quantiles) | {0.5})
+    level_names = ['p' + format(level * 100, 'g') for level in levels]
+    profile_list = []
+    for profile, key_columns in TIME_VARIATION_PROFILE_DICT.items():
+        grouped = df.groupby(group_columns + key_columns, sort=True, observed=True)[value_columns]
+        stats_df = pd.concat([grouped.count().stack(), grouped.mean().stack()], axis=1, keys=['count', 'mean'])
+        percentiles = grouped.quantile(levels)
+        percentiles.index = percentiles.index.set_names('level', level=-1)
+        percentiles = percentiles.stack().unstack('level')
+        stats_df[level_names] = percentiles.reindex(stats_df.index).to_numpy()
+        # count, mean and quantiles of every (group, profile key, value column)
+        stats_df.index = stats_df.index.set_names('species', level=-1)
+        profile_list.append(stats_df.reset_index().assign(profile=profile))
+    stats_df = pd.concat(profile_list, ignore_index=True)
+    stats_df = stats_df.loc[stats_df['count'] > 0]
+    return stats_df[['profile'] + group_columns + ['species', 'hour', 'weekday', 'month', 'count', 'mean'] +
+                    level_names].reset_index(drop=True)
+
+
+def history_store_load_func(history_path):
+    """
+    Reads the box plot history store (see history_store_func)
+
+    Parameters
+    ----------
+    history_path : str
+        File path of the history store CSV file
+
+    Returns
+    -------
+    object
+        DF with one row per site, species, zero_filter, resample, year and quarter (empty if the file does not exist
+    yet), stores written before the resample column was added are raw data (resample '') and rows computed by an
+    older box_stats_func (stats_version other than HISTORY_STATS_VERSION) are left out so they are computed again
+    """
+    columns = ['site', 'species', 'zero_filter', 'resample', 'year', 'quarter', 'count', 'mean', 'p5', 'p25', 'p50',
+               'p75', 'p95', 'whislo', 'whishi', 'files', 'stats_version']
+    text_columns = ['site', 'species', 'resample', 'files']
+    if not os.path.exists(history_path):
+        return pd.DataFrame(columns=columns)
+    store = pd.read_csv(history_path, dtype={col: str for col in text_columns}, keep_default_na=False,
+                        na_values={col: [''] for col in columns if col not in text_columns})
+    if 'resample' not in store.columns:
+        store.insert(3, 'resample', '')
+    if 'stats_version' not in store.columns:
+        store['stats_version'] = 1
+    return store.loc[store['stats_version'] == HISTORY_STATS_VERSION, columns].reset_index(drop=True)
+
+
+@profile_stage_func
+def history_store_func(data_parameters, site, quarter_number, first_year, last_year):
+    """
+    Gets the box plot statistics of one quarter of every year for a site from the history store, updating the store
+    first for any year and quarter whose CSV_out files are new or changed
+
+    The store (data_parameters.history_path) is a CSV file with one row per site, species, zero_filter, resample (see
+    box_resample_key_func), year and quarter holding the box plot statistics of that quarter (see box_stats_func), the
+    size and modification time of the files they were computed from and the version of the statistics
+    (HISTORY_STATS_VERSION).  Only quarters whose files changed are
+    imported, so after the store is built a quarterly report only imports the new quarter.  With a resample_freq the
+    quarter is averaged into the same bins as the quarterly box plot before its statistics are computed.
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters essential for constructing the box plot
+    site : str
+        site code as a string (EX: 'BSE')
+    quarter_number : int
+        quarter of the year (1 to 4)
+    first_year : int
+        first year of the history
+    last_year : int
+        last year of the history
+
+    Returns
+    -------
+    object
+        DF with the store rows of the site, species and quarter from first_year to last_year sorted by year
+    """
+    store = history_store_load_func(data_parameters.history_path)
+    species = data_parameters.species
+    zero_filter = bool(data_parameters.zero_filter)
+    resample = box_resample_key_func(data_parameters)
+    good_months = [month for month in range(quarter_number * 3 - 2, quarter_number * 3 + 1)]
+    changed = False
+    for year in range(first_year, last_year + 1):
+        quarter_start, quarter_end = quarter_bounds_func(str(year) + '_q' + str(quarter_number))
+        file_paths = file_path_generator_func(data_parameters.file_path, [site], species, quarter_start, quarter_end,
+                                              catalog_path=data_parameters.catalog_path)
+        files = json.dumps({os.path.normpath(path): [os.stat(path).st_size, os.stat(path).st_mtime_ns]
+                            for path in sorted(file_paths)})
+        # the files the quarter is computed from, a change in any of them makes the quarter be computed again
+        key_mask = ((store['site'] == site) & (store['species'] == species) & (store['zero_filter'] == zero_filter) &
+                    (store['resample'] == resample) & (store['year'] == year) & (store['quarter'] == quarter_number))
+        if key_mask.any() and store.loc[key_mask, 'files'].iloc[0] == files:
+            continue
+        store = store.loc[~key_mask]
+        changed = True
+        if len(file_paths) == 0:
+            continue
+            # no data for this year
+
+        data = csv_import_func(file_paths, [site], cache_dir=data_parameters.cache_dir,
+                               workers=data_parameters.workers, columns=species_columns_func(species),
+                               store_dir=data_parameters.store_dir)[0]
+        if species in data.columns:
+            data = box_resample_func(data, data_parameters)
+            # the same bins as the quarter's box plot
+        data = calendar_features_func(data, local=False)
+        data = data.loc[(data['year'] == year) & (data['month'].isin(good_months))]
+        # only the months of the quarter (rows rounded into the next quarter are left out)
+        if data_parameters.zero_filter:
+            data = box_zero_filter_func(data)
+        if species not in data.columns:
+            continue
+        data = data.assign(site=site)
+        stats_row = box_stats_func(data, species, ['site'])
+        if len(stats_row) == 0:
+            continue
+        stats_row = stats_row.assign(species=species, zero_filter=zero_filter, resample=resample, year=year,
+                                     quarter=quarter_number, files=files, stats_version=HISTORY_STATS_VERSION)
+        store = pd.concat([store.astype({'zero_filter': bool}), stats_row[store.columns]], ignore_index=True)
+        # computing the quarter's statistics and adding them to the store
+
+    if changed:
+        tmp_path = data_parameters.history_path + '.' + str(os.getpid()) + '.tmp'
+        store.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, data_parameters.history_path)
+        # writing the store to a temporary file first so a failed write does not corrupt it
+
+    history = store.loc[(store['site'] == site) & (store['species'] == species) &
+                        (store['zero_filter'] == zero_filter) & (store['resample'] == resample) &
+                        (store['quarter'] == quarter_number) &
+                        (store['year'] >= first_year) & (store['year'] <= last_year)]
+    return history.sort_values(by='year').reset_index(drop=True)
+
+
+@profile_stage_func
+def concat_with_site_func(sites_list, df_list, compact=False):
     """
     Concatenates multiple DF's into one and adds a column (df['site]) with site names as values.
 
@@ -158,20 +649,145 @@ def concat_with_site_func(sites_list, df_list):
         List of sites there is data for
     df_list : list of object
         list of site dataframes
+    compact : bool
+        True makes the site column categorical (one small integer code per row instead of a python string) and
+        prints how much memory that saves (default False)
 
     Returns
     -------
     object
         Single combine df with new site column
     """
-    for i in range(len(sites_list)):
-        df_list[i]['site'] = sites_list[i]
-        # creating a site column for plotting
+    if compact:
+        present_sites = [sites_list[i] for i in range(len(sites_list)) if len(df_list[i]) > 0]
+        df_list = [df_list[i].assign(site=pd.Categorical.from_codes(
+            np.full(len(df_list[i]), present_sites.index(sites_list[i]) if len(df_list[i]) > 0 else -1),
+            categories=present_sites)) for i in range(len(sites_list))]
+        # every DF gets the same categories (sites with data, in site order) so the concatenated column stays
+        # categorical
+        data = pd.concat(df_list)
+        string_bytes = sum(df_list[i][[]].assign(site=sites_list[i])['site'].memory_usage(deep=True, index=False)
+                           for i in range(len(sites_list)))
+        # measured on the string site column the default path makes (built one site at a time and dropped)
+        memory_report_func('site column', string_bytes, data['site'].memory_usage(deep=True, index=False))
+        return data
+
+    df_list = [df_list[i].assign(site=sites_list[i]) for i in range(len(sites_list))]
+    # creating a site column for plotting (without changing the DF's passed in, they can be slices of larger DF's)
     data = pd.concat(df_list)
     # combing df list into single df for plotting
     return data
 
 
+def string_column_func(values):
+    """
+    Tells if a column holds strings (object or pandas 'str' dtype, categorical columns are left out)
+
+    Parameters
+    ----------
+    values : object
+        pandas data frame column
+
+    Returns
+    -------
+    bool
+        True for a string column
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return False
+    return pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values)
+
+
+def category_column_func(values):
+    """
+    Converts a column of repeated strings (EX: 'Day'/'Night' or month names) into a categorical column whose
+    categories are in order of appearance, so plots order the boxes the same way as with the string column
+
+    Parameters
+    ----------
+    values : object
+        pandas data frame column
+
+    Returns
+    -------
+    object
+        categorical column
+    """
+    return pd.Categorical(values, categories=pd.unique(values.dropna()))
+
+
+def compact_dtypes_func(df):
+    """
+    Converts a DF to compact dtypes: float64 columns to float32 and string (object or 'str') columns to categoricals
+
+    float32 keeps about 7 significant digits which is more than the instruments report.  The 'time' column is not
+    changed.
+
+    Parameters
+    ----------
+    df : object
+        DF to convert
+
+    Returns
+    -------
+    object
+        DF with compact dtypes
+    """
+    conversions = {}
+    for col in df.columns:
+        if col == 'time':
+            continue
+        if df[col].dtype == np.float64:
+            conversions[col] = np.float32
+        elif string_column_func(df[col]):
+            conversions[col] = 'category'
+    if len(conversions) == 0:
+        return df
+    return df.astype(conversions)
+
+
+def memory_usage_func(data):
+    """
+    Gets the memory used by a DF or a list of DF's (including the python objects in object columns)
+
+    Parameters
+    ----------
+    data : object or list of objects
+        DF or list of DF's
+
+    Returns
+    -------
+    int
+        number of bytes
+    """
+    if isinstance(data, list):
+        return sum(memory_usage_func(df) for df in data)
+    return int(data.memory_usage(deep=True).sum())
+
+
+def memory_report_func(label, before_bytes, after_bytes):
+    """
+    Prints a before and after memory comparison (used by the compact mode)
+
+    Parameters
+    ----------
+    label : str
+        what was measured (EX: 'loaded data')
+    before_bytes : int
+        bytes before compacting
+    after_bytes : int
+        bytes after compacting
+
+    Returns
+    -------
+    None
+        prints the report
+    """
+    saved = 100 * (1 - after_bytes / before_bytes) if before_bytes > 0 else 0
+    print('memory ' + label + ': ' + str(round(before_bytes / 1e6, 1)) + ' MB -> ' +
+          str(round(after_bytes / 1e6, 1)) + ' MB (' + str(round(saved)) + '% smaller)')
+
+
 def get_quarters_and_years_func(start_time, end_time):
     """
     get relevant quarters and years as a list of strings from user supplied start_time and end_time stings.
@@ -207,156 +823,850 @@ def get_quarters_and_years_func(start_time, end_time):
             quarters_list.append(str(date.year) + '_' + 'q4')
     quarters_list = list(set(quarters_list))
 
-    return quarters_list
+    return quarters_list
+
+
+def species_path_func(species):
+    """
+    Gets the name of the instrument directory a species is stored in (EX: 'ethane' -> 'voc')
+
+    Parameters
+    ----------
+    species : str
+        String of species as it appears in the data column (EX: 'ethane')
+
+    Returns
+    -------
+    str
+        instrument directory name ('met', 'ch4', 'ozone', 'pm', 'voc', 'nox' or 'radon') None if not recognized
+    """
+    path_species = None
+    if species in MET_LIST or species == 'met':
+        path_species = 'met'
+    elif species == 'ch4' or species == 'co2' or species == 'co2_ppm' or species == 'co' or species == 'co2':
+        path_species = 'ch4'
+    elif species == 'o3':
+        path_species = 'ozone'
+    elif species == 'pm2_5' or species == 'pm10':
+        path_species = 'pm'
+    elif species in VOC_LIST:
+        path_species = 'voc'
+    elif species == 'no' or species == 'nox':
+        path_species = 'nox'
+    elif species == 'h2s' or species == 'so2':
+        path_species = 'met'
+    elif species == 'radon':
+        path_species = 'radon'
+    else:
+        print('species not recognized')
+    return path_species
+
+
+def species_columns_func(species, wind_ready=False):
+    """
+    Constructs the list of columns that need to be imported from the species CSV files
+
+    Box plots only need 'time' and the species column.  Wind ready files also need the VOC ratio columns (see
+    met_voc_combine_func) and, for species stored in the met files, the wind columns.
+
+    Parameters
+    ----------
+    species : str
+        String of species as it appears in the data column (EX: 'ethane')
+    wind_ready : bool
+        True if the columns are for Wind_Ready_Data_Generator (default False)
+
+    Returns
+    -------
+    list of str
+        list of column names to import
+    """
+    columns = ['time', species]
+    if wind_ready:
+        if species in VOC_LIST:
+            columns += [col for col in VOC_RATIO_LIST if col not in columns]
+        if species_path_func(species) == 'met':
+            columns += [col for col in WIND_COLUMN_LIST if col not in columns]
+    return columns
+
+
+def wind_columns_func(species=None):
+    """
+    Constructs the list of columns that need to be imported from the met CSV files for wind pairing
+
+    Parameters
+    ----------
+    species : str
+        String of species being paired with the met data, if it is stored in the met files it is imported too
+        (default None)
+
+    Returns
+    -------
+    list of str
+        list of column names to import
+    """
+    columns = ['time'] + WIND_COLUMN_LIST
+    if species is not None and species not in columns and species_path_func(species) == 'met':
+        columns.append(species)
+    return columns
+
+
+def site_path_species_func(site, path_species):
+    """
+    Gets the instrument directory used at a specific site (some sites store their nox data in the met directory)
+
+    Parameters
+    ----------
+    site : str
+        site code as a string (EX: 'BSE')
+    path_species : str
+        instrument directory name (EX: output of species_path_func)
+
+    Returns
+    -------
+    str
+        instrument directory name used at that site
+    """
+    if path_species == 'nox' and site in NOX_MET_SITE_LIST:
+        return 'met'
+    return path_species
+
+
+def file_quarter_func(file_name):
+    """
+    Gets the year and quarter string from a CSV_out file name (EX: 'CCF_voc_2022_q3.csv' -> '2022_q3')
+
+    Parameters
+    ----------
+    file_name : str
+        file name of a CSV_out file
+
+    Returns
+    -------
+    str
+        year and quarter string in the same format as get_quarters_and_years_func ('2020_q2') None if not found
+    """
+    year_q_position = file_name.find('_20')
+    if year_q_position == -1:
+        return None
+    return file_name[(year_q_position + 1): (year_q_position + 8)]
+
+
+LOADED_CATALOG_DICT = {}
+
+
+def catalog_load_func(file_path, catalog_path):
+    """
+    Loads the persistent catalog of the IDAT directory tree (or starts a new one)
+
+    The catalog stores one entry per (site, instrument directory) holding the directory mtime and a list of
+    [file name, year_quarter, size, mtime] for every CSV file in it.  Loaded catalogs are kept in memory so repeated
+    calls in the same run do not re-read the catalog file.
+
+    Parameters
+    ----------
+    file_path : str
+        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    catalog_path : str
+        File path of the catalog json file (EX: 'E:\IDAT_catalog.json')
+
+    Returns
+    -------
+    dict
+        catalog dictionary used by catalog_query_func
+    """
+    catalog_key = os.path.abspath(catalog_path)
+    if catalog_key in LOADED_CATALOG_DICT and LOADED_CATALOG_DICT[catalog_key]['file_path'] == file_path:
+        return LOADED_CATALOG_DICT[catalog_key]
+
+    catalog = {'file_path': file_path, 'dirs': {}}
+    if os.path.exists(catalog_path):
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as catalog_file:
+                saved_catalog = json.load(catalog_file)
+            if saved_catalog.get('file_path') == file_path:
+                catalog['dirs'] = saved_catalog['dirs']
+        except (ValueError, KeyError, OSError):
+            print('catalog file could not be read, it will be rebuilt')
+
+    catalog['catalog_path'] = catalog_path
+    catalog['index'] = {dir_key: catalog_index_func(entry['files']) for dir_key, entry in catalog['dirs'].items()}
+    # index of {dir_key: {year_quarter: [file names]}} so lookups only touch matching files
+    catalog['changed'] = False
+    LOADED_CATALOG_DICT[catalog_key] = catalog
+    return catalog
+
+
+def catalog_index_func(file_entries):
+    """
+    Groups catalog file entries by year and quarter
+
+    Parameters
+    ----------
+    file_entries : list of lists
+        list of [file name, year_quarter, size, mtime] entries for one directory
+
+    Returns
+    -------
+    dict
+        {year_quarter: [file names]}
+    """
+    index = {}
+    for file_name, year_quarter, size, mtime in file_entries:
+        index.setdefault(year_quarter, []).append(file_name)
+    return index
+
+
+def catalog_refresh_dir_func(catalog, site, path_species):
+    """
+    Re-scans one (site, instrument directory) entry of the catalog if the directory changed since it was scanned
+
+    Only the directory itself is stat-ed, its files are only listed again if the directory mtime changed (EX: a new
+    quarterly file was added).
+
+    Parameters
+    ----------
+    catalog : dict
+        catalog dictionary from catalog_load_func
+    site : str
+        site code as a string (EX: 'BSE')
+    path_species : str
+        instrument directory name (EX: 'voc')
+
+    Returns
+    -------
+    str
+        directory key of the entry ('site/instrument directory')
+    """
+    dir_key = site + '/' + path_species
+    dir_path = os.path.join(catalog['file_path'], site, path_species)
+    try:
+        dir_mtime = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+        # directory does not exist (EX: site without that instrument)
+
+    entry = catalog['dirs'].get(dir_key)
+    if entry is not None and entry['mtime'] == dir_mtime:
+        return dir_key
+
+    file_entries = []
+    if dir_mtime is not None:
+        with os.scandir(dir_path) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.startswith('.') or not fnmatch.fnmatch(dir_entry.name, '*.csv'):
+                    continue
+                stat = dir_entry.stat()
+                file_entries.append([dir_entry.name, file_quarter_func(dir_entry.name), stat.st_size,
+                                     stat.st_mtime_ns])
+    catalog['dirs'][dir_key] = {'mtime': dir_mtime, 'files': file_entries}
+    catalog['index'][dir_key] = catalog_index_func(file_entries)
+    catalog['changed'] = True
+    return dir_key
+
+
+def catalog_save_func(catalog):
+    """
+    Writes the catalog to its json file if it changed since it was loaded
+
+    Parameters
+    ----------
+    catalog : dict
+        catalog dictionary from catalog_load_func
+
+    Returns
+    -------
+    None
+        catalog file is written to catalog['catalog_path']
+    """
+    if not catalog['changed']:
+        return
+    tmp_path = catalog['catalog_path'] + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as catalog_file:
+        json.dump({'file_path': catalog['file_path'], 'dirs': catalog['dirs']}, catalog_file)
+    os.replace(tmp_path, catalog['catalog_path'])
+    catalog['changed'] = False
+
+
+def catalog_query_func(catalog, sites, species, start_time, end_time):
+    """
+    Constructs a list of relevant file_paths from the catalog instead of globbing every site directory
+
+    Parameters
+    ----------
+    catalog : dict
+        catalog dictionary from catalog_load_func
+    sites : list of str
+        List of site(s) codes as strings (EX: ['LUR', 'BSE'])
+    species : str
+        String of species as it appears in the data column (EX: 'ethane') or 'met' for the wind data
+    start_time : str
+        Start time as a string in datetime format (EX '2020-01-22 00:00:00')
+    end_time : str
+        End time as a string in datetime format (EX '2020-08-28 05:00:00')
+
+    Returns
+    -------
+    list
+        List of file path names to be imported (sites in order, files sorted by year and quarter within each site)
+    """
+    path_species = species_path_func(species)
+    quarters = sorted(get_quarters_and_years_func(start_time, end_time))
+    good_file_paths = []
+    for site in sites:
+        site_path_species = site_path_species_func(site, path_species)
+        dir_key = catalog_refresh_dir_func(catalog, site, site_path_species)
+        dir_index = catalog['index'][dir_key]
+        for quarter in quarters:
+            for file_name in dir_index.get(quarter, []):
+                good_file_paths.append(os.path.join(catalog['file_path'], site, site_path_species, file_name))
+    catalog_save_func(catalog)
+    return good_file_paths
+
+
+@profile_stage_func
+def file_path_generator_func(file_path, sites, species, start_time, end_time, catalog_path=None):
+    """
+    Constructs a list of relevant file_paths
+
+    If a catalog_path is given the file paths are looked up in the IDAT catalog (see catalog_query_func) instead of
+    globbing every site directory.
+
+    Parameters
+    ----------
+    file_path : str
+        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    sites : list of str
+        List of site(s) codes as strings (EX: ['LUR', 'BSE'])
+    species : str
+        String of species as it appears in the data column (EX: 'ethane')
+    start_time : str
+        Start time as a string in datetime format (EX '2020-01-22 00:00:00')
+    end_time : str
+        End time as a string in datetime format (EX '2020-08-28 05:00:00')
+    catalog_path : str
+        File path of the IDAT catalog json file (default None, glob the site directories)
+
+    Returns
+    -------
+    list
+        List of file path names to be imported
+    """
+    if catalog_path is not None:
+        catalog = catalog_load_func(file_path, catalog_path)
+        return catalog_query_func(catalog, sites, species, start_time, end_time)
+
+    path_species = species_path_func(species)
+
+    file_paths = [(file_path + '/' + site + '/' + site_path_species_func(site, path_species) + '/')
+                  for site in sites]
+
+    all_files = []
+    for file_path in file_paths:
+        file = glob.glob(r'' + file_path + "/*.csv")
+        all_files.append(file)
+    for file in all_files:
+        if file == all_files[0]:
+            combined_files = file
+        else:
+            combined_files += file
+
+    quarters = get_quarters_and_years_func(start_time, end_time)
+    good_file_paths = []
+    for path in combined_files:
+        year_q_position = path.find('_20')
+        date_info = path[(year_q_position + 1): (year_q_position + 8)]
+        if date_info in quarters:
+            good_file_paths.append(path)
+
+    return good_file_paths
+
+
+@profile_stage_func
+def wind_file_path_generator_func(file_path, sites, start_time, end_time, catalog_path=None):
+    """
+    Constructs a list of relevant file_paths
+
+    If a catalog_path is given the file paths are looked up in the IDAT catalog (see catalog_query_func) instead of
+    globbing every site directory.
+
+    Parameters
+    ----------
+    file_path : str
+        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    sites : list of str
+        List of site(s) codes as strings (EX: ['LUR', 'BSE'])
+    species : str
+        String of species as it appears in the data column (EX: 'ethane')
+    start_time : str
+        Start time as a string in datetime format (EX '2020-01-22 00:00:00')
+    end_time : str
+        End time as a string in datetime format (EX '2020-08-28 05:00:00')
+    catalog_path : str
+        File path of the IDAT catalog json file (default None, glob the site directories)
+
+    Returns
+    -------
+    list
+        List of file path names to be imported
+    """
+    if catalog_path is not None:
+        catalog = catalog_load_func(file_path, catalog_path)
+        return catalog_query_func(catalog, sites, 'met', start_time, end_time)
+
+    wind_paths = []
+    for site in sites:
+        wind_paths.append(file_path + '/' + site + '/met')
+
+    all_files = []
+    for file_path in wind_paths:
+        file = glob.glob(r'' + file_path + "/*.csv")
+        all_files.append(file)
+    for file in all_files:
+        if file == all_files[0]:
+            combined_files = file
+        else:
+            combined_files += file
+
+    quarters = get_quarters_and_years_func(start_time, end_time)
+    good_file_paths = []
+    for path in combined_files:
+        year_q_position = path.find('_20')
+        date_info = path[(year_q_position + 1): (year_q_position + 8)]
+        if date_info in quarters:
+            good_file_paths.append(path)
+
+    return good_file_paths
+
+
+def epoch_minute_func(epoch):
+    """
+    Converts epoch seconds to datetimes rounded to the nearest minute (half a minute rounds to the even minute like
+    .dt.round('1min')) with integer arithmetic on the epoch values before the datetimes are built
+
+    Parameters
+    ----------
+    epoch : object
+        pandas data frame column of epoch seconds (int or float, NaN becomes NaT)
+
+    Returns
+    -------
+    object
+        pandas column of datetimes on whole minutes, datetime64[s] or datetime64[ns] if any epoch has fractional
+        seconds (the same resolution as to_datetime(unit='s').dt.round('1min'))
+    """
+    values = epoch.to_numpy()
+    if np.issubdtype(values.dtype, np.integer):
+        minutes, seconds = np.divmod(values, 60)
+        minutes = minutes + ((seconds > 30) | ((seconds == 30) & (minutes % 2 == 1)))
+    else:
+        values = values.astype(float)
+        minutes = np.round(values / 60)
+        # np.round also rounds halves to even
+        if np.any(np.mod(values[~np.isnan(values)], 1) != 0):
+            return pd.Series(pd.to_datetime(minutes * 60, unit='s').as_unit('ns'), index=epoch.index,
+                             name=epoch.name)
+            # fractional seconds were parsed to nanoseconds before rounding, the column keeps that resolution
+    return pd.Series(pd.to_datetime(minutes * 60, unit='s'), index=epoch.index, name=epoch.name)
+
+
+def pyarrow_csv_read_func(path, header_num=1, columns=None):
+    """
+    Reads a whole CSV_out file with the multi-threaded pyarrow CSV engine
+
+    Parameters
+    ----------
+    path : str
+        File path to a single CSV_out file
+    header_num : int
+        Row number of the column headers in the CSV file (default 1)
+    columns : list of str
+        Columns to read, 'time' is always read and columns missing from the file are ignored (default None, read
+        every column)
+
+    Returns
+    -------
+    object
+        DF with the raw epoch 'time' column, None if pyarrow is not installed, turned off (CSV_ENGINE) or cannot
+        parse the file (the caller then uses the default pandas parser)
+    """
+    if not PYARROW_CSV or CSV_ENGINE != 'pyarrow':
+        return None
+    try:
+        usecols = None
+        if columns is not None:
+            wanted_columns = set(columns) | {'time'}
+            usecols = [col for col in pd.read_csv(path, header=header_num, nrows=0).columns if col in wanted_columns]
+        data = pd.read_csv(path, header=header_num, usecols=usecols, engine='pyarrow')
+    except (pyarrow.ArrowException, ValueError):
+        return None
+        # a file pyarrow cannot parse (pandas parser errors are ValueErrors), a missing or unreadable file raises
+    for col in data.columns:
+        if len(data) == 0 and col != 'time':
+            data[col] = data[col].astype(object)
+        elif len(data) > 0 and data[col].dtype == object and data[col].isna().all():
+            data[col] = data[col].astype(float)
+        # column dtypes of empty files and empty columns like the default parser makes them
+    return data
+
+
+@profile_stage_func
+def csv_read_func(path, header_num=1, columns=None, start_time=None, end_time=None):
+    """
+    Reads a single BA CSV_out file and converts its epoch 'time' column to datetimes rounded to the minute
+
+    The file is parsed by the pyarrow CSV engine when pyarrow is installed (see pyarrow_csv_read_func) and the rows
+    outside the start_time to end_time window are dropped.  Otherwise the default pandas parser is used and, if a
+    start_time or end_time is given, the file is read in chunks of CSV_CHUNK_ROWS rows and only the rows inside the
+    window are kept.  The epoch times only increase within a file so reading stops at the first chunk that reaches
+    past end_time, a short window at the start of a quarter file only parses the start of the file.  Every chunk
+    infers its own dtypes, so if the chunks read disagree on a column's dtype (EX: an integer column with a blank in
+    one chunk) the file is parsed in one piece instead and cropped to the window.  Both paths give the same DF.
+
+    Parameters
+    ----------
+    path : str
+        File path to a single CSV_out file
+    header_num : int
+        Row number of the column headers in the CSV file (default 1)
+    columns : list of str
+        Columns to read, 'time' is always read and columns missing from the file are ignored (default None, read
+        every column)
+    start_time : str
+        Rows (after rounding) before this time are skipped (EX '2020-01-22 00:00:00') default None
+    end_time : str
+        Rows (after rounding) from this time on are skipped (EX '2020-08-28 05:00:00') default None
+
+    Returns
+    -------
+    object
+        DF with 'time' column converted to datetime and rounded to the nearest minute
+    """
+    start = time_string_func(start_time) if start_time is not None else None
+    end = time_string_func(end_time) if end_time is not None else None
+    data = pyarrow_csv_read_func(path, header_num, columns)
+    if data is not None:
+        data['time'] = epoch_minute_func(data['time'])
+        if start is None and end is None:
+            return data
+        keep = np.ones(len(data), dtype=bool)
+        if start is not None:
+            keep &= (data['time'] >= start).to_numpy()
+        if end is not None:
+            keep &= (data['time'] < end).to_numpy()
+        return data.loc[keep]
+    # fast path: the whole file is parsed by pyarrow's multi-threaded reader and then cropped to the window
+
+    usecols = None
+    if columns is not None:
+        wanted_columns = set(columns) | {'time'}
+        usecols = lambda col: col in wanted_columns
+    if start is None and end is None:
+        data = pd.read_csv(path, header=header_num, usecols=usecols)
+        data['time'] = epoch_minute_func(data['time'])
+        return data
+
+    chunks = []
+    chunk_dtypes = set()
+    with pd.read_csv(path, header=header_num, usecols=usecols, chunksize=CSV_CHUNK_ROWS) as reader:
+        for chunk in reader:
+            if len(chunk) == 0:
+                continue
+            last_time = pd.to_datetime(chunk['time'].iloc[-1], unit='s')
+            chunk['time'] = epoch_minute_func(chunk['time'])
+            keep = np.ones(len(chunk), dtype=bool)
+            if start is not None:
+                keep &= (chunk['time'] >= start).to_numpy()
+            if end is not None:
+                keep &= (chunk['time'] < end).to_numpy()
+            chunks.append(chunk.loc[keep])
+            chunk_dtypes.add(tuple(chunk.dtypes))
+            if end is not None and last_time >= end:
+                break
+                # every later row is past end_time
+    if len(chunks) == 0:
+        data = pd.read_csv(path, header=header_num, usecols=usecols, nrows=0)
+        data['time'] = pd.to_datetime(data['time'], unit='s')
+        return data
+        # empty file
+    if len(chunk_dtypes) > 1:
+        data = pd.read_csv(path, header=header_num, usecols=usecols)
+        data['time'] = epoch_minute_func(data['time'])
+        keep = np.ones(len(data), dtype=bool)
+        if start is not None:
+            keep &= (data['time'] >= start).to_numpy()
+        if end is not None:
+            keep &= (data['time'] < end).to_numpy()
+        return data.loc[keep]
+        # the chunks inferred different dtypes, a full read gives one dtype per column
+    return pd.concat(chunks)
+
+
+def cache_file_path_func(path, cache_dir, header_num=1):
+    """
+    Constructs the cache file path for a CSV_out file and the prefix shared by all cached versions of that file
+
+    The cache entry is keyed by the source path, its size and its modification time so a changed file never matches
+    an old entry.
+
+    Parameters
+    ----------
+    path : str
+        File path to a single CSV_out file
+    cache_dir : str
+        Directory where the cached feather files are stored
+    header_num : int
+        Row number of the column headers in the CSV file (default 1)
+
+    Returns
+    -------
+    str, str
+        cache file path for the current version of the source file and the prefix used by every version of it
+    """
+    stat = os.stat(path)
+    source_key = os.path.normcase(os.path.abspath(path)) + '|' + str(header_num)
+    prefix = os.path.join(cache_dir, hashlib.sha1(source_key.encode('utf-8')).hexdigest())
+    cache_path = prefix + '_' + str(stat.st_size) + '_' + str(stat.st_mtime_ns) + '.feather'
+    return cache_path, prefix
+
+
+@profile_stage_func
+def cached_csv_read_func(path, header_num=1, cache_dir=None, columns=None, start_time=None, end_time=None):
+    """
+    Reads a single CSV_out file through an on disk feather cache (falls back to csv_read_func if no cache is used)
+
+    On a cache hit the already converted and rounded DF is read from the cache directory.  On a miss the CSV is
+    parsed with csv_read_func, written to the cache and any stale versions of the same source file are removed.
+    The cache always holds every column of the file so one entry can serve any column selection.
+    Entries are written to a temporary file first and then moved into place so several analysts can share one cache
+    directory (EX: on a network drive).  If feather support (pyarrow) is not installed the CSV is parsed as normal.
+    With a start_time or end_time the whole file is still parsed and cached on a miss, then the cached or parsed DF
+    is cropped to the window, so windowed runs fill the cache for later runs.
+
+    Parameters
+    ----------
+    path : str
+        File path to a single CSV_out file
+    header_num : int
+        Row number of the column headers in the CSV file (default 1)
+    cache_dir : str
+        Directory where the cached feather files are stored (default None, no caching)
+    columns : list of str
+        Columns to read, 'time' is always read and columns missing from the file are ignored (default None, read
+        every column)
+    start_time : str
+        Start time of the rows to keep as a string in datetime format (default None)
+    end_time : str
+        End time of the rows to keep as a string in datetime format (default None)
+
+    Returns
+    -------
+    object
+        DF with 'time' column converted to datetime and rounded to the nearest minute
+    """
+    if cache_dir is None:
+        return csv_read_func(path, header_num, columns, start_time, end_time)
+
+    cache_path, prefix = cache_file_path_func(path, cache_dir, header_num)
+    if os.path.exists(cache_path):
+        try:
+            if columns is None:
+                data = pd.read_feather(cache_path)
+            else:
+                import pyarrow.ipc
+                with pyarrow.ipc.open_file(cache_path) as reader:
+                    cached_columns = reader.schema.names
+                data = pd.read_feather(cache_path, columns=[col for col in cached_columns
+                                                            if col == 'time' or col in columns])
+            return cache_window_func(data, start_time, end_time)
+            # cropping the cached file to the window
+        except Exception:
+            pass
+            # unreadable entry (EX: partially copied or no feather engine), re-parse the CSV below
+
+    data = csv_read_func(path, header_num)
+    # the whole file is parsed so the cache entry can serve any window
+
+    for stale_path in glob.glob(prefix + '_*.feather'):
+        if stale_path != cache_path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+    # evicting cache entries made from older versions of the same source file
+
+    tmp_path = cache_path + '.' + str(os.getpid()) + '.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        data.to_feather(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    # caching is best effort, a failed write still returns the parsed data
+
+    if columns is not None:
+        data = data[[col for col in data.columns if col == 'time' or col in columns]]
+    return cache_window_func(data, start_time, end_time)
 
 
-def file_path_generator_func(file_path, sites, species, start_time, end_time):
+def cache_window_func(data, start_time=None, end_time=None):
     """
-    Constructs a list of relevant file_paths
+    Crops a whole parsed or cached file to the rows from start_time up to (not including) end_time
 
     Parameters
     ----------
-    file_path : str
-        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
-    sites : list of str
-        List of site(s) codes as strings (EX: ['LUR', 'BSE'])
-    species : str
-        String of species as it appears in the data column (EX: 'ethane')
+    data : object
+        DF with a datetime 'time' column (EX: output of csv_read_func)
     start_time : str
-        Start time as a string in datetime format (EX '2020-01-22 00:00:00')
+        Start time as a string in datetime format (default None)
     end_time : str
-        End time as a string in datetime format (EX '2020-08-28 05:00:00')
+        End time as a string in datetime format (default None)
 
     Returns
     -------
-    list
-        List of file path names to be imported
+    object
+        DF of the rows inside the window
     """
-    path_species = None
-    if species in MET_LIST or species == 'met':
-        path_species = 'met'
-    elif species == 'ch4' or species == 'co2' or species == 'co2_ppm' or species == 'co' or species == 'co2':
-        path_species = 'ch4'
-    elif species == 'o3':
-        path_species = 'ozone'
-    elif species == 'pm2_5' or species == 'pm10':
-        path_species = 'pm'
-    elif species in VOC_LIST:
-        path_species = 'voc'
-    elif species == 'no' or species == 'nox':
-        path_species = 'nox'
-    elif species == 'h2s' or species == 'so2':
-        path_species = 'met'
-    elif species == 'radon':
-        path_species = 'radon'
-    else:
-        print('species not recognized')
+    if start_time is not None:
+        data = data.loc[data['time'] >= time_string_func(start_time)]
+    if end_time is not None:
+        data = data.loc[data['time'] < time_string_func(end_time)]
+    return data
 
-    if path_species == 'nox':
-        file_paths = []
-        for site in sites:
-            if site == 'BSE' or site == 'CCF' or site == 'ESF' or site == 'CCM' or site == 'LUR':
-                file_paths.append(file_path + '/' + site + '/' + 'met/')
-            else:
-                file_paths.append(file_path + '/' + site + '/' + path_species + '/')
-    else:
-        file_paths = [(file_path + '/' + site + '/' + path_species + '/') for site in sites]
 
-    all_files = []
-    for file_path in file_paths:
-        file = glob.glob(r'' + file_path + "/*.csv")
-        all_files.append(file)
-    for file in all_files:
-        if file == all_files[0]:
-            combined_files = file
-        else:
-            combined_files += file
+@profile_stage_func
+def stream_dedupe_func(df_list):
+    """
+    Combines the DF's of one instrument stream (EX: the quarterly files of a site's VOC data) into one time sorted DF
+    with one row per timestamp
 
-    quarters = get_quarters_and_years_func(start_time, end_time)
-    good_file_paths = []
-    for path in combined_files:
-        year_q_position = path.find('_20')
-        date_info = path[(year_q_position + 1): (year_q_position + 8)]
-        if date_info in quarters:
-            good_file_paths.append(path)
+    Duplicate timestamps (overlapping quarter files or a repeated row) are resolved by keeping the last row in file
+    order, so a later file (EX: a reprocessed or the next quarter's file) replaces the rows of an earlier one.  Rows
+    with the same timestamp keep their file order (stable sort).  Times are rounded to the minute on import, so rows a
+    few seconds apart are duplicates too.  The dropped rows of every stream are its rows_in minus rows_out in the run
+    profile (see Run_Profiler).
 
-    return good_file_paths
+    Parameters
+    ----------
+    df_list : list of objects
+        DF's of the stream in file order, each with a 'time' column
+
+    Returns
+    -------
+    object
+        DF sorted by time without duplicate timestamps
+    """
+    data = df_list[0] if len(df_list) == 1 else pd.concat(df_list, ignore_index=True)
+    if not data['time'].is_monotonic_increasing:
+        data = data.sort_values(by=['time'], kind='stable')
+    duplicated = data['time'].duplicated(keep='last')
+    if duplicated.any():
+        data = data.loc[~duplicated.to_numpy()]
+        # rows on the same minute, the last one in file order is kept
+    return data.reset_index(drop=True)
 
 
-def wind_file_path_generator_func(file_path, sites, start_time, end_time):
+def sorted_stream_join_func(stream_list):
     """
-    Constructs a list of relevant file_paths
+    Outer joins any number of time sorted, de-duplicated instrument streams (see stream_dedupe_func) on 'time'
+
+    The union of the timestamps is built with pandas' linear merge of sorted indexes and every stream is aligned to
+    it once, so time and memory stay proportional to the number of input rows.  A column found in more than one
+    stream keeps the first stream's values and is filled from the later streams where it is NaN.
 
     Parameters
     ----------
-    file_path : str
-        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
-    sites : list of str
-        List of site(s) codes as strings (EX: ['LUR', 'BSE'])
-    species : str
-        String of species as it appears in the data column (EX: 'ethane')
-    start_time : str
-        Start time as a string in datetime format (EX '2020-01-22 00:00:00')
-    end_time : str
-        End time as a string in datetime format (EX '2020-08-28 05:00:00')
+    stream_list : list of objects
+        time sorted DF's with unique 'time' values
 
     Returns
     -------
-    list
-        List of file path names to be imported
+    object
+        time sorted DF with one row per timestamp, the 'time' column and the columns of every stream
     """
+    if len(stream_list) == 1:
+        return stream_list[0]
+    stream_list = [stream.set_index('time') for stream in stream_list]
+    time_index = stream_list[0].index
+    for stream in stream_list[1:]:
+        time_index = time_index.union(stream.index)
+    # sorted union of the timestamps (linear for sorted unique indexes)
+    data = stream_list[0].reindex(time_index)
+    for stream in stream_list[1:]:
+        stream = stream.reindex(time_index)
+        for col in stream.columns:
+            if col in data.columns:
+                data[col] = data[col].fillna(stream[col])
+            else:
+                data[col] = stream[col]
+    data.index.name = 'time'
+    return data.reset_index()
 
-    wind_paths = []
-    for site in sites:
-        wind_paths.append(file_path + '/' + site + '/met')
-
-    all_files = []
-    for file_path in wind_paths:
-        file = glob.glob(r'' + file_path + "/*.csv")
-        all_files.append(file)
-    for file in all_files:
-        if file == all_files[0]:
-            combined_files = file
-        else:
-            combined_files += file
 
-    quarters = get_quarters_and_years_func(start_time, end_time)
-    good_file_paths = []
-    for path in combined_files:
-        year_q_position = path.find('_20')
-        date_info = path[(year_q_position + 1): (year_q_position + 8)]
-        if date_info in quarters:
-            good_file_paths.append(path)
+@profile_stage_func
+def csv_import_func(file_paths, sites, header_num=1, cache_dir=None, workers=None, columns=None, start_time=None,
+                    end_time=None, store_dir=None):
+    """
+    Imports a list of CSV_out files and combines them into one DF per site
 
-    return good_file_paths
+    Files can be parsed in parallel by a process pool (workers > 1).  The parsed DF's are returned in the same order
+    as file_paths so the per site grouping, concatenation and sorting are identical to the serial import.
 
+    A site's files are split into instrument streams by their columns (EX: methane and VOC files in one directory).
+    Every stream is time sorted with one row per timestamp (the last row in file order wins, see stream_dedupe_func)
+    and the streams are outer joined on 'time' in one sorted pass (see sorted_stream_join_func).
 
-def csv_import_func(file_paths, sites, header_num=1):
-    """
-    Constructs a list of relevant file_paths
+    With a store_dir the files of every site and instrument directory with an up to date time series store (see
+    store_build_func) are read from the memory mapped store instead of being parsed (see store_site_import_func).
 
     Parameters
     ----------
-    file_paths : str
-        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    file_paths : list of str
+        List of file paths to be imported (EX: output of file_path_generator_func)
     sites : list of str
         List of site(s) codes as strings (EX: ['LUR', 'BSE'])
     header_num : int
-        String of species as it appears in the data column (EX: 'ethane')
+        Row number of the column headers in the CSV files (default 1)
+    cache_dir : str
+        Directory used to cache the parsed files as feather (default None, no caching) see cached_csv_read_func
+    workers : int
+        Number of worker processes used to parse the files (default None, files are parsed one after another)
+    columns : list of str
+        Columns to import (EX: ['time', 'ethane']) files holding none of them are left out of the site DF (default
+        None, import every column) see species_columns_func and wind_columns_func
+    start_time : str
+        Only rows from this time on are imported (EX '2020-01-22 00:00:00') default None see csv_read_func
+    end_time : str
+        Only rows before this time are imported (EX '2020-08-28 05:00:00') default None
+    store_dir : str
+        Base directory of the time series stores (default None, every file is parsed)
 
     Returns
     -------
     list of objects
-
+        list of DF's one per site
     """
+    if store_dir is not None:
+        site_paths_list = [[path for path in file_paths if site in path] for site in sites]
+        return [store_site_import_func(site_paths, site, store_dir, header_num, cache_dir, workers, columns, start_time,
+                                       end_time)
+                for site, site_paths in zip(sites, site_paths_list) if len(site_paths) > 0]
+        # files in an up to date store are read from it, the others are parsed
+
     count = 0
     active_site = sites[0]
     df_list = []
     data_list = []
-    for path in file_paths:
-        data = pd.read_csv(path, header=header_num)
-        data['time'] = pd.to_datetime(data['time'], unit='s')
-        data['time'] = data['time'].dt.round('1min')
+    if workers is not None and workers > 1 and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            parsed_data = list(executor.map(cached_csv_read_func, file_paths, repeat(header_num), repeat(cache_dir),
+                                            repeat(columns), repeat(start_time), repeat(end_time)))
+        # parsing files in parallel, executor.map keeps the results in file_paths order
+    else:
+        parsed_data = (cached_csv_read_func(path, header_num, cache_dir, columns, start_time, end_time)
+                       for path in file_paths)
+    for path, data in zip(file_paths, parsed_data):
         if active_site in path and path != file_paths[-1]:
             df_list.append(data)
         elif active_site not in path and path != file_paths[-1]:
@@ -374,48 +1684,301 @@ def csv_import_func(file_paths, sites, header_num=1):
             df_list.append(data)
             data_list.append(df_list)
 
-    combine_data_list = []
-    for lst in data_list:
-        # data = lst[0]
-        count = 0
-        data_list_1 = []
-        data_list_2 = []
-        two_sets_of_data = False
-        for df in lst:
-            if count == 0:
-                data_list_1.append(df)
-                count += 1
-            elif df.columns[1] in data_list_1[0].columns:
-                data_list_1.append(df)
-                count += 1
-            else:
-                two_sets_of_data = True
-                data_list_2.append(df)
-                count += 1
+    return [site_streams_func(lst, columns) for lst in data_list]
+
+
+def site_streams_func(df_list, columns=None):
+    """
+    Combines the parsed files of one site: the files are split into instrument streams by their columns (EX: methane
+    and VOC files in one directory), every stream is de-duplicated (see stream_dedupe_func) and the streams are outer
+    joined on 'time' (see sorted_stream_join_func)
+
+    Parameters
+    ----------
+    df_list : list of objects
+        DF's of the site's files in file order
+    columns : list of str
+        Columns that were imported, files left with only a time column are dropped (default None, every column)
 
-        if len(data_list_1) == 1:
-            data1 = data_list_1[0]
+    Returns
+    -------
+    object
+        time sorted DF with one row per timestamp
+    """
+    if columns is not None:
+        df_list = [df for df in df_list if len(df.columns) > 1] or df_list[:1]
+        # dropping files that only had a time column left after the column selection
+    stream_list = []
+    for df in df_list:
+        for stream in stream_list:
+            if len(df.columns) < 2 or df.columns[1] in stream[0].columns:
+                stream.append(df)
+                break
         else:
-            data1 = pd.concat(data_list_1)
+            stream_list.append([df])
+    # splitting the site's files into instrument streams (EX: methane and VOC files in one directory)
 
-        if two_sets_of_data:
-            if len(data_list_2) == 1:
-                data2 = data_list_2[0]
-            else:
-                data2 = pd.concat(data_list_2)
-            data = pd.merge(data1, data2, on='time', how='outer')
+    return sorted_stream_join_func([stream_dedupe_func(stream) for stream in stream_list])
+    # one time sorted row per timestamp with the columns of every stream
+
+
+def file_signature_func(path):
+    """
+    Gets the size and modification time of a file (a file with the same signature has not been rewritten)
+
+    Parameters
+    ----------
+    path : str
+        file path
+
+    Returns
+    -------
+    list of int
+        size in bytes and modification time in nanoseconds, None if the file does not exist
+    """
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return [file_stat.st_size, file_stat.st_mtime_ns]
+
+
+def store_source_path_func(path):
+    """
+    Normalizes a CSV_out file path into the form used as a source file key of the time series stores
+
+    Parameters
+    ----------
+    path : str
+        file path (EX: 'E:/IDAT/BSE/voc//BSE_voc_2022_q3.csv')
+
+    Returns
+    -------
+    str
+        absolute normalized file path
+    """
+    return os.path.normpath(os.path.abspath(path))
+
+
+@profile_stage_func
+def store_build_func(file_path, site, instrument, store_dir, header_num=1, cache_dir=None, force=False):
+    """
+    Converts every quarterly CSV_out file of one site and instrument directory into one memory mapped time series
+    store (see store_write_func), a store whose source files are unchanged is left as it is
+
+    Parameters
+    ----------
+    file_path : str
+        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    site : str
+        site code (EX: 'BSE')
+    instrument : str
+        instrument directory (EX: 'voc')
+    store_dir : str
+        base directory of the time series stores (EX: 'E:\BA_store')
+    header_num : int
+        Row number of the column headers in the CSV files (default 1)
+    cache_dir : str
+        Directory of the parsed file cache (default None) see cached_csv_read_func
+    force : bool
+        True rebuilds the store even if its source files are unchanged (default False)
+
+    Returns
+    -------
+    dict
+        store description (see store_meta_func), None if the directory has no CSV files
+    """
+    file_paths = sorted(glob.glob(os.path.join(file_path, site, instrument, '*.csv')))
+    if len(file_paths) == 0:
+        return None
+    path = store_path_func(store_dir, site, instrument)
+    signatures = {store_source_path_func(source): file_signature_func(source) for source in file_paths}
+    meta = store_meta_func(path)
+    if not force and meta is not None and {source: entry[:2] for source, entry in meta['files'].items()} == signatures:
+        return meta
+        # up to date
+
+    df_list = [cached_csv_read_func(source, header_num, cache_dir) for source in file_paths]
+    files = {}
+    for source, df in zip(file_paths, df_list):
+        times = df['time'].dropna().to_numpy().astype('datetime64[m]').astype(np.int64)
+        files[store_source_path_func(source)] = signatures[store_source_path_func(source)] + (
+            [int(times.min()), int(times.max())] if len(times) > 0 else [None, None])
+    return store_write_func(path, site_streams_func(df_list), files)
+
+
+def store_build_all_func(file_path, store_dir, sites=None, instruments=None, header_num=1, cache_dir=None,
+                         verbose=False):
+    """
+    Builds (or brings up to date) the time series store of every site and instrument directory of an IDAT tree (see
+    store_build_func)
+
+    Parameters
+    ----------
+    file_path : str
+        Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
+    store_dir : str
+        base directory of the time series stores (EX: 'E:\BA_store')
+    sites : list of str
+        site codes (default None, every site directory)
+    instruments : list of str
+        instrument directories (default None, every instrument directory of the site)
+    header_num : int
+        Row number of the column headers in the CSV files (default 1)
+    cache_dir : str
+        Directory of the parsed file cache (default None)
+    verbose : bool
+        True prints the rows and time span of every store (default False)
+
+    Returns
+    -------
+    dict
+        (site, instrument): store description
+    """
+    if sites is None:
+        sites = sorted(site for site in os.listdir(file_path) if os.path.isdir(os.path.join(file_path, site)))
+    meta_dict = {}
+    for site in sites:
+        site_instruments = instruments
+        if site_instruments is None:
+            site_instruments = sorted(instrument for instrument in os.listdir(os.path.join(file_path, site))
+                                      if os.path.isdir(os.path.join(file_path, site, instrument)))
+        for instrument in site_instruments:
+            meta = store_build_func(file_path, site, instrument, store_dir, header_num, cache_dir)
+            if meta is not None:
+                meta_dict[(site, instrument)] = meta
+            if meta is not None and verbose:
+                print(site + ' ' + instrument + ': ' + str(meta['rows']) + ' rows ' + str(meta['first']) + ' to ' +
+                      str(meta['last']))
+    return meta_dict
+
+
+@profile_stage_func
+def store_site_import_func(file_paths, site, store_dir, header_num=1, cache_dir=None, workers=None, columns=None,
+                           start_time=None, end_time=None):
+    """
+    Imports the CSV_out files of one site from the time series stores (see csv_import_func)
+
+    The files are grouped by instrument directory (file_path/site/instrument/file.csv).  The rows of a group whose
+    files are all in an up to date store are found by binary search and read from the copy on write memory mapped
+    arrays without parsing or copying, the files of any other group are parsed (see csv_import_func).
+
+    Parameters
+    ----------
+    file_paths : list of str
+        file paths of one site
+    site : str
+        site code (EX: 'BSE')
+    store_dir : str
+        base directory of the time series stores
+    header_num : int
+        Row number of the column headers in the CSV files (default 1)
+    cache_dir : str
+        Directory of the parsed file cache (default None)
+    workers : int
+        Number of worker processes used to parse the files that are not in a store (default None, serial)
+    columns : list of str
+        Columns to import (default None, every column)
+    start_time : str
+        Only rows from this time on are imported (default None)
+    end_time : str
+        Only rows before this time are imported (default None)
+
+    Returns
+    -------
+    object
+        time sorted DF of the site with one row per timestamp
+    """
+    group_dict = {}
+    for path in file_paths:
+        source = store_source_path_func(path)
+        group_dict.setdefault(store_path_func(store_dir, os.path.basename(os.path.dirname(os.path.dirname(source))),
+                                              os.path.basename(os.path.dirname(source))), []).append(path)
+    # store directory: file paths
+
+    stream_list = []
+    parsed_paths = []
+    for path, group_paths in group_dict.items():
+        meta = store_meta_func(path)
+        sources = [store_source_path_func(group_path) for group_path in group_paths]
+        if meta is not None and all(source in meta['files'] and meta['files'][source][:2] ==
+                                    file_signature_func(source) for source in sources):
+            stream_list.append(store_frame_func(path, columns, start_time, end_time, sources, mmap_mode='c'))
         else:
-            data = data1
+            parsed_paths += group_paths
+            # no store or a file was added or changed since it was built
+    if len(parsed_paths) > 0:
+        stream_list += csv_import_func(parsed_paths, [site], header_num, cache_dir, workers, columns, start_time,
+                                       end_time)
+    if columns is not None:
+        stream_list = [stream for stream in stream_list if len(stream.columns) > 1] or stream_list[:1]
+    return sorted_stream_join_func(stream_list)
+
+
+def cache_warm_file_func(path, header_num=1, cache_dir=None):
+    """
+    Parses a single CSV_out file into the feather cache if it is not cached yet (see cached_csv_read_func)
+
+    Parameters
+    ----------
+    path : str
+        File path to a single CSV_out file
+    header_num : int
+        Row number of the column headers in the CSV file (default 1)
+    cache_dir : str
+        Directory where the cached feather files are stored
+
+    Returns
+    -------
+    bool
+        True if the file was parsed, False if it was already cached or could not be read (the error is printed and
+        left for the import that needs the file to report)
+    """
+    try:
+        if os.path.exists(cache_file_path_func(path, cache_dir, header_num)[0]):
+            return False
+        cached_csv_read_func(path, header_num, cache_dir)
+    except Exception as error:
+        print('could not cache ' + path + ': ' + repr(error))
+        return False
+        # a missing or malformed file only fails the jobs that import it
+    return True
+
+
+@profile_stage_func
+def cache_warm_func(file_paths, cache_dir, header_num=1, workers=None):
+    """
+    Parses every file that is not cached yet into the feather cache so later imports of the files only read the cache
 
-        data = data.sort_values(by=['time'])
+    Used by Batch_Runner to parse each input file once for all of the jobs that need it.
 
-        combine_data_list.append(data)
+    Parameters
+    ----------
+    file_paths : list of str
+        List of file paths to be cached
+    cache_dir : str
+        Directory where the cached feather files are stored
+    header_num : int
+        Row number of the column headers in the CSV files (default 1)
+    workers : int
+        Number of worker processes used to parse the files (default None, files are parsed one after another)
 
-    return combine_data_list
+    Returns
+    -------
+    int
+        number of files that were parsed
+    """
+    if workers is not None and workers > 1 and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            parsed = list(executor.map(cache_warm_file_func, file_paths, repeat(header_num), repeat(cache_dir)))
+    else:
+        parsed = [cache_warm_file_func(path, header_num, cache_dir) for path in file_paths]
+    return sum(parsed)
 
 
+@profile_stage_func
 def voc_wind_pairing_func(met_df,
-                          voc_df):
+                          voc_df, close_last_window=False):
     """
     This function is meant to pair met and VOC data together (can also add methane data if needed)
 
@@ -423,12 +1986,19 @@ def voc_wind_pairing_func(met_df,
     middle of the interval.  Wind direction data is averaged using a special method since it has a circular scale
     (0 to 360).  Methane may also be included in the averaged interval if it is present in the met data.
 
+    The averaging is done with array operations: every met row within 4 rows of a VOC sample is selected, overlapping
+    or touching windows are joined into one run (as the original row by row loop did) and all runs are averaged in
+    one wind_statistics_func call.  A run's average is placed 4 rows before its last row.
+
     Parameters
     __________
     met_df : object
         dataframe containing met data
     voc_df : object
         dataframe containing VOC data
+    close_last_window : bool
+        The original loop only closed a run when the next one started so the last VOC sample was never paired.  False
+        (default) keeps that behavior, True also pairs the last VOC sample (used when streaming quarter by quarter)
 
     Returns
     -------
@@ -443,24 +2013,15 @@ def voc_wind_pairing_func(met_df,
     data = data.set_index(['time'])  # sorting index by date
     data = data.sort_index()
     data = data.reset_index()
-    ind_bool = data.loc[data['bool'] == True]
-    goodind = ind_bool.index.tolist()
+    goodind = np.flatnonzero((data['bool'] == True).to_numpy())
     ch4_bool = False
 
-    reallygoodind = []
-    for i in goodind:  # getting index values within 9 mins of voc data colection
-        reallygoodind.append(i - 4)
-        reallygoodind.append(i - 3)
-        reallygoodind.append(i - 2)
-        reallygoodind.append(i - 1)
-        reallygoodind.append(i)
-        reallygoodind.append(i + 1)
-        reallygoodind.append(i + 2)
-        reallygoodind.append(i + 3)
-        reallygoodind.append(i + 4)
+    window_bool = np.zeros(len(data), dtype=bool)
+    for offset in range(-4, 5):  # marking index values within 9 mins of voc data colection
+        window_ind = goodind + offset
+        window_bool[window_ind[(window_ind >= 0) & (window_ind < len(data))]] = True
     data['index'] = data.index
-    data2 = [data['index'].isin(reallygoodind)]
-    data['bool2'] = np.transpose(data2)
+    data['bool2'] = window_bool
     data = data.loc[data['bool2'] == True]
     if 'wsp_avg_ms' in list(data.columns) or 'wdr_avg' in list(data.columns):
         data = data.rename(columns={'wsp_avg_ms': 'wsp', 'wdr_avg': 'wdr'})
@@ -470,132 +2031,37 @@ def voc_wind_pairing_func(met_df,
         ch4_bool = True
     data['wdr'] = data['wdr'].astype(float)  # converting wdr and wsp into floating point values for later functions
     data['wsp'] = data['wsp'].astype(float)
-    data['x'] = np.sin((data['wdr'] * np.pi / 180))  # converting wdr into east-west and north-south components
-    data['y'] = np.cos((data['wdr'] * np.pi / 180))
 
-    avg_wsp_list = []
-    avg_list = []
-    fixedind = []
-    last_ind = None
+    index_array = data['index'].to_numpy()
+    run_starts = np.flatnonzero(np.diff(index_array, prepend=-2) != 1)
+    # a new averaging run starts wherever the selected index values stop being consecutive
+    run_ends = np.append(run_starts[1:], len(index_array)) - 1
+    run_codes = np.repeat(np.arange(len(run_starts)), run_ends - run_starts + 1)
 
+    run_stats = wind_statistics_func(data['wdr'], data['wsp'], groups=run_codes, direction='quadrant', skipna=False)
+    avgdata = pd.DataFrame(index_array[run_ends] - 4, columns=['index'])
+    avgdata['avg_wdr'] = run_stats['wdr'].to_numpy()
+    avgdata['avg_wsp'] = run_stats['wsp'].to_numpy()
     if ch4_bool is True:
-        avg_ch4_list = []
-        for ind, row in data.iterrows():
-            if ind - 1 == last_ind:
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                last_ind = ind
-                avgwsplist.append(row['wsp'])
-                avgch4list.append(row['ch4'])
-            elif ind == reallygoodind[0]:
-                avgch4list = []
-                avgwsplist = []
-                xlist = []
-                ylist = []
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                avgwsplist.append(row['wsp'])
-                avgch4list.append(row['ch4'])
-                last_ind = ind
-            else:
-                centerind = (last_ind - 4)
-                fixedind.append(centerind)
-                xtot = sum(xlist)
-                ytot = sum(ylist)
-                dev = (xtot / ytot)
-                ark = (np.arctan(dev))
-                avg = (ark * 57.2958)
-                if xtot > 0 and ytot > 0:  # if loop used to determin which quadrent wind direction data fit in
-                    avg_list.append(avg)
-                elif xtot > 0 and ytot < 0:
-                    avg2nd = (avg + 180)
-                    avg_list.append(avg2nd)
-                elif xtot < 0 and ytot < 0:
-                    avg3rd = (avg + 180)
-                    avg_list.append(avg3rd)
-                elif xtot < 0 and ytot > 0:
-                    avg4th = (avg + 360)
-                    avg_list.append(avg4th)
-                else:
-                    avg_list.append(np.nan)
-                wsp = mean(avgwsplist)
-                ch4 = mean(avgch4list)
-                avg_wsp_list.append(wsp)
-                avg_ch4_list.append(ch4)
-                xlist = []
-                ylist = []
-                avgwsplist = []
-                avgch4list = []
-                avgwsplist.append(row['wsp'])
-                avgch4list.append(row['ch4'])
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                last_ind = ind
-    else:
-        for ind, row in data.iterrows():
-            if ind - 1 == last_ind:
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                last_ind = ind
-                avgwsplist.append(row['wsp'])
-            elif ind == reallygoodind[0]:
-                avgwsplist = []
-                xlist = []
-                ylist = []
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                avgwsplist.append(row['wsp'])
-                last_ind = ind
-            else:
-                centerind = (last_ind - 4)
-                fixedind.append(centerind)
-                xtot = sum(xlist)
-                ytot = sum(ylist)
-                dev = (xtot / ytot)
-                ark = (np.arctan(dev))
-                avg = (ark * 57.2958)
-                if xtot > 0 and ytot > 0:  # if loop used to determin which quadrent wind direction data fit in
-                    avg_list.append(avg)
-                elif xtot > 0 and ytot < 0:
-                    avg2nd = (avg + 180)
-                    avg_list.append(avg2nd)
-                elif xtot < 0 and ytot < 0:
-                    avg3rd = (avg + 180)
-                    avg_list.append(avg3rd)
-                elif xtot < 0 and ytot > 0:
-                    avg4th = (avg + 360)
-                    avg_list.append(avg4th)
-                else:
-                    avg_list.append(np.nan)
-                wsp = mean(avgwsplist)
-                avg_wsp_list.append(wsp)
-                xlist = []
-                ylist = []
-                avgwsplist = []
-                avgwsplist.append(row['wsp'])
-                xlist.append(row['x'])
-                ylist.append(row['y'])
-                last_ind = ind
-
-    avgdata = pd.DataFrame(fixedind, columns=['index'])
-    avgdata['avg_wdr'] = avg_list
-    avgdata['avg_wsp'] = avg_wsp_list
-    if ch4_bool is True:
-        avgdata['avg_ch4'] = avg_ch4_list
+        ch4_tot, ch4_count = group_sum_func(data['ch4'], run_codes, len(run_starts), skipna=False)
+        avgdata['avg_ch4'] = ch4_tot / ch4_count
+    if close_last_window is False:
+        avgdata = avgdata.iloc[:-1]
+        # runs are only closed when the next one starts, so the last run is dropped (same as the original loop)
     data = pd.merge(data, avgdata, on=['index'], how='outer')  # merging data frames
-    check = data
     data = data.loc[data['bool'] == True]
     if ch4_bool is True:
         data = data.drop(
-            columns=['x', 'y', 'wsp', 'wdr', 'bool', 'bool2', 'index', 'ch4'])  # removed co2 from this list
+            columns=['wsp', 'wdr', 'bool', 'bool2', 'index', 'ch4'])  # removed co2 from this list
     else:
-        data = data.drop(columns=['x', 'y', 'wsp', 'wdr', 'bool', 'bool2', 'index'])
+        data = data.drop(columns=['wsp', 'wdr', 'bool', 'bool2', 'index'])
     if ch4_bool is True:
         data = data.rename(columns={'avg_wdr': 'wdr', 'avg_wsp': 'wsp', 'avg_ch4': 'ch4'})
     else:
         data = data.rename(columns={'avg_wdr': 'wdr', 'avg_wsp': 'wsp'})
     return data
 
+@profile_stage_func
 def radon_wind_pairing_func(met_df, radon_df):
     """
     This function is meant to pair met and VOC data together (can also add methane data if needed)
@@ -604,6 +2070,9 @@ def radon_wind_pairing_func(met_df, radon_df):
     end of the interval.  Wind direction data is averaged using a special method since it has a circular scale
     (0 to 360).  Methane may also be included in the averaged interval if it is present in the met data.
 
+    The trailing 10 row windows are gathered with one fancy index (radon samples x 10 rows) and averaged in one
+    wind_statistics_func call, so the run time grows linearly with the number of radon samples.
+
     Parameters
     __________
     met_df : object
@@ -624,76 +2093,32 @@ def radon_wind_pairing_func(met_df, radon_df):
     data = data.set_index(['time'])  # sorting index by date
     data = data.sort_index()
     data = data.reset_index()
-    ind_bool = data.loc[data['bool'] == True]
-    goodind = ind_bool.index.tolist()
-    data['wdr'] = data['wdr'].astype(float)  # converting wdr and wsp into floating point values for later functions
-    data['wsp'] = data['wsp'].astype(float)
+    goodind = np.flatnonzero((data['bool'] == True).to_numpy())
 
     if 'wsp_avg_ms' in list(data.columns) or 'wdr_avg' in list(data.columns):
         data = data.rename(columns={'wsp_avg_ms': 'wsp', 'wdr_avg': 'wdr'})
+    data['wdr'] = data['wdr'].astype(float)  # converting wdr and wsp into floating point values for later functions
+    data['wsp'] = data['wsp'].astype(float)
 
-    data['wdr_x'] = np.sin((data['wdr'] * np.pi / 180))  # converting wdr into east-west and north-south components
-    data['wdr_y'] = np.cos((data['wdr'] * np.pi / 180))
-
-    # creating list of lists with each nested list comprised of index values for averaging
-    avg_inds_list = []
-    for ind in goodind:
-        num = 0
-        ind_buffer_list = []
-        while num < 10:
-            ind_buffer_list.append(ind-num)
-            num += 1
-        avg_inds_list.append(ind_buffer_list)
-
-    # grabbing relivant wsp, wdr, and time data to do averaging
-    avg_wsp_list = []
-    avg_wdr_list = []
-    time_interval_list = []
-    for lst in avg_inds_list:
-        wdr_x_list = []
-        wdr_y_list = []
-        wsp_list = []
-        for ind in lst:
-            wdr_x_list.append(data.iloc[ind]['wdr_x'])
-            wdr_y_list.append(data.iloc[ind]['wdr_y'])
-            wsp_list.append(data.iloc[ind]['wsp'])
-            if ind == lst[0]:
-                time_interval_list.append(data.iloc[ind]['time'])
-
-        avg_wsp_list.append(mean(wsp_list))
-        # getting avg wsp for each interval_group
-
-        # calculating wdr average for each group
-        wdr_x_tot = sum(wdr_x_list)
-        wdr_y_tot = sum(wdr_y_list)
-        dev = (wdr_x_tot / wdr_y_tot)
-        ark = (np.arctan(dev))
-        avg = (ark * 57.2958)
-        if wdr_x_tot > 0 and wdr_y_tot > 0:  # if loop used to determin which quadrent wind direction data fit in
-            avg_wdr_list.append(avg)
-        elif wdr_x_tot > 0 and wdr_y_tot < 0:
-            avg2nd = (avg + 180)
-            avg_wdr_list.append(avg2nd)
-        elif wdr_x_tot < 0 and wdr_y_tot < 0:
-            avg3rd = (avg + 180)
-            avg_wdr_list.append(avg3rd)
-        elif wdr_x_tot < 0 and wdr_y_tot > 0:
-            avg4th = (avg + 360)
-            avg_wdr_list.append(avg4th)
-        else:
-            avg_wdr_list.append(np.nan)
+    avg_inds = (goodind[:, np.newaxis] - np.arange(10)).ravel()
+    # index values for averaging, the radon sample row and the 9 rows before it for every sample, negative index
+    # values wrap around to the end of the data the same way iloc did in the original loop
+    window_codes = np.repeat(np.arange(len(goodind)), 10)
+    window_stats = wind_statistics_func(data['wdr'].to_numpy()[avg_inds], data['wsp'].to_numpy()[avg_inds],
+                                        groups=window_codes, direction='quadrant', skipna=False)
 
     # created a combine df and merging it with the radon df
     combine_df = pd.DataFrame()
-    combine_df['wdr'] = avg_wdr_list
-    combine_df['wsp'] = avg_wsp_list
-    combine_df['time'] = time_interval_list
+    combine_df['wdr'] = window_stats['wdr'].to_numpy()
+    combine_df['wsp'] = window_stats['wsp'].to_numpy()
+    combine_df['time'] = data['time'].to_numpy()[goodind]
 
     combine_df = pd.merge(combine_df, radon_df, on='time', how='outer')
 
     return combine_df
 
 
+@profile_stage_func
 def met_methane_combine_func(data_parameters, wind_list, methane_list):
     """
     combines met and methane data into a single df then adds df to list of df(s).
@@ -719,7 +2144,8 @@ def met_methane_combine_func(data_parameters, wind_list, methane_list):
     return met_list
 
 
-def met_methane_voc_combine_func(data_parameters, wind_list, data_list):
+@profile_stage_func
+def met_methane_voc_combine_func(data_parameters, wind_list, data_list, close_last_window=False):
     """
     met and methane data are already combine and then combine voc data with that. (returns list with combined df's)
 
@@ -734,6 +2160,8 @@ def met_methane_voc_combine_func(data_parameters, wind_list, data_list):
         list of met df's
     data_list : list of objects
         list of VOC df's
+    close_last_window : bool
+        passed to voc_wind_pairing_func, True also pairs the last VOC sample (default False)
 
     Returns
     --------
@@ -746,13 +2174,14 @@ def met_methane_voc_combine_func(data_parameters, wind_list, data_list):
         data_list[i]['pro_eth'] = data_list[i]['propane'] / data_list[i]['ethane']
         data_list[i]['in_pent'] = data_list[i]['i-pentane'] / data_list[i]['n-pentane']
         data_list[i]['in_bute'] = data_list[i]['i-butane'] / data_list[i]['n-butane']
-        data = voc_wind_pairing_func(wind_list[i], data_list[i])
+        data = voc_wind_pairing_func(wind_list[i], data_list[i], close_last_window=close_last_window)
         data['eth_meth'] = (data['ethane'] / data['ch4'])
         combine_data.append(data)
     return combine_data
 
 
-def met_voc_combine_func(data_parameters, wind_list, data_list):
+@profile_stage_func
+def met_voc_combine_func(data_parameters, wind_list, data_list, close_last_window=False):
     """
     combine voc data with met data (returns list with combened df's)
 
@@ -767,6 +2196,8 @@ def met_voc_combine_func(data_parameters, wind_list, data_list):
         list of met df's
     data_list : list of objects
         list of VOC df's
+    close_last_window : bool
+        passed to voc_wind_pairing_func, True also pairs the last VOC sample (default False)
 
     Returns
     --------
@@ -779,10 +2210,11 @@ def met_voc_combine_func(data_parameters, wind_list, data_list):
         data_list[i]['pro_eth'] = data_list[i]['propane'] / data_list[i]['ethane']
         data_list[i]['in_pent'] = data_list[i]['i-pentane'] / data_list[i]['n-pentane']
         data_list[i]['in_bute'] = data_list[i]['i-butane'] / data_list[i]['n-butane']
-        data = voc_wind_pairing_func(wind_list[i], data_list[i])
+        data = voc_wind_pairing_func(wind_list[i], data_list[i], close_last_window=close_last_window)
         combine_data.append(data)
     return combine_data
 
+@profile_stage_func
 def met_radon_combine_func(data_parameters, wind_list, data_list):
     """
     combine voc data with met data (returns list with combened df's)
@@ -810,6 +2242,7 @@ def met_radon_combine_func(data_parameters, wind_list, data_list):
         combine_data.append(data)
     return combine_data
 
+@profile_stage_func
 def met_non_voc_combine_func(data_parameters, wind_list, data_list):
     """
     combine non-voc data with met data (returns list with combened df's)
@@ -841,7 +2274,7 @@ def met_non_voc_combine_func(data_parameters, wind_list, data_list):
 
 def zero_filter_func(combine_data):
     """
-    Used to replace all 0 and negative values in a dataframe with NaN's
+    Used to replace all 0 and negative values in a dataframe with NaN's (calendar feature columns are left as is)
 
     Parameters
     __________
@@ -857,7 +2290,8 @@ def zero_filter_func(combine_data):
     for df in combine_data:
         df = df.set_index(df['time'])
         df = df.drop(columns=['time'])
-        df = df.mask(df <= 0)
+        value_columns = [col for col in df.columns if col not in CALENDAR_FEATURE_LIST]
+        df[value_columns] = df[value_columns].mask(df[value_columns] <= 0)
         df = df.reset_index()
         filtered_combine_data.append(df)
     return filtered_combine_data
@@ -865,7 +2299,7 @@ def zero_filter_func(combine_data):
 
 def box_zero_filter_func(combine_data):
     """
-    Used to replace all 0 and negative values in a dataframe with NaN's
+    Used to replace all 0 and negative values in a dataframe with NaN's (calendar feature columns are left as is)
 
     Parameters
     __________
@@ -878,6 +2312,8 @@ def box_zero_filter_func(combine_data):
          returns df with 0 and negative values replaced with NaN's
     """
     for col in combine_data.columns:
+        if col in CALENDAR_FEATURE_LIST:
+            continue
         try:
             combine_data[col] = combine_data[col].mask(combine_data[col] <= 0)
         except:
@@ -885,7 +2321,52 @@ def box_zero_filter_func(combine_data):
     return combine_data
 
 
-def wind_ready_export_func(data_parameters, combine_data):
+def wind_ready_file_path_func(data_parameters, site):
+    """
+    Constructs the file path of a site's wind ready CSV file
+
+    Parameters
+    __________
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+    site : str
+        site code as a string (EX: 'BSE')
+
+    Returns
+    ________
+    str
+        file path of the wind ready CSV file in the out directory
+    """
+    return (data_parameters.export_dir + '\\' + site + '_' + data_parameters.species + '_' +
+            data_parameters.start_time[:10] + '__' + data_parameters.end_time[:10] + '_Wind_Plot_Ready.csv')
+
+
+def figure_path_func(data_parameters, suffix=''):
+    """
+    Constructs the file path (without extension) a box plot figure is saved to, None if no output_dir is set
+
+    Parameters
+    __________
+    data_parameters : object
+        class object storing parameters essential for constructing the box plot
+    suffix : str
+        added to the end of the file name to tell apart several figures of one plot type (EX: '_yearly_comparison')
+
+    Returns
+    ________
+    str
+        file path in the output_dir (EX: 'E:/figures/BSE_LUR_ch4_quarterly_report_2022-04-01__2022-06-30')
+    """
+    if getattr(data_parameters, 'output_dir', None) is None:
+        return None
+    file_name = ('_'.join(data_parameters.sites) + '_' + data_parameters.species + '_' +
+                 data_parameters.plot_type.replace(' ', '_') + '_' + data_parameters.start_time[:10] + '__' +
+                 data_parameters.end_time[:10] + suffix)
+    return os.path.join(data_parameters.output_dir, file_name)
+
+
+@profile_stage_func
+def wind_ready_export_func(data_parameters, combine_data, append=False):
     """
     Used to export R OpenAir ready data
 
@@ -895,6 +2376,8 @@ def wind_ready_export_func(data_parameters, combine_data):
         class object storing parameters and constants for making windrose ready files
     combine_data : list of objects
         data frame containing combined met and species data ready for export
+    append : bool
+        True appends the rows (without a header) to existing files (default False, overwrite the files)
 
     Returns
     ________
@@ -905,12 +2388,32 @@ def wind_ready_export_func(data_parameters, combine_data):
     num = 0
     for df in combine_data:
         df = df.loc[df['wsp'] > data_parameters.wsp_filter]
-        df.to_csv(data_parameters.export_dir + '\\' + data_parameters.sites[num] + '_' +
-                  data_parameters.species + '_' + data_parameters.start_time[:10] + '__' +
-                  data_parameters.end_time[:10] + '_Wind_Plot_Ready.csv', index=False, encoding='utf-8')
+        df.to_csv(wind_ready_file_path_func(data_parameters, data_parameters.sites[num]), index=False,
+                  encoding='utf-8', mode='a' if append else 'w', header=not append)
         num += 1
 
 
+def quarter_bounds_func(quarter_year):
+    """
+    Gets the start and end time strings of a quarter string from get_quarters_and_years_func
+
+    Parameters
+    __________
+    quarter_year : str
+        year and quarter string (EX: '2022_q3')
+
+    Returns
+    ________
+    str, str
+        start and end time of the quarter (EX: '2022-07-01 00:00:00', '2022-09-30 23:59:00')
+    """
+    year = int(quarter_year[:4])
+    first_month = (int(quarter_year[-1]) - 1) * 3 + 1
+    start = dt.datetime(year, first_month, 1)
+    end = start + relativedelta(months=3) - relativedelta(minutes=1)
+    return start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S')
+
+
 def quarter_loc_func(quarter_year):
     """
     this function makes a list of all relivant quarters and years between your start_time and end_time it also returns
@@ -972,7 +2475,8 @@ def lat_lon_column_func(combine_data, data_parameters):
     combine_data : list of objects
         list of all combine df's (one for each site)
     data_parameters : object
-        class object storing parameters and constants for making windrose ready files
+        class object storing parameters and constants for making windrose ready files (with compact set the columns
+        are numeric)
 
     Returns
     ________
@@ -980,6 +2484,10 @@ def lat_lon_column_func(combine_data, data_parameters):
         returns list of df's with lat and lon columns added specific to each site's combine df
     """
     for i in range(len(data_parameters.sites)):
-        combine_data[i]['lat'] = LAT_LON_DICT.get(data_parameters.sites[i])[0]
-        combine_data[i]['lon'] = LAT_LON_DICT.get(data_parameters.sites[i])[1]
+        lat, lon = LAT_LON_DICT.get(data_parameters.sites[i])
+        if getattr(data_parameters, 'compact', False):
+            lat, lon = float(lat), float(lon)
+            # numeric lat and lon columns instead of a python string per row
+        combine_data[i]['lat'] = lat
+        combine_data[i]['lon'] = lon
     return combine_data
\ No newline at end of file
@@ -1,4 +1,7 @@
+import contextlib
 import pandas as pd
+import matplotlib as mpl
+import matplotlib.patches
 import matplotlib.pyplot as plt
 import datetime as dt
 import seaborn as sns
@@ -8,8 +11,117 @@ import numpy as np
 import glob
 import matplotlib.dates as mdates
 from Common_Functions import *
+from Run_Profiler import profile_stage_func
 from statistics import mean
 
+
+def categorical_order_func(values):
+    """
+    Orders the categories of a column the way seaborn does (order of appearance, sorted if the values are numeric)
+
+    Parameters
+    ----------
+    values : object
+        pandas data frame column (EX: df['time'])
+
+    Returns
+    -------
+    list
+        list of the unique non null values in plotting order
+    """
+    if hasattr(values, 'cat'):
+        return list(values.cat.categories)
+    order = list(pd.unique(values.dropna()))
+    if pd.api.types.is_numeric_dtype(values):
+        order = sorted(order)
+    return order
+
+
+@profile_stage_func
+def figure_output_func(fig, output_path=None, formats=None):
+    """
+    Shows a figure or, if an output_path is given, saves it in every format and closes it
+
+    Parameters
+    ----------
+    fig : object
+        matplotlib figure
+    output_path : str
+        file path without extension (EX: 'E:/figures/BSE_ch4_quarterly_report') default None shows the figure
+    formats : list of str
+        file formats (EX: ['png', 'svg', 'pdf']) default None saves a png
+
+    Returns
+    -------
+    None
+        shows or saves the figure
+    """
+    if output_path is None:
+        plt.show()
+        return
+    if os.path.dirname(output_path) != '':
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    for file_format in formats if formats is not None else ['png']:
+        fig.savefig(output_path + '.' + file_format, bbox_inches='tight')
+    plt.close(fig)
+    # closing the figure so long headless runs do not keep every figure in memory
+
+
+@contextlib.contextmanager
+def figure_context_func(style='darkgrid', font_scale=4, palette=None, output_path=None, formats=None):
+    """
+    Creates a new figure with its own seaborn style, font scale and palette and shows or saves it when the with block
+    ends (see figure_output_func)
+
+    The style is set inside plt.rc_context so it is undone when the figure is done and one figure's style never
+    leaks into the next one (EX: when several figures are made in the same worker process).  Saved figures use
+    FIGURE_SIZE so they look like a maximized figure window.  If the with block raises the figure is closed without
+    being shown or saved and the style is undone as well.
+
+    Parameters
+    ----------
+    style : str
+        string specifying how the plot looks default = 'darkgrid' look up Seaborn styles for more options
+    font_scale : int or float
+        font size parameter default 4
+    palette : list of str
+        list of hex codes specifying color (normally use site colors)
+    output_path : str
+        file path without extension the figure is saved to, default None shows the figure
+    formats : list of str
+        file formats the figure is saved in (EX: ['png', 'svg', 'pdf']) default None saves a png
+
+    Returns
+    -------
+    object
+        matplotlib figure (yielded to the with block)
+    """
+    with plt.rc_context():
+        sns.set(style=style, font_scale=font_scale)
+        if palette is not None:
+            sns.set_palette(palette=palette) #creat palette in list ex. ['#0CF215']
+        fig = plt.figure(figsize=FIGURE_SIZE if output_path is not None else None)
+        try:
+            yield fig
+        except BaseException:
+            plt.close(fig)
+            raise
+            # a failed figure is closed and not saved, leaving the rc_context block undoes the style
+        figure_output_func(fig, output_path, formats)
+
+
+def headless_backend_func():
+    """
+    Switches matplotlib to the non-interactive Agg backend so figures can be saved without a display (used as the
+    initializer of figure rendering worker processes)
+
+    Returns
+    -------
+    None
+    """
+    plt.switch_backend('Agg')
+
+
 class GeneralBoxPlot():
     """
     takes data stored in df x_column as a df[column] y_column as a df[column] and hue_column used to bin the data as
@@ -32,12 +144,18 @@ class GeneralBoxPlot():
         self.y = y_column
         self.hue = hue_column
 
+    @profile_stage_func
     def plotting_func(self, x_label='xlabel', y_label='ylabel', title='title', style='darkgrid', font_scale=4,
 
-                      palette=None, showmeans=True, showfliers=False, legend=True, hue_order=None):
+                      palette=None, showmeans=True, showfliers=False, legend=True, hue_order=None, from_stats=True,
+                      output_path=None, formats=None):
         """
         take self parameters from when class was instantiated and produces a boxplot
 
+        By default the box statistics of every (x, hue) group are computed first in one vectorized groupby (see
+        box_stats_func) and drawn with StatsBoxPlot, so drawing time depends on the number of boxes and not on the
+        number of rows.  Outliers need the raw rows so showfliers=True (or from_stats=False) draws with sns.boxplot.
+
         Parameters
         ----------
         x_label : str
@@ -60,28 +178,264 @@ class GeneralBoxPlot():
             True or False adds or hides legend from the figure
         hue_order : list of str
             The order in which the hue column boxes are ordered
+        from_stats : bool
+            True (default) draws the boxes from precomputed statistics, False passes every row to sns.boxplot
+        output_path : str
+            file path (without extension) the figure is saved to, default None shows the figure with plt.show()
+        formats : list of str
+            file formats the figure is saved in (EX: ['png', 'svg', 'pdf']) default None saves a png
 
         Returns
         _______
         None
             makes a boxplot figure
         """
-        sns.set(style=style, font_scale=font_scale)
-        if palette is not None:
-            sns.set_palette(palette=palette) #creat palette in list ex. ['#0CF215']
-        ax1 = sns.boxplot(x=self.x, y=self.y, data=self.df, hue=self.hue, whis=[5, 95], showmeans=showmeans,
-                          showfliers=showfliers,
-                          hue_order=hue_order,
-                          meanprops={"marker": "o",
-                                     "markerfacecolor": "white",
-                                     "markeredgecolor": "black",
-                                     "markersize": "15"})
-        ax1.set_xlabel(x_label, labelpad=20)
-        ax1.set_ylabel(y_label, labelpad=20)
-        ax1.set_title(title)
-        if legend is True:
-            plt.subplots_adjust(right=0.84)
-            ax1.legend(bbox_to_anchor=(1.225, 1.029))
-        else:
-            ax1.get_legend().remove()
-        plt.show()
\ No newline at end of file
+        if from_stats is True and showfliers is False:
+            x_name = self.x.name if self.x.name is not None else 'x'
+            y_name = self.y.name if self.y.name is not None else 'y'
+            hue_name = self.hue.name if self.hue.name is not None else 'hue'
+            data = pd.DataFrame({x_name: self.x.to_numpy(), hue_name: self.hue.to_numpy(),
+                                 y_name: self.y.to_numpy()})
+            stats_df = box_stats_func(data, y_name, [x_name, hue_name])
+            # one row of statistics per box
+            if hue_order is None:
+                hue_order = categorical_order_func(self.hue)
+            box_plot = StatsBoxPlot(stats_df, x_name, hue_name)
+            box_plot.plotting_func(x_label=x_label, y_label=y_label, title=title, style=style, font_scale=font_scale,
+                                   palette=palette, showmeans=showmeans, legend=legend, hue_order=hue_order,
+                                   order=categorical_order_func(self.x), output_path=output_path, formats=formats)
+            return
+
+        with figure_context_func(style, font_scale, palette, output_path, formats) as fig:
+            ax1 = fig.add_subplot()
+            sns.boxplot(x=self.x, y=self.y, data=self.df, hue=self.hue, whis=[5, 95], showmeans=showmeans,
+                        showfliers=showfliers,
+                        hue_order=hue_order, ax=ax1,
+                        meanprops={"marker": "o",
+                                   "markerfacecolor": "white",
+                                   "markeredgecolor": "black",
+                                   "markersize": "15"})
+            ax1.set_xlabel(x_label, labelpad=20)
+            ax1.set_ylabel(y_label, labelpad=20)
+            ax1.set_title(title)
+            if legend is True:
+                fig.subplots_adjust(right=0.84)
+                ax1.legend(bbox_to_anchor=(1.225, 1.029))
+            else:
+                ax1.get_legend().remove()
+
+
+class StatsBoxPlot():
+    """
+    takes precomputed box plot statistics (one row per box, see box_stats_func) and makes a box plot object that is
+    drawn with matplotlib's bxp, so drawing does not depend on the number of data rows
+
+    Parameters
+    ----------
+    stats_df : object
+        pandas data frame object with 'p5', 'p25', 'p50', 'p75', 'p95', 'whislo', 'whishi' and 'mean' columns
+    x_column : str
+        name of the column with the x values (EX: 'year')
+    hue_column : str
+        name of the column used to bin the boxes (EX: 'site')
+    """
+    def __init__(self, stats_df, x_column, hue_column):
+        self.stats_df = stats_df
+        self.x = x_column
+        self.hue = hue_column
+
+    @profile_stage_func
+    def plotting_func(self, x_label='xlabel', y_label='ylabel', title='title', style='darkgrid', font_scale=4,
+                      palette=None, showmeans=True, showfliers=False, legend=True, hue_order=None, order=None,
+                      output_path=None, formats=None):
+        """
+        take self parameters from when class was instantiated and produces a boxplot that looks like the
+        GeneralBoxPlot one (whiskers at the 5th and 95th percentiles)
+
+        Parameters
+        ----------
+        x_label : str
+            string used as x label
+        y_label : str
+            string used as x label
+        title : str
+            string used as title
+        style : str
+            string specifying how the plot looks default = 'darkgrid' look up Seaborn styles for more options
+        font_scale : int or float
+            font size parameter default 4
+        palette : list of str
+            list of hex codes specifying color (normally use site colors)
+        showmeans : bool
+            True or False adds white circle showing means to box plot default = True
+        showfliers : bool
+            not used, outliers are not part of the statistics (kept so the call matches GeneralBoxPlot)
+        legend : bool
+            True or False adds or hides legend from the figure
+        hue_order : list of str
+            The order in which the hue column boxes are ordered
+        order : list
+            The order of the x values (default None, order of the stats_df rows, sorted if numeric)
+        output_path : str
+            file path (without extension) the figure is saved to, default None shows the figure with plt.show()
+        formats : list of str
+            file formats the figure is saved in (EX: ['png', 'svg', 'pdf']) default None saves a png
+
+        Returns
+        _______
+        None
+            makes a boxplot figure
+        """
+        with figure_context_func(style, font_scale, palette, output_path, formats) as fig:
+            x_order = order if order is not None else categorical_order_func(self.stats_df[self.x])
+            if hue_order is None:
+                hue_order = categorical_order_func(self.stats_df[self.hue])
+            # same ordering of the boxes as seaborn
+
+            colors = [sns.desaturate(color, 0.75) for color in sns.color_palette(n_colors=len(hue_order))]
+            line_color = mpl.colors.rgb2hex([min(min(color) for color in colors) * 0.6] * 3)
+            width = 0.8 / len(hue_order)
+            box_dict = {(row[self.x], row[self.hue]): row for row in self.stats_df.to_dict('records')}
+
+            ax1 = fig.add_subplot()
+            legend_handles = []
+            for hue_num, hue in enumerate(hue_order):
+                positions = []
+                box_stats = []
+                for x_num, x in enumerate(x_order):
+                    row = box_dict.get((x, hue))
+                    if row is None:
+                        continue
+                    positions.append(x_num + width * (hue_num - (len(hue_order) - 1) / 2))
+                    box_stats.append({'whislo': row['whislo'], 'q1': row['p25'], 'med': row['p50'], 'q3': row['p75'],
+                                      'whishi': row['whishi'], 'mean': row['mean'], 'fliers': []})
+                if len(box_stats) > 0:
+                    ax1.bxp(box_stats, positions=positions, widths=width * 0.98, patch_artist=True,
+                            showmeans=showmeans, showfliers=False, manage_ticks=False,
+                            boxprops={'facecolor': colors[hue_num], 'edgecolor': line_color},
+                            whiskerprops={'color': line_color}, capprops={'color': line_color},
+                            medianprops={'color': line_color},
+                            meanprops={"marker": "o",
+                                       "markerfacecolor": "white",
+                                       "markeredgecolor": "black",
+                                       "markersize": "15"})
+                legend_handles.append(mpl.patches.Patch(facecolor=colors[hue_num], edgecolor=line_color, label=hue))
+            ax1.set_xticks(range(len(x_order)))
+            ax1.set_xticklabels(x_order)
+            ax1.set_xlim(-0.5, len(x_order) - 0.5)
+            ax1.xaxis.grid(False)
+            ax1.set_xlabel(x_label, labelpad=20)
+            ax1.set_ylabel(y_label, labelpad=20)
+            ax1.set_title(title)
+            if legend is True:
+                fig.subplots_adjust(right=0.84)
+                ax1.legend(handles=legend_handles, title=self.hue, bbox_to_anchor=(1.225, 1.029))
+
+
+class TimeVariationPlot():
+    """
+    takes precomputed time variation profiles (see time_variation_stats_func) and makes an OpenAir style time
+    variation plot object: hour of every weekday on top, hour of day and month below.  Every hue (EX: site) gets a
+    solid mean line, a dashed median line and a shaded quantile band
+
+    Parameters
+    ----------
+    stats_df : object
+        pandas data frame object with 'profile', 'species', 'hour', 'weekday', 'month', 'mean', 'p50' and quantile
+        columns
+    value_column : str
+        species plotted (EX: 'ethane')
+    hue_column : str
+        name of the column the lines are split by (EX: 'site')
+    """
+    def __init__(self, stats_df, value_column, hue_column):
+        self.stats_df = stats_df
+        self.value = value_column
+        self.hue = hue_column
+
+    @profile_stage_func
+    def plotting_func(self, y_label='ylabel', title='title', style='darkgrid', font_scale=2, palette=None,
+                      legend=True, hue_order=None, band=('p25', 'p75'), output_path=None, formats=None):
+        """
+        take self parameters from when class was instantiated and produces the time variation figure
+
+        Parameters
+        ----------
+        y_label : str
+            string used as y label
+        title : str
+            string used as title
+        style : str
+            string specifying how the plot looks default = 'darkgrid' look up Seaborn styles for more options
+        font_scale : int or float
+            font size parameter default 2
+        palette : list of str
+            list of hex codes specifying color (normally use site colors)
+        legend : bool
+            True or False adds or hides legend from the figure
+        hue_order : list of str
+            The order in which the hue column lines are drawn and listed in the legend
+        band : tuple of str
+            lower and upper quantile columns of the shaded band (default ('p25', 'p75'))
+        output_path : str
+            file path (without extension) the figure is saved to, default None shows the figure with plt.show()
+        formats : list of str
+            file formats the figure is saved in (EX: ['png', 'svg', 'pdf']) default None saves a png
+
+        Returns
+        _______
+        None
+            makes a time variation figure
+        """
+        stats_df = self.stats_df.loc[self.stats_df['species'] == self.value]
+        if hue_order is None:
+            hue_order = categorical_order_func(stats_df[self.hue])
+        with figure_context_func(style, font_scale, palette, output_path, formats) as fig:
+            grid = fig.add_gridspec(2, 2)
+            ax_week = fig.add_subplot(grid[0, :])
+            ax_hour = fig.add_subplot(grid[1, 0], sharey=ax_week)
+            ax_month = fig.add_subplot(grid[1, 1], sharey=ax_week)
+            colors = sns.color_palette(n_colors=len(hue_order))
+
+            profile_axes = [('weekday hour', ax_week, lambda df: df['weekday'] * 24 + df['hour']),
+                            ('hour', ax_hour, lambda df: df['hour']),
+                            ('month', ax_month, lambda df: df['month'])]
+            # profile, axis and x position of each point
+            for hue_num, hue in enumerate(hue_order):
+                hue_stats = stats_df.loc[stats_df[self.hue] == hue]
+                for profile, ax, x_func in profile_axes:
+                    profile_stats = hue_stats.loc[hue_stats['profile'] == profile]
+                    if len(profile_stats) == 0:
+                        continue
+                    x = x_func(profile_stats).to_numpy()
+                    ax.fill_between(x, profile_stats[band[0]], profile_stats[band[1]], color=colors[hue_num],
+                                    alpha=0.2, linewidth=0)
+                    ax.plot(x, profile_stats['mean'], color=colors[hue_num], label=hue)
+                    ax.plot(x, profile_stats['p50'], color=colors[hue_num], linestyle='--')
+
+            ax_week.set_xticks([day * 24 + 12 for day in range(7)])
+            ax_week.set_xticklabels(WEEKDAY_NAME_LIST)
+            for day in range(1, 7):
+                ax_week.axvline(day * 24 - 0.5, color='grey', linewidth=1)
+            ax_week.set_xlim(-0.5, 7 * 24 - 0.5)
+            ax_week.xaxis.grid(False)
+            ax_hour.set_xticks(range(0, 24, 3))
+            ax_hour.set_xlim(0, 23)
+            ax_hour.set_xlabel('Hour')
+            ax_month.set_xticks(range(1, 13))
+            ax_month.set_xticklabels([month[0] for month in MONTH_NAME_LIST])
+            ax_month.set_xlim(1, 12)
+            ax_month.set_xlabel('Month')
+            ax_week.set_ylabel(y_label, labelpad=20)
+            ax_hour.set_ylabel(y_label, labelpad=20)
+            ax_week.set_title(title)
+
+            if legend is True:
+                legend_handles = [mpl.lines.Line2D([], [], color=colors[hue_num], label=hue)
+                                  for hue_num, hue in enumerate(hue_order)]
+                legend_handles += [mpl.lines.Line2D([], [], color='black', label='mean'),
+                                   mpl.lines.Line2D([], [], color='black', linestyle='--', label='median'),
+                                   mpl.patches.Patch(facecolor='black', alpha=0.2,
+                                                     label=band[0] + ' - ' + band[1])]
+                fig.subplots_adjust(right=0.84)
+                ax_week.legend(handles=legend_handles, bbox_to_anchor=(1.01, 1.0), loc='upper left')
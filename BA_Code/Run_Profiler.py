@@ -0,0 +1,308 @@
+import os
+import sys
+import json
+import time
+import contextlib
+import functools
+import tracemalloc
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+    # not available on Windows, psutil is used instead if it is installed
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROFILE_SETTINGS = {'enabled': False, 'tracemalloc': False, 'started_tracemalloc': False}
+# profiling is off unless profile_enable_func (or profile_run_func) turns it on, started_tracemalloc is True while
+# tracemalloc runs because the profiler started it
+
+PROFILE_RECORD_LIST = []
+# one dict per finished stage call
+
+PROFILE_STACK = []
+# open stages: [stage, traced memory peak of the stage so far]
+
+PROFILE_COLUMNS = ['stage', 'depth', 'start_s', 'seconds', 'rows_in', 'rows_out', 'rss_high_water_mb',
+                   'traced_peak_mb', 'failed']
+
+
+def profile_enable_func(enabled=True, traced_memory=False):
+    """
+    Turns profiling on or off
+
+    Parameters
+    ----------
+    enabled : bool
+        True turns profiling on, False turns it off (default True)
+    traced_memory : bool
+        True also records the peak Python memory of every stage with tracemalloc, which slows the run down (default
+        False, only the process peak RSS is recorded).  Tracing is only stopped again if it was started here.
+
+    Returns
+    -------
+    None
+    """
+    PROFILE_SETTINGS['enabled'] = enabled
+    PROFILE_SETTINGS['tracemalloc'] = enabled and traced_memory
+    if PROFILE_SETTINGS['tracemalloc'] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        PROFILE_SETTINGS['started_tracemalloc'] = True
+    elif not PROFILE_SETTINGS['tracemalloc'] and PROFILE_SETTINGS['started_tracemalloc']:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        PROFILE_SETTINGS['started_tracemalloc'] = False
+        # tracing started by the caller (EX: python -X tracemalloc) is left running
+    if enabled:
+        PROFILE_SETTINGS.setdefault('run_start', time.perf_counter())
+
+
+def profile_enabled_func():
+    """
+    Tells if profiling is on
+
+    Returns
+    -------
+    bool
+        True if profiling is on
+    """
+    return PROFILE_SETTINGS['enabled']
+
+
+def profile_reset_func():
+    """
+    Drops every recorded stage and restarts the run clock
+
+    Returns
+    -------
+    None
+    """
+    PROFILE_RECORD_LIST.clear()
+    PROFILE_SETTINGS['run_start'] = time.perf_counter()
+
+
+def profile_rows_func(data):
+    """
+    Counts the rows of a DF or a list of DF's
+
+    Parameters
+    ----------
+    data : object
+        DF, list of DF's or anything else
+
+    Returns
+    -------
+    int
+        number of rows, None if data is not a DF or a list of DF's
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    if isinstance(data, (list, tuple)) and len(data) > 0 and all(isinstance(df, pd.DataFrame) for df in data):
+        return sum(len(df) for df in data)
+    return None
+
+
+def rss_peak_mb_func():
+    """
+    Reads the peak resident memory (RSS) of the process so far (its high water mark, not the current RSS)
+
+    Returns
+    -------
+    float
+        peak RSS in MB, None if neither resource nor psutil is available
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+        # ru_maxrss is in bytes on macOS and in KB on Linux
+    if psutil is not None:
+        memory_info = psutil.Process().memory_info()
+        return round(getattr(memory_info, 'peak_wset', memory_info.rss) / 1024 ** 2, 1)
+    return None
+
+
+@contextlib.contextmanager
+def profile_block_func(stage, rows_in=None):
+    """
+    Records the wall time, rows and peak memory of a block of code as one stage (does nothing if profiling is off)
+
+    'rss_high_water_mb' is the peak RSS of the whole process up to the end of the stage (it never goes down, a stage
+    only used more memory than the earlier ones if it raised it), 'traced_peak_mb' is the stage's own peak.
+
+    EX: with profile_block_func('plotting', rows_in=len(data)) as record:
+            ...
+            record['rows_out'] = len(stats_df)
+
+    Parameters
+    ----------
+    stage : str
+        name of the stage
+    rows_in : int
+        number of rows going into the stage (default None)
+
+    Returns
+    -------
+    dict
+        stage record (yielded to the with block, set 'rows_out' on it)
+    """
+    record = {'stage': stage, 'rows_in': rows_in, 'rows_out': None}
+    if not PROFILE_SETTINGS['enabled']:
+        yield record
+        return
+    traced = PROFILE_SETTINGS['tracemalloc'] and tracemalloc.is_tracing()
+    if traced:
+        if len(PROFILE_STACK) > 0:
+            PROFILE_STACK[-1][1] = max(PROFILE_STACK[-1][1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        # the enclosing stage keeps its peak so far, this stage starts counting from the current memory
+    PROFILE_STACK.append([stage, 0])
+    record['depth'] = len(PROFILE_STACK) - 1
+    start = time.perf_counter()
+    record['start_s'] = round(start - PROFILE_SETTINGS.get('run_start', start), 6)
+    record['failed'] = True
+    try:
+        yield record
+        record['failed'] = False
+    finally:
+        record['seconds'] = round(time.perf_counter() - start, 6)
+        traced_peak = PROFILE_STACK.pop()[1]
+        if traced:
+            traced_peak = max(traced_peak, tracemalloc.get_traced_memory()[1])
+            if len(PROFILE_STACK) > 0:
+                PROFILE_STACK[-1][1] = max(PROFILE_STACK[-1][1], traced_peak)
+            record['traced_peak_mb'] = round(traced_peak / 1024 ** 2, 1)
+        else:
+            record['traced_peak_mb'] = None
+        record['rss_high_water_mb'] = rss_peak_mb_func()
+        PROFILE_RECORD_LIST.append(record)
+
+
+def profile_stage_func(func):
+    """
+    Decorator that records every call of a function as a stage (see profile_block_func) named after the function
+
+    Rows in are the rows of the first DF (or list of DF's) argument and rows out the rows of the returned DF (or list
+    of DF's).  With profiling off the function is called directly.
+
+    Parameters
+    ----------
+    func : function
+        function to profile
+
+    Returns
+    -------
+    function
+        profiled function
+    """
+    stage = func.__qualname__
+
+    @functools.wraps(func)
+    def profiled_func(*args, **kwargs):
+        if not PROFILE_SETTINGS['enabled']:
+            return func(*args, **kwargs)
+        rows_in = None
+        for arg in list(args) + list(kwargs.values()):
+            rows_in = profile_rows_func(arg)
+            if rows_in is not None:
+                break
+        with profile_block_func(stage, rows_in) as record:
+            result = func(*args, **kwargs)
+            record['rows_out'] = profile_rows_func(result)
+        return result
+    return profiled_func
+
+
+def profile_summary_func(profile_df):
+    """
+    Summarizes a run profile per stage (in order of first call, indented by nesting depth)
+
+    Parameters
+    ----------
+    profile_df : object
+        DF of stage records (see profile_report_func)
+
+    Returns
+    -------
+    str
+        human readable summary table
+    """
+    if len(profile_df) == 0:
+        return 'no profiled stages'
+    grouped = profile_df.groupby('stage', sort=False)
+    summary = pd.DataFrame({'depth': grouped['depth'].min(), 'first_s': grouped['start_s'].min(),
+                            'calls': grouped.size(), 'seconds': grouped['seconds'].sum(),
+                            'rows_in': grouped['rows_in'].sum(min_count=1),
+                            'rows_out': grouped['rows_out'].sum(min_count=1),
+                            'rss_high_water_mb': grouped['rss_high_water_mb'].max(),
+                            'traced_peak_mb': grouped['traced_peak_mb'].max(),
+                            'failed': grouped['failed'].sum()}).sort_values('first_s')
+    summary.index = ['  ' * int(depth) + stage for stage, depth in zip(summary.index, summary['depth'])]
+    summary = summary.drop(columns=['depth', 'first_s'])
+    if summary['traced_peak_mb'].isna().all():
+        summary = summary.drop(columns=['traced_peak_mb'])
+    return summary.to_string(float_format=lambda value: format(value, '.3f'))
+
+
+def profile_report_func(output_path=None, print_summary=True):
+    """
+    Builds the run profile of every recorded stage, prints a summary and writes it to a JSON or CSV file
+
+    Parameters
+    ----------
+    output_path : str
+        file path of the profile, '.json' writes a JSON file with the run information and stage records, anything
+        else a CSV with one row per stage call (default None, nothing is written)
+    print_summary : bool
+        True prints the per stage summary (default True)
+
+    Returns
+    -------
+    object
+        DF with one row per stage call ('stage', 'depth', 'start_s', 'seconds', 'rows_in', 'rows_out',
+        'rss_high_water_mb', 'traced_peak_mb' and 'failed' columns, see profile_block_func)
+    """
+    profile_df = pd.DataFrame(PROFILE_RECORD_LIST, columns=PROFILE_COLUMNS)
+    profile_df = profile_df.sort_values('start_s', kind='stable').reset_index(drop=True)
+    if print_summary:
+        print(profile_summary_func(profile_df))
+    if output_path is not None:
+        if os.path.dirname(output_path) != '':
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if output_path.lower().endswith('.json'):
+            run = {'argv': sys.argv, 'pid': os.getpid(), 'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'rss_high_water_mb': rss_peak_mb_func(),
+                   'stages': json.loads(profile_df.to_json(orient='records'))}
+            with open(output_path, 'w', encoding='utf-8') as profile_file:
+                json.dump(run, profile_file, indent=1)
+        else:
+            profile_df.to_csv(output_path, index=False, encoding='utf-8')
+    return profile_df
+
+
+@contextlib.contextmanager
+def profile_run_func(output_path=None, traced_memory=False):
+    """
+    Profiles everything run inside the with block and reports it when the block ends (see profile_report_func)
+
+    Parameters
+    ----------
+    output_path : str
+        file path of the JSON or CSV profile (default None, only the summary is printed)
+    traced_memory : bool
+        True also records the peak Python memory of every stage with tracemalloc (default False)
+
+    Returns
+    -------
+    None
+    """
+    profile_enable_func(True, traced_memory)
+    profile_reset_func()
+    try:
+        yield
+    finally:
+        profile_enable_func(False)
+        profile_report_func(output_path)
@@ -0,0 +1,241 @@
+import sys
+from Common_Functions import *
+
+SYNTHETIC_INSTRUMENT_DICT = {'met': (60, MET_LIST + ['h2s', 'so2']), 'voc': (600, VOC_LIST),
+                             'ch4': (60, ['ch4', 'co2', 'co']), 'pm': (60, ['pm2_5', 'pm10']),
+                             'nox': (60, ['no', 'nox']), 'radon': (600, ['radon'])}
+# instrument directory: (seconds between samples, data columns), the met wind columns depend on the site (see
+# SYNTHETIC_AVG_WIND_SITE_LIST)
+
+SYNTHETIC_LEVEL_DICT = {'ch4': 1950, 'co2': 420, 'co': 120, 'pm2_5': 6, 'pm10': 15, 'no': 3, 'nox': 10, 'h2s': 0.3,
+                        'so2': 0.5, 'radon': 8}
+# typical level of the species (VOCs without a level here use 1 ppb)
+
+SYNTHETIC_AVG_WIND_SITE_LIST = ['LMA', 'LLG', 'BRZ']
+# sites whose met files have 'wsp_avg_ms' and 'wdr_avg' columns, the others have 'wsp' and 'wdr' (like the real data,
+# see wind_column_correction_func)
+
+
+def synthetic_time_func(start, end, interval, rng, gap_fraction=0.01):
+    """
+    Makes the sample times of one quarter: a regular cadence with a few seconds of jitter, randomly dropped samples
+    and instrument outages
+
+    Parameters
+    ----------
+    start : object
+        pandas Timestamp of the start of the quarter (UTC)
+    end : object
+        pandas Timestamp of the end of the quarter (UTC)
+    interval : int
+        seconds between samples (EX: 60 for met, 600 for VOC)
+    rng : object
+        numpy random Generator
+    gap_fraction : float
+        fraction of the samples that are missing, half as single dropped samples and half as outages of a few hours
+
+    Returns
+    -------
+    array of int
+        epoch seconds of every sample
+    """
+    times = np.arange(int(start.timestamp()), int(end.timestamp()), interval)
+    times = times + rng.integers(-min(interval // 6, 10), min(interval // 6, 10) + 1, size=len(times))
+    keep = rng.random(len(times)) >= gap_fraction / 2
+    outage_count = max(1, int(round(len(times) * gap_fraction / 2 / (4 * 3600 // interval))))
+    for outage_start in rng.integers(0, len(times), size=outage_count):
+        keep[outage_start: outage_start + int(rng.integers(3600, 8 * 3600)) // interval] = False
+    # single missing samples and outages of 1 to 8 hours
+    return times[keep]
+
+
+def synthetic_met_func(times, rng, avg_wind=False):
+    """
+    Makes met data for the sample times: wind direction as a random walk, wind speed, temperature and solar radiation
+    with a daily cycle
+
+    Parameters
+    ----------
+    times : array of int
+        epoch seconds of every sample
+    rng : object
+        numpy random Generator
+    avg_wind : bool
+        True writes the wind as 'wsp_avg_ms' and 'wdr_avg', False as 'wsp' and 'wdr' (default False)
+
+    Returns
+    -------
+    object
+        DF with the met columns (without 'time')
+    """
+    hour = (times % 86400) / 3600 - 7
+    # hour of the day in Mountain Standard Time
+    daylight = np.clip(np.sin((hour - 6) * np.pi / 12), 0, None)
+    day_of_year = (times % 31557600) / 86400
+    temp = 50 - 20 * np.cos(2 * np.pi * (day_of_year - 15) / 365.25) + 12 * daylight + rng.normal(0, 2, len(times))
+    wdr = np.mod(np.cumsum(rng.normal(0, 8, len(times))) + 270 - 180 * daylight, 360)
+    wsp = rng.gamma(2, 1 + 1.5 * daylight)
+    relh = np.clip(70 - 30 * daylight + rng.normal(0, 5, len(times)), 5, 100)
+    data = pd.DataFrame({'solr': np.round(900 * daylight * rng.uniform(0.6, 1, len(times)), 1),
+                         'temp_f': np.round(temp, 2), 'relh': np.round(relh, 1),
+                         'ptemp_f': np.round(temp + 1.5, 2),
+                         'tempinstr_f': np.round(70 + rng.normal(0, 1, len(times)), 2)})
+    if avg_wind:
+        data['wsp_avg_ms'] = np.round(wsp * 0.44704, 2)
+        data['wdr_avg'] = np.round(wdr, 1)
+    else:
+        data['wsp'] = np.round(wsp, 2)
+        data['wdr'] = np.round(wdr, 1)
+    return data
+
+
+def synthetic_species_func(times, columns, rng, wdr=None):
+    """
+    Makes species data for the sample times: log normal values around the species level with a night time maximum
+    (shallow boundary layer) and, if wind directions are given, higher values from the east
+
+    Parameters
+    ----------
+    times : array of int
+        epoch seconds of every sample
+    columns : list of str
+        species columns (EX: VOC_LIST)
+    rng : object
+        numpy random Generator
+    wdr : array of float
+        wind direction of every sample (default None, no wind dependence)
+
+    Returns
+    -------
+    object
+        DF with one column per species (without 'time')
+    """
+    hour = (times % 86400) / 3600 - 7
+    boundary_layer = 1 + 0.4 * np.cos((hour - 3) * np.pi / 12)
+    source = 1 if wdr is None else 1 + 0.8 * np.clip(np.cos((wdr - 90) * np.pi / 180), 0, None)
+    # oil and gas sources east of the sites
+    data = {}
+    for col in columns:
+        level = SYNTHETIC_LEVEL_DICT.get(col, 1)
+        if col in ['ch4', 'co2']:
+            values = level * (1 + 0.01 * (boundary_layer * source - 1)) + rng.normal(0, level * 0.002, len(times))
+        else:
+            values = level * boundary_layer * source * rng.lognormal(0, 0.6, len(times))
+            values[rng.random(len(times)) < 0.002] = -0.01
+            # a few below detection limit values for zero_filter
+        values[rng.random(len(times)) < 0.002] = np.nan
+        data[col] = np.round(values, 3)
+    return pd.DataFrame(data)
+
+
+def synthetic_quarter_func(site, instrument, year, quarter, rng, gap_fraction=0.01):
+    """
+    Makes the data of one CSV_out file (one site, instrument directory and quarter)
+
+    Parameters
+    ----------
+    site : str
+        site code (EX: 'BSE')
+    instrument : str
+        instrument directory (key of SYNTHETIC_INSTRUMENT_DICT, EX: 'voc')
+    year : int
+        year (EX: 2022)
+    quarter : int
+        quarter number (1 to 4)
+    rng : object
+        numpy random Generator
+    gap_fraction : float
+        fraction of missing samples (default 0.01)
+
+    Returns
+    -------
+    object
+        DF with an epoch seconds 'time' column and the instrument's columns
+    """
+    start = pd.Timestamp(year=year, month=3 * quarter - 2, day=1)
+    end = start + pd.DateOffset(months=3)
+    interval, columns = SYNTHETIC_INSTRUMENT_DICT[instrument]
+    if instrument == 'voc' or instrument == 'radon':
+        start = start + pd.Timedelta(seconds=interval // 2)
+        # VOC and radon samples are stamped in the middle of their sampling interval
+    times = synthetic_time_func(start, end, interval, rng, gap_fraction)
+    if instrument == 'met':
+        data = synthetic_met_func(times, rng, site in SYNTHETIC_AVG_WIND_SITE_LIST)
+        wdr = data['wdr_avg' if site in SYNTHETIC_AVG_WIND_SITE_LIST else 'wdr'].to_numpy()
+        data = pd.concat([data, synthetic_species_func(times, ['h2s', 'so2'], rng, wdr)], axis=1)
+        if site in NOX_MET_SITE_LIST:
+            data = pd.concat([data, synthetic_species_func(times, SYNTHETIC_INSTRUMENT_DICT['nox'][1], rng, wdr)],
+                             axis=1)
+            # these sites store their nox data in the met files
+    else:
+        wdr = np.mod(np.cumsum(rng.normal(0, 8 * np.sqrt(interval / 60), len(times))) + 270, 360)
+        data = synthetic_species_func(times, columns, rng, wdr)
+    data.insert(0, 'time', times)
+    return data
+
+
+def synthetic_idat_func(file_path, sites=None, years=(2022,), instruments=None, seed=0, gap_fraction=0.01):
+    """
+    Writes a synthetic IDAT directory tree (file_path/site/instrument/site_instrument_year_qN.csv) of quarterly
+    CSV_out files that the import functions read like the real data: a first title row, a header row, an epoch seconds
+    'time' column, 1 minute met, methane, pm and nox data and 10 minute VOC and radon data
+
+    Parameters
+    ----------
+    file_path : str
+        base directory of the synthetic IDAT tree (EX: 'E:/IDAT_synthetic')
+    sites : list of str
+        site codes (default None, every site in LAT_LON_DICT)
+    years : list of int
+        years of data (default (2022,))
+    instruments : list of str
+        instrument directories (default None, every key of SYNTHETIC_INSTRUMENT_DICT)
+    seed : int
+        random seed, the same seed writes the same files (default 0)
+    gap_fraction : float
+        fraction of missing samples (default 0.01)
+
+    Returns
+    -------
+    list of str
+        file paths written
+    """
+    sites = list(LAT_LON_DICT) if sites is None else sites
+    instruments = list(SYNTHETIC_INSTRUMENT_DICT) if instruments is None else instruments
+    rng = np.random.default_rng(seed)
+    file_paths = []
+    for site in sites:
+        for instrument in instruments:
+            if instrument == 'nox' and site in NOX_MET_SITE_LIST:
+                continue
+                # written with the met data
+            for year in years:
+                for quarter in range(1, 5):
+                    data = synthetic_quarter_func(site, instrument, year, quarter, rng, gap_fraction)
+                    path = os.path.join(file_path, site, instrument,
+                                        site + '_' + instrument + '_' + str(year) + '_q' + str(quarter) + '.csv')
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+                        csv_file.write(site + ' ' + instrument + ' CSV_out synthetic data\n')
+                        data.to_csv(csv_file, index=False)
+                    file_paths.append(path)
+    return file_paths
+
+
+def main():
+    """
+    main function for running Synthetic_IDAT script.  Writes a synthetic IDAT tree for testing and benchmarking
+    without the real data drive
+
+    Pass the output directory as the first command line argument (EX: python Synthetic_IDAT.py E:/IDAT_synthetic) or
+    fill in file_path below along with the sites and years.
+    """
+    file_path = r'E:/IDAT_synthetic'
+    if len(sys.argv) > 1:
+        file_path = sys.argv[1]
+    file_paths = synthetic_idat_func(file_path, sites=['BSE', 'LUR', 'CCF'], years=[2021, 2022])
+    print(str(len(file_paths)) + ' files written to ' + file_path)
+
+
+if __name__ == "__main__":
+    main()
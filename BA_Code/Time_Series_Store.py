@@ -0,0 +1,313 @@
+import os
+import sys
+import json
+import glob
+import numpy as np
+import pandas as pd
+
+STORE_META_FILE = 'store.json'
+# description of a store directory (columns, rows, version and source files)
+
+STORE_OPEN_ATTEMPTS = 3
+# times store_open_func reads the description again when the arrays it names were removed by a newer write
+
+OPEN_STORE_DICT = {}
+# store directory: (version, memory mapped arrays) of the stores opened by this process
+
+
+def store_path_func(store_dir, site, instrument):
+    """
+    Constructs the directory of the store of one site and instrument directory
+
+    Parameters
+    ----------
+    store_dir : str
+        base directory of the time series stores (EX: 'E:/BA_store')
+    site : str
+        site code (EX: 'BSE')
+    instrument : str
+        instrument directory (EX: 'voc', output of species_path_func)
+
+    Returns
+    -------
+    str
+        store directory (EX: 'E:/BA_store/BSE/voc')
+    """
+    return os.path.join(store_dir, site, instrument)
+
+
+def store_meta_func(path):
+    """
+    Reads the description of a store
+
+    Parameters
+    ----------
+    path : str
+        store directory (see store_path_func)
+
+    Returns
+    -------
+    dict
+        'columns', 'rows', 'version', 'first', 'last' and 'files' ({source path: [size, mtime_ns, first minute, last
+        minute]}) keys, None if there is no store
+    """
+    try:
+        with open(os.path.join(path, STORE_META_FILE), 'r', encoding='utf-8') as meta_file:
+            return json.load(meta_file)
+    except (OSError, ValueError):
+        return None
+
+
+def store_minute_func(time_string, ceil=True):
+    """
+    Converts a time string to minutes since the epoch (the store's time unit)
+
+    Parameters
+    ----------
+    time_string : str
+        time as a string in datetime format (EX '2020-01-22 00:00:00')
+    ceil : bool
+        True (default) rounds a time with seconds up to the next minute, so rows at or after the time (start) or before
+        the time (end) are the ones from that minute index on or before it
+
+    Returns
+    -------
+    int
+        minutes since the epoch
+    """
+    seconds = pd.Timestamp(time_string).value // 10 ** 9
+    return -(-seconds // 60) if ceil else seconds // 60
+
+
+def store_write_func(path, data, files):
+    """
+    Writes a DF to a store: a sorted int64 array of minutes since the epoch and one float64 array per column (.npy
+    files that are opened memory mapped)
+
+    The arrays of every write get a new version number and the description (store.json) is replaced last, so readers
+    never see a half written store.  The arrays of the previous version are kept for readers that read the old
+    description just before it was replaced, older versions are removed (files still open in another process are left
+    for the next write).
+
+    Parameters
+    ----------
+    path : str
+        store directory (see store_path_func)
+    data : object
+        time sorted DF with unique whole minute 'time' values (EX: output of csv_import_func), columns that are not
+        numeric are left out
+    files : dict
+        source files of the data {path: [size, mtime_ns, first minute, last minute]}, the size and modification time
+        tell if the store is up to date and the minutes since the epoch of the file's first and last row (None for an
+        empty file) which rows came from it
+
+    Returns
+    -------
+    dict
+        the new store description
+    """
+    os.makedirs(path, exist_ok=True)
+    meta = store_meta_func(path)
+    version = 0 if meta is None else meta['version'] + 1
+    data = data.loc[data['time'].notna()]
+    columns = [col for col in data.columns if col != 'time' and pd.api.types.is_numeric_dtype(data[col])]
+
+    times = data['time'].to_numpy().astype('datetime64[m]').astype(np.int64)
+    arrays = {'time': times}
+    arrays.update({'c' + str(col_num): data[col].to_numpy(dtype=np.float64)
+                   for col_num, col in enumerate(columns)})
+    for name, values in arrays.items():
+        np.save(os.path.join(path, name + '.' + str(version) + '.npy'), values)
+    # one file per array so a query only pages in the columns it reads
+
+    meta = {'columns': columns, 'rows': len(times), 'version': version,
+            'first': str(pd.Timestamp(int(times[0]) * 60, unit='s')) if len(times) > 0 else None,
+            'last': str(pd.Timestamp(int(times[-1]) * 60, unit='s')) if len(times) > 0 else None,
+            'files': files}
+    tmp_path = os.path.join(path, STORE_META_FILE + '.' + str(os.getpid()) + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as meta_file:
+        json.dump(meta, meta_file, indent=1)
+    os.replace(tmp_path, os.path.join(path, STORE_META_FILE))
+
+    for old_path in glob.glob(os.path.join(path, '*.npy')):
+        if int(old_path.rsplit('.', 2)[1]) < version - 1:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+                # still memory mapped by a reader (Windows)
+    return meta
+
+
+def store_open_func(path, mmap_mode='r'):
+    """
+    Opens a store memory mapped.  The arrays are shared through the OS page cache by every process that opens the same
+    store and a read only store is reused until it is rewritten.  If the store is rewritten twice while it is being
+    opened (its arrays are removed) the new description is read and the store is opened again.
+
+    Parameters
+    ----------
+    path : str
+        store directory (see store_path_func)
+    mmap_mode : str
+        'r' (default) read only arrays, 'c' copy on write arrays (writes stay in this mapping and never reach the
+        files) that are mapped again on every call
+
+    Returns
+    -------
+    dict, dict
+        store description (see store_meta_func) and 'time' (int64 minutes since the epoch) and column name: float64
+        arrays, None, None if there is no store
+    """
+    for attempt in range(STORE_OPEN_ATTEMPTS):
+        meta = store_meta_func(path)
+        if meta is None:
+            return None, None
+        opened = OPEN_STORE_DICT.get(path)
+        if mmap_mode == 'r' and opened is not None and opened[0]['version'] == meta['version']:
+            return opened
+        version = '.' + str(meta['version']) + '.npy'
+        try:
+            store = {'time': np.load(os.path.join(path, 'time' + version), mmap_mode=mmap_mode)}
+            for col_num, col in enumerate(meta['columns']):
+                store[col] = np.load(os.path.join(path, 'c' + str(col_num) + version), mmap_mode=mmap_mode)
+            break
+        except FileNotFoundError:
+            if attempt == STORE_OPEN_ATTEMPTS - 1:
+                raise
+            # the version was removed by a newer write, reading the description again
+    if mmap_mode == 'r':
+        OPEN_STORE_DICT[path] = (meta, store)
+    return meta, store
+
+
+def store_range_func(store, start_time=None, end_time=None):
+    """
+    Finds the rows of a store from start_time up to (not including) end_time with two binary searches
+
+    Parameters
+    ----------
+    store : dict
+        opened store (see store_open_func)
+    start_time : str
+        start time as a string in datetime format (default None, first row)
+    end_time : str
+        end time as a string in datetime format (default None, last row)
+
+    Returns
+    -------
+    int, int
+        first row and one past the last row
+    """
+    times = store['time']
+    first_row = 0 if start_time is None else int(np.searchsorted(times, store_minute_func(start_time), 'left'))
+    last_row = len(times) if end_time is None else int(np.searchsorted(times, store_minute_func(end_time), 'left'))
+    return first_row, max(first_row, last_row)
+
+
+def store_view_func(store, columns=None, start_time=None, end_time=None):
+    """
+    Gets zero copy views of the store arrays from start_time up to (not including) end_time
+
+    Parameters
+    ----------
+    store : dict
+        opened store (see store_open_func)
+    columns : list of str
+        columns to get, 'time' is always included and columns missing from the store are ignored (default None, every
+        column)
+    start_time : str
+        start time as a string in datetime format (default None)
+    end_time : str
+        end time as a string in datetime format (default None)
+
+    Returns
+    -------
+    dict
+        'time' (int64 minutes since the epoch) and column name: memory mapped array slices
+    """
+    first_row, last_row = store_range_func(store, start_time, end_time)
+    names = ['time'] + [col for col in store if col != 'time' and (columns is None or col in columns)]
+    return {name: store[name][first_row: last_row] for name in names}
+
+
+def store_frame_func(path, columns=None, start_time=None, end_time=None, files=None, mmap_mode='r'):
+    """
+    Reads the rows of a store from start_time up to (not including) end_time as a DF like the ones csv_read_func makes
+    (datetime 'time' column on whole minutes)
+
+    The value columns of a single row range are the memory mapped slices themselves (no copy), so with the default
+    mmap_mode the DF is read only.  Rows of several files that are not next to each other are copied into one DF.
+
+    Parameters
+    ----------
+    path : str
+        store directory (see store_path_func)
+    columns : list of str
+        columns to read, 'time' is always read and columns missing from the store are ignored (default None, every
+        column)
+    start_time : str
+        start time as a string in datetime format (default None)
+    end_time : str
+        end time as a string in datetime format (default None)
+    files : list of str
+        source files whose time ranges are read (keys of the store description's 'files', default None, every row)
+    mmap_mode : str
+        'r' (default) or 'c' for a DF that can be written to (see store_open_func)
+
+    Returns
+    -------
+    object
+        DF sorted by time, None if there is no store
+    """
+    meta, store = store_open_func(path, mmap_mode)
+    if meta is None:
+        return None
+    first_row, last_row = store_range_func(store, start_time, end_time)
+    if files is None:
+        row_ranges = [(first_row, last_row)]
+    else:
+        minute_ranges = sorted(meta['files'][file][2:] for file in files if meta['files'][file][2] is not None)
+        row_ranges = []
+        for first_minute, last_minute in minute_ranges:
+            range_first = max(first_row, int(np.searchsorted(store['time'], first_minute, 'left')))
+            range_last = min(last_row, int(np.searchsorted(store['time'], last_minute, 'right')))
+            if len(row_ranges) > 0 and range_first <= row_ranges[-1][1]:
+                row_ranges[-1] = (row_ranges[-1][0], max(row_ranges[-1][1], range_last))
+            elif range_first < range_last:
+                row_ranges.append((range_first, range_last))
+        # rows from the first to the last time of every file, files next to each other are one range
+        row_ranges = row_ranges or [(0, 0)]
+
+    names = ['time'] + [col for col in store if col != 'time' and (columns is None or col in columns)]
+    if len(row_ranges) == 1:
+        data = {name: store[name][row_ranges[0][0]: row_ranges[0][1]] for name in names}
+    else:
+        data = {name: np.concatenate([store[name][first: last] for first, last in row_ranges]) for name in names}
+    data['time'] = (data['time'] * 60).astype('datetime64[s]')
+    return pd.DataFrame(data, copy=False)
+
+
+def main():
+    """
+    main function for running Time_Series_Store script.  Converts the quarterly CSV_out files of an IDAT tree into one
+    memory mapped store per site and instrument directory (only stores whose CSV files changed are rebuilt)
+
+    Pass the IDAT directory and the store directory as command line arguments (EX: python Time_Series_Store.py E:/IDAT
+    E:/BA_store BSE CCF) or fill them in below.  Any further arguments are the sites to convert (default every site).
+    Then set store_dir in BoxPlotConstants or WindReadyConstants to read from the stores.
+    """
+    from Common_Functions import store_build_all_func
+    # the conversion parses the CSV files with the import functions (Common_Functions imports this module)
+    file_path = r'E:/IDAT'
+    store_dir = r'E:/BA_store'
+    sites = None
+    if len(sys.argv) > 2:
+        file_path = sys.argv[1]
+        store_dir = sys.argv[2]
+        sites = sys.argv[3:] if len(sys.argv) > 3 else None
+    store_build_all_func(file_path, store_dir, sites, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
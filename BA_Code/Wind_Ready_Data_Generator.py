@@ -1,6 +1,8 @@
+import copy
 from Common_Functions import *
 from Plotting_Objects import *
 from Common_Constants import *
+from Run_Profiler import profile_enabled_func, profile_run_func, profile_stage_func
 
 
 class WindReadyConstants:
@@ -13,8 +15,9 @@ class WindReadyConstants:
         Your base file path to Boulder AIR CSV data (EX: 'E:\IDAT')
     sites : list of str
         List of site(s) codes as strings (EX: ['LUR', 'BSE'])
-    species : str
-        String of species as it appears in the data column (EX: 'ethane')
+    species : str or list of str
+        String of species as it appears in the data column (EX: 'ethane') or a list of species (EX: ['ethane',
+        'propane', 'ch4']) to make one file per species from a single load of the met data
     start_time : str
         Start time as a string in datetime format (EX '2020-01-22 00:00:00')
     end_time : str
@@ -27,10 +30,36 @@ class WindReadyConstants:
         (True or False) used to specify weather or not to replace all negative and zero values in df with NAN's
     export_dir: str
         File path to out directory
+    cache_dir: str
+        Directory used to cache parsed CSV files between runs (default None, no caching)
+    workers: int
+        Number of worker processes used to parse CSV files in parallel (default None, serial import)
+    catalog_path: str
+        File path of the IDAT catalog json file used to look up file paths (default None, glob the site directories)
+    stream: bool
+        (True or False) process the data one quarter at a time and append to the output files so memory use stays
+        proportional to one quarter of data (default False) see wind_ready_stream_func
+    incremental: bool
+        (True or False) only pair the quarters that are new or changed since the last run and update the existing
+        output files (default False) see wind_ready_incremental_func
+    compact: bool
+        (True or False) write numeric lat and lon columns instead of a string per row (default False), the paired
+        values stay float64 so the files keep their precision
+    profile_path: str
+        File path the run profile (wall time, rows in and out and peak memory of every stage) is written to, '.json'
+        for a JSON file or '.csv' for a CSV file (default None, no profiling) see Run_Profiler
+    store_dir: str
+        Base directory of the time series stores the data is read from instead of the CSV files (default None, parse
+        the CSV files) see store_build_func and Time_Series_Store
+    prune_columns: bool
+        (True or False) only import the species, VOC ratio and wind columns the pairing needs (default False), the
+        files then leave out the other columns of the species and met files (EX: the other VOCs, temp_f, relh and
+        solr) that the default files carry
     """
 
     def __init__(self, file_path, sites, species, start_time, end_time, wsp_filter, methane_match, zero_filter,
-                 export_dir):
+                 export_dir, cache_dir=None, workers=None, catalog_path=None, stream=False,
+                 incremental=False, compact=False, profile_path=None, store_dir=None, prune_columns=False):
         self.file_path = file_path
         self.sites = sites
         self.species = species
@@ -40,35 +69,63 @@ class WindReadyConstants:
         self.methane_match = methane_match
         self.zero_filter = zero_filter
         self.export_dir = export_dir
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.catalog_path = catalog_path
+        self.stream = stream
+        self.incremental = incremental
+        self.compact = compact
+        self.profile_path = profile_path
+        self.store_dir = store_dir
+        self.prune_columns = prune_columns
 
 
-def main():
+@profile_stage_func
+def wind_ready_load_func(data_parameters, start_time, end_time):
     """
-    main function for running Wind_Ready_Data_Generator script.  Script instanciates WindReadyConstants class.
+    Imports the met and species data (and methane data if methane_match is set) needed for the wind ready files
 
-    This script takes BA quarterly CSV_out files as inputs and produces CSV files ready to be used by R studios OpenAir
-    package to make heat plots and pollution rose figures.  It does this by reading in and combining met data with
-    BA species data.  It also has a built in filtering function that can be applied or not as needed.  Multiple site
-    outputs can be produced at the same time.
-    """
-    data_parameters = WindReadyConstants(file_path=r'E:/IDAT', sites=['CCF'],
-                                         species='radon', start_time='2022-08-31 00:00:00',
-                                         end_time='2022-09-11 00:0:00', wsp_filter=0, methane_match=False,
-                                         zero_filter=False, export_dir='E:\Ready for wind plot dir')
-    # ending dates of each quarter: q1: 03-31 23:59:00, q2: 06-30 23:59:00,
-    # q3: 09-30 23:59:00, q4: 12-31 23:59:00,
+    Files are selected for the start_time to end_time interval and the DF's are sliced to the data_parameters
+    start_time and end_time.  If methane_match is True and the species is a VOC the methane data is merged into the
+    met DF's.
 
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+    start_time : str
+        Start time of the files to import as a string in datetime format (EX '2020-01-22 00:00:00')
+    end_time : str
+        End time of the files to import as a string in datetime format (EX '2020-08-28 05:00:00')
+
+    Returns
+    -------
+    list of objects, list of objects
+        list of met df's and list of species df's (one per site) or None, None if there are no files to import
+    """
     wind_file_paths = wind_file_path_generator_func(data_parameters.file_path, data_parameters.sites,
-                                                    data_parameters.start_time, data_parameters.end_time)
+                                                    start_time, end_time, catalog_path=data_parameters.catalog_path)
     # getting file paths to nessisary met data
     data_file_paths = file_path_generator_func(data_parameters.file_path, data_parameters.sites,
-                                               data_parameters.species, data_parameters.start_time,
-                                               data_parameters.end_time)
+                                               data_parameters.species, start_time, end_time,
+                                               catalog_path=data_parameters.catalog_path)
     # getting file paths to nessisary species data
+    if len(wind_file_paths) == 0 or len(data_file_paths) == 0:
+        return None, None
 
-    wind_list = csv_import_func(wind_file_paths, data_parameters.sites)
+    wind_list = csv_import_func(wind_file_paths, data_parameters.sites, cache_dir=data_parameters.cache_dir,
+                                workers=data_parameters.workers,
+                                columns=wind_columns_func(data_parameters.species) if data_parameters.prune_columns
+                                else None,
+                                start_time=data_parameters.start_time, end_time=data_parameters.end_time,
+                                store_dir=data_parameters.store_dir)
     # importing met data as a list of df's one per site
-    data_list = csv_import_func(data_file_paths, data_parameters.sites)
+    data_list = csv_import_func(data_file_paths, data_parameters.sites, cache_dir=data_parameters.cache_dir,
+                                workers=data_parameters.workers,
+                                columns=species_columns_func(data_parameters.species, wind_ready=True)
+                                if data_parameters.prune_columns else None,
+                                start_time=data_parameters.start_time, end_time=data_parameters.end_time,
+                                store_dir=data_parameters.store_dir)
     # importing species data as a list of df's one per site
 
     data_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in data_list]
@@ -82,10 +139,15 @@ def main():
     if data_parameters.methane_match is True and data_parameters.species in VOC_LIST:
         # trigger this statment if you want to combine VOC and Methane data
         methane_file_paths = file_path_generator_func(data_parameters.file_path, data_parameters.sites, 'ch4',
-                                                      data_parameters.start_time, data_parameters.end_time)
+                                                      start_time, end_time,
+                                                      catalog_path=data_parameters.catalog_path)
         # getting file paths to nessisary methane data.
 
-        methane_list = csv_import_func(methane_file_paths, data_parameters.sites)
+        methane_list = csv_import_func(methane_file_paths, data_parameters.sites,
+                                       cache_dir=data_parameters.cache_dir, workers=data_parameters.workers,
+                                       columns=['time', 'ch4'] if data_parameters.prune_columns else None,
+                                       start_time=data_parameters.start_time,
+                                       end_time=data_parameters.end_time, store_dir=data_parameters.store_dir)
         methane_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in
                         methane_list]
         # read in methane data as list of dataframes (one per site)
@@ -93,12 +155,39 @@ def main():
         wind_list = met_methane_combine_func(data_parameters, wind_list, methane_list)
         # combin methane and met df's and place them back in list
 
-        combine_data = met_methane_voc_combine_func(data_parameters, wind_list, data_list)
+    return wind_list, data_list
+
+
+@profile_stage_func
+def wind_ready_combine_func(data_parameters, wind_list, data_list, close_last_window=False):
+    """
+    Pairs the met data with the species data using the pairing method for that species
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+    wind_list : list of objects
+        list of met df's (already combined with methane data if methane_match is set)
+    data_list : list of objects
+        list of species df's
+    close_last_window : bool
+        passed to voc_wind_pairing_func, True also pairs the last VOC sample (default False)
+
+    Returns
+    -------
+    list of objects
+        list of combine data frames with species and met data
+    """
+    if data_parameters.methane_match is True and data_parameters.species in VOC_LIST:
         # make combine VOC data with met and methane data and place into list of df's
+        combine_data = met_methane_voc_combine_func(data_parameters, wind_list, data_list,
+                                                    close_last_window=close_last_window)
 
     elif data_parameters.methane_match is False and data_parameters.species in VOC_LIST:
         # make combine VOC data with met but not methane data
-        combine_data = met_voc_combine_func(data_parameters, wind_list, data_list)
+        combine_data = met_voc_combine_func(data_parameters, wind_list, data_list,
+                                            close_last_window=close_last_window)
 
     elif data_parameters.species == 'radon':
         # make combine radon met data on radon's 10 minute interval
@@ -108,16 +197,477 @@ def main():
         # combine non-voc species with met data
         combine_data = met_non_voc_combine_func(data_parameters, wind_list, data_list)
 
-    if data_parameters.zero_filter is True:
-        # if True filiter zero and negative values by replacing them with NAN values
-        combine_data = zero_filter_func(combine_data)
-        # function that does the filtering
+    return combine_data
+
+
+def wind_ready_species_groups_func(species_list):
+    """
+    Groups species by the instrument files they are stored in (EX: ['ethane', 'ch4', 'propane'] ->
+    {'voc': ['ethane', 'propane'], 'ch4': ['ch4']})
+
+    Parameters
+    ----------
+    species_list : list of str
+        list of species as they appear in the data columns
+
+    Returns
+    -------
+    dict
+        {instrument directory name: list of species}, species that are not recognized are left out
+    """
+    species_groups = {}
+    for species in species_list:
+        path_species = species_path_func(species)
+        if path_species is not None:
+            species_groups.setdefault(path_species, []).append(species)
+    return species_groups
+
+
+def wind_ready_species_columns_func(species, methane_match=False):
+    """
+    Constructs the list of data columns that end up in a species' wind ready file (before pairing adds its columns)
+
+    Parameters
+    ----------
+    species : str
+        String of species as it appears in the data column (EX: 'ethane')
+    methane_match : bool
+        True if methane data is combined with the VOC data (default False)
+
+    Returns
+    -------
+    list of str
+        list of column names
+    """
+    columns = species_columns_func(species, wind_ready=True)
+    columns += [col for col in wind_columns_func(species) if col not in columns]
+    if methane_match is True and species in VOC_LIST:
+        columns.append('ch4')
+    return columns
+
+
+@profile_stage_func
+def wind_ready_species_func(data_parameters):
+    """
+    Makes the wind ready files for one or more species while importing and cleaning the met data only once per site
+
+    Species are grouped by instrument (see wind_ready_species_groups_func).  The met files are imported once with
+    the columns of every species, each instrument's files are imported once with the columns of all of its species
+    and each group is paired with the met data in one pass (all of VOC_LIST is paired by a single call to
+    voc_wind_pairing_func).  Each species' file is then cut from its group's paired data by dropping the columns that
+    only belong to the other species, so it matches the file made by running that species alone.
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files (species can be a str or a
+        list of str)
+
+    Returns
+    -------
+    None
+        exports the data to out directory specified in the data_parameters object
+    """
+    species_list = data_parameters.species
+    if isinstance(species_list, str):
+        species_list = [species_list]
+    species_groups = wind_ready_species_groups_func(species_list)
+    methane_match = data_parameters.methane_match is True and 'voc' in species_groups
+
+    wind_columns = []
+    for species in species_list:
+        wind_columns += [col for col in wind_columns_func(species) if col not in wind_columns]
+    if not data_parameters.prune_columns:
+        wind_columns = None
+        # every column like a single species run
+    wind_file_paths = wind_file_path_generator_func(data_parameters.file_path, data_parameters.sites,
+                                                    data_parameters.start_time, data_parameters.end_time,
+                                                    catalog_path=data_parameters.catalog_path)
+    # getting file paths to nessisary met data
+    if len(wind_file_paths) == 0:
+        print('no met files found')
+        return
+    wind_list = csv_import_func(wind_file_paths, data_parameters.sites, cache_dir=data_parameters.cache_dir,
+                                workers=data_parameters.workers, columns=wind_columns,
+                                start_time=data_parameters.start_time, end_time=data_parameters.end_time,
+                                store_dir=data_parameters.store_dir)
+    # importing met data once for all species as a list of df's one per site
+    wind_list = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time) for df in wind_list]
+    # slicing the df's to the correct time interval
+
+    group_data = {}
+    if methane_match is True and 'ch4' not in species_groups:
+        species_groups['ch4'] = []
+        # methane files are needed for the VOC files even if no ch4 file is made
+    for path_species, group_species in species_groups.items():
+        if path_species == 'met':
+            group_data[path_species] = wind_list
+            # species stored in the met files are already imported with the met data
+            continue
+        group_columns = ['time', 'ch4'] if path_species == 'ch4' and methane_match is True else ['time']
+        for species in group_species:
+            group_columns += [col for col in species_columns_func(species, wind_ready=True)
+                              if col not in group_columns]
+        if not data_parameters.prune_columns:
+            group_columns = None
+        data_file_paths = file_path_generator_func(data_parameters.file_path, data_parameters.sites,
+                                                   group_species[0] if group_species else 'ch4',
+                                                   data_parameters.start_time, data_parameters.end_time,
+                                                   catalog_path=data_parameters.catalog_path)
+        # getting file paths to nessisary species data (shared by all species of the instrument)
+        if len(data_file_paths) == 0:
+            print('no ' + path_species + ' files found')
+            continue
+        data_list = csv_import_func(data_file_paths, data_parameters.sites, cache_dir=data_parameters.cache_dir,
+                                    workers=data_parameters.workers, columns=group_columns,
+                                    start_time=data_parameters.start_time, end_time=data_parameters.end_time,
+                                    store_dir=data_parameters.store_dir)
+        group_data[path_species] = [df_timeloc_func(df, data_parameters.start_time, data_parameters.end_time)
+                                    for df in data_list]
+        # importing and slicing the instrument data once for all of its species
+
+    wind_list = wind_column_correction_func(wind_list)
+    # fixing wind column names if needed
+
+    loaded_columns = []
+    for species in species_list:
+        loaded_columns += [col for col in wind_ready_species_columns_func(species, methane_match)
+                           if col not in loaded_columns]
+
+    for path_species, group_species in species_groups.items():
+        if path_species not in group_data or len(group_species) == 0:
+            continue
+        group_parameters = copy.copy(data_parameters)
+        group_parameters.species = group_species[0]
+        # the pairing method only depends on the instrument so the first species stands in for the group
+        group_wind_list = [df.copy(deep=False) for df in wind_list]
+        # the pairing functions add columns to the met df's
+        if path_species == 'voc' and methane_match is True:
+            if 'ch4' not in group_data:
+                print('no ch4 files found for methane match')
+                continue
+            methane_list = [df[['time', 'ch4']] if data_parameters.prune_columns else df for df in group_data['ch4']]
+            group_wind_list = met_methane_combine_func(group_parameters, group_wind_list, methane_list)
+            # combin methane and met df's and place them back in list
+        data_list = [df.copy(deep=False) for df in group_data[path_species]]
+        group_combine_data = wind_ready_combine_func(group_parameters, group_wind_list, data_list)
+        # pairing the met data with all species of the instrument in one pass
+
+        for species in group_species:
+            species_parameters = copy.copy(data_parameters)
+            species_parameters.species = species
+            own_columns = wind_ready_species_columns_func(species, methane_match)
+            drop_columns = []
+            if data_parameters.prune_columns:
+                drop_columns = [col for col in loaded_columns if col not in own_columns]
+            combine_data = [df.drop(columns=[col for col in drop_columns if col in df.columns])
+                            for df in group_combine_data]
+            # keeping only the columns a single species run would have
+
+            if species_parameters.zero_filter is True:
+                # if True filiter zero and negative values by replacing them with NAN values
+                combine_data = zero_filter_func(combine_data)
+            combine_data = lat_lon_column_func(combine_data, species_parameters)
+            # adding lat and lon columns
+            wind_ready_export_func(species_parameters, combine_data)
+            # export wind ready CSV files to you out dir
+
+
+def wind_ready_stream_func(data_parameters):
+    """
+    Streaming version of the wind ready pipeline that keeps only one quarter of data per site in memory
+
+    Each site is processed one quarter at a time and the paired rows are appended to the site's wind ready CSV file.
+    The pairing windows reach a few rows past the end of each quarter so the last STREAM_CARRY_ROWS met rows (and the
+    species rows after them) are held back and paired with the next quarter, together with another
+    STREAM_CARRY_ROWS rows of context before them (the last quarter with data holds nothing back).  Rows are written
+    only once, in time order.  The output matches a full run except for radon samples in the first 9 rows of the
+    data, whose windows wrap around to the end of the data in radon_wind_pairing_func (the end of the first quarter
+    instead of the end of the full span).
 
-    combine_data = lat_lon_column_func(combine_data, data_parameters)
-    # adding lat and lon columns
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+
+    Returns
+    -------
+    None
+        exports the data to out directory specified in the data_parameters object
+    """
+    quarters = sorted(get_quarters_and_years_func(data_parameters.start_time, data_parameters.end_time))
+    for site in data_parameters.sites:
+        site_parameters = copy.copy(data_parameters)
+        site_parameters.sites = [site]
+        wind_ready_stream_site_func(site_parameters, quarters)
+
+
+@profile_stage_func
+def wind_ready_stream_site_func(site_parameters, quarters, emit_floor=None, export_columns=None):
+    """
+    Streams the wind ready pipeline for a single site over a list of quarters (see wind_ready_stream_func)
+
+    Parameters
+    ----------
+    site_parameters : object
+        class object storing parameters and constants for making windrose ready files with a single site in sites
+    quarters : list of str
+        sorted list of year and quarter strings to process (EX: ['2022_q1', '2022_q2'])
+    emit_floor : object
+        rows before this time are paired (as context for the pairing windows) but not written (default None)
+    export_columns : list of str
+        columns of an existing output file to append to (default None, a new file is written)
+
+    Returns
+    -------
+    list of str
+        columns of the output file
+    """
+    carry_wind = None
+    carry_data = None
+    emit_start = emit_floor
+    data_quarter_nums = [quarter_num for quarter_num, quarter in enumerate(quarters)
+                         if wind_ready_quarter_files_func(site_parameters, quarter)]
+    last_quarter_num = data_quarter_nums[-1] if len(data_quarter_nums) > 0 else -1
+    # rows are only held back for a later quarter that has data (EX: not for the quarter of an end_time whose files
+    # do not exist yet)
+    for quarter_num, quarter in enumerate(quarters):
+        if quarter_num not in data_quarter_nums:
+            continue
+            # no data for this site and quarter
+        quarter_start, quarter_end = quarter_bounds_func(quarter)
+        wind_list, data_list = wind_ready_load_func(site_parameters, quarter_start, quarter_end)
+
+        if carry_wind is not None:
+            wind_list = [pd.concat([carry_wind, wind_list[0]], ignore_index=True)]
+            data_list = [pd.concat([carry_data, data_list[0]], ignore_index=True)]
+        # adding the rows held back from the last quarter
+
+        wind = wind_list[0]
+        if quarter_num < last_quarter_num and len(wind) > 2 * STREAM_CARRY_ROWS:
+            emit_end = wind['time'].iloc[-STREAM_CARRY_ROWS]
+            context_start = wind['time'].iloc[-2 * STREAM_CARRY_ROWS]
+            carry_wind = wind.loc[wind['time'] >= context_start]
+            carry_data = data_list[0].loc[data_list[0]['time'] >= context_start]
+        else:
+            emit_end = None
+            carry_wind = None
+            carry_data = None
+        # holding back the rows whose pairing windows reach into the next quarter
+
+        combine_data = wind_ready_combine_func(site_parameters, wind_list, data_list,
+                                               close_last_window=emit_end is not None)
+        data = combine_data[0]
+        if emit_start is not None:
+            data = data.loc[data['time'] >= emit_start]
+        if emit_end is not None:
+            data = data.loc[data['time'] < emit_end]
+            if emit_floor is None or emit_end > emit_floor:
+                emit_start = emit_end
+        # only writing the rows that have not been written yet and whose windows are complete
+
+        combine_data = [data]
+        if site_parameters.zero_filter is True:
+            combine_data = zero_filter_func(combine_data)
+        combine_data = lat_lon_column_func(combine_data, site_parameters)
+
+        if export_columns is None:
+            export_columns = list(combine_data[0].columns)
+            wind_ready_export_func(site_parameters, combine_data)
+        else:
+            combine_data = [combine_data[0].reindex(columns=export_columns)]
+            wind_ready_export_func(site_parameters, combine_data, append=True)
+        # the first quarter creates the file, later quarters are appended with the same columns
+    return export_columns
+
+
+def wind_ready_quarter_files_func(site_parameters, quarter):
+    """
+    Tells if a site has both met and species files for a quarter (wind_ready_load_func has nothing to pair without
+    them)
+
+    Parameters
+    ----------
+    site_parameters : object
+        class object storing parameters and constants for making windrose ready files with a single site in sites
+    quarter : str
+        year and quarter string (EX: '2022_q3')
+
+    Returns
+    -------
+    bool
+        True if the quarter has met and species files
+    """
+    quarter_start, quarter_end = quarter_bounds_func(quarter)
+    return (len(wind_file_path_generator_func(site_parameters.file_path, site_parameters.sites, quarter_start,
+                                              quarter_end, catalog_path=site_parameters.catalog_path)) > 0 and
+            len(file_path_generator_func(site_parameters.file_path, site_parameters.sites, site_parameters.species,
+                                         quarter_start, quarter_end, catalog_path=site_parameters.catalog_path)) > 0)
+
+
+def wind_ready_input_files_func(site_parameters, quarter):
+    """
+    Gets the size and modification time of every input file used for one site and quarter
+
+    Parameters
+    ----------
+    site_parameters : object
+        class object storing parameters and constants for making windrose ready files with a single site in sites
+    quarter : str
+        year and quarter string (EX: '2022_q3')
+
+    Returns
+    -------
+    dict
+        {file path: [size, mtime]} for the met, species (and methane) files of that quarter
+    """
+    quarter_start, quarter_end = quarter_bounds_func(quarter)
+    file_paths = wind_file_path_generator_func(site_parameters.file_path, site_parameters.sites, quarter_start,
+                                               quarter_end, catalog_path=site_parameters.catalog_path)
+    file_paths += file_path_generator_func(site_parameters.file_path, site_parameters.sites, site_parameters.species,
+                                           quarter_start, quarter_end, catalog_path=site_parameters.catalog_path)
+    if site_parameters.methane_match is True and site_parameters.species in VOC_LIST:
+        file_paths += file_path_generator_func(site_parameters.file_path, site_parameters.sites, 'ch4',
+                                               quarter_start, quarter_end, catalog_path=site_parameters.catalog_path)
+    input_files = {}
+    for path in file_paths:
+        stat = os.stat(path)
+        input_files[os.path.normpath(path)] = [stat.st_size, stat.st_mtime_ns]
+    return input_files
+
+
+@profile_stage_func
+def wind_ready_incremental_func(data_parameters):
+    """
+    Incremental version of the wind ready pipeline that only pairs quarters that are new or whose files changed
+
+    A manifest in the out directory records, for every output file, the parameters (species, start_time, wsp_filter,
+    zero_filter, methane_match), the end_time and the input files (with size and modification time) of every quarter
+    that produced it.  On the next run the first quarter whose input files changed, or that is new, is found.  The
+    quarter before it is re-paired as well (its last rows were paired without the next quarter's data), using the
+    quarter before that as context, and the rows from then on replace the end of the existing output.  If the
+    parameters changed, an earlier quarter changed or end_time moved back the output is rebuilt from scratch.
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+
+    Returns
+    -------
+    None
+        exports the data to out directory specified in the data_parameters object
+    """
+    manifest_path = os.path.join(data_parameters.export_dir, 'wind_ready_manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+
+    quarters = sorted(get_quarters_and_years_func(data_parameters.start_time, data_parameters.end_time))
+    parameters = {'species': data_parameters.species, 'start_time': data_parameters.start_time,
+                  'wsp_filter': data_parameters.wsp_filter, 'zero_filter': data_parameters.zero_filter,
+                  'methane_match': data_parameters.methane_match}
+    for site in data_parameters.sites:
+        site_parameters = copy.copy(data_parameters)
+        site_parameters.sites = [site]
+        output_path = wind_ready_file_path_func(site_parameters, site)
+        input_files = {quarter: wind_ready_input_files_func(site_parameters, quarter) for quarter in quarters}
+        manifest_key = site + '_' + data_parameters.species + '_' + data_parameters.start_time[:10]
+        entry = manifest.get(manifest_key)
+
+        restart = 0
+        if (entry is not None and entry['parameters'] == parameters and os.path.exists(entry['output_path'])
+                and entry['end_time'] <= data_parameters.end_time):
+            restart = len(quarters)
+            end_quarter = get_quarters_and_years_func(entry['end_time'], entry['end_time'])[0]
+            for quarter_num, quarter in enumerate(quarters):
+                if (entry['input_files'].get(quarter) != input_files[quarter] or
+                        (quarter == end_quarter and entry['end_time'] < data_parameters.end_time)):
+                    restart = quarter_num - 1
+                    break
+            # finding the first quarter that is new, changed or was cut off by the last end_time
+
+        if restart == len(quarters):
+            print(site + ' wind ready file is up to date')
+        elif restart <= 0:
+            wind_ready_stream_site_func(site_parameters, quarters)
+            # full rebuild
+        else:
+            if entry['output_path'] != output_path:
+                os.replace(entry['output_path'], output_path)
+                # end_time is part of the file name
+            emit_floor = pd.Timestamp(quarter_bounds_func(quarters[restart])[0])
+            existing_data = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+            existing_data = existing_data.loc[existing_data['time'] < str(emit_floor)]
+            existing_data.to_csv(output_path, index=False, encoding='utf-8')
+            # keeping the rows before the first re-paired quarter (as text so they are written back unchanged)
+            wind_ready_stream_site_func(site_parameters, quarters[restart - 1:], emit_floor=emit_floor,
+                                        export_columns=list(existing_data.columns))
+
+        manifest[manifest_key] = {'parameters': parameters, 'end_time': data_parameters.end_time,
+                                  'output_path': output_path, 'input_files': input_files}
+        with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+
+
+@profile_stage_func
+def wind_ready_func(data_parameters):
+    """
+    Makes the wind ready files for a WindReadyConstants object (used by main and Batch_Runner)
+
+    Parameters
+    ----------
+    data_parameters : object
+        class object storing parameters and constants for making windrose ready files
+
+    Returns
+    -------
+    None
+        exports the data to out directory specified in the data_parameters object
+    """
+    if getattr(data_parameters, 'profile_path', None) is not None and not profile_enabled_func():
+        with profile_run_func(data_parameters.profile_path):
+            return wind_ready_func(data_parameters)
+        # records every stage of the run and writes the run profile when it is done
+
+    if data_parameters.incremental is True or data_parameters.stream is True:
+        species_list = data_parameters.species
+        if isinstance(species_list, str):
+            species_list = [species_list]
+        for species in species_list:
+            species_parameters = copy.copy(data_parameters)
+            species_parameters.species = species
+            if data_parameters.incremental is True:
+                wind_ready_incremental_func(species_parameters)
+                # only process quarters that are new or changed since the last run
+            else:
+                wind_ready_stream_func(species_parameters)
+                # process the data one quarter at a time
+        return
+
+    wind_ready_species_func(data_parameters)
+    # importing met and species data once, pairing them and exporting wind ready CSV files to you out dir
+
+
+def main():
+    """
+    main function for running Wind_Ready_Data_Generator script.  Script instanciates WindReadyConstants class.
+
+    This script takes BA quarterly CSV_out files as inputs and produces CSV files ready to be used by R studios OpenAir
+    package to make heat plots and pollution rose figures.  It does this by reading in and combining met data with
+    BA species data.  It also has a built in filtering function that can be applied or not as needed.  Multiple site
+    outputs can be produced at the same time.
+    """
+    data_parameters = WindReadyConstants(file_path=r'E:/IDAT', sites=['CCF'],
+                                         species='radon', start_time='2022-08-31 00:00:00',
+                                         end_time='2022-09-11 00:0:00', wsp_filter=0, methane_match=False,
+                                         zero_filter=False, export_dir='E:\Ready for wind plot dir')
+    # ending dates of each quarter: q1: 03-31 23:59:00, q2: 06-30 23:59:00,
+    # q3: 09-30 23:59:00, q4: 12-31 23:59:00,
 
-    wind_ready_export_func(data_parameters, combine_data)
-    # export wind ready CSV files to you out dir
+    wind_ready_func(data_parameters)
+    # makes the wind ready files
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+
+def group_codes_func(groups, length):
+    """
+    Converts group labels into integer group codes
+
+    Parameters
+    ----------
+    groups : array or list of arrays
+        group label for every row (EX: window number) or a list of label arrays for multi key groups (EX: [site, hour])
+        None puts every row in a single group
+    length : int
+        number of rows
+
+    Returns
+    -------
+    array of int, object
+        integer group code for every row and the index of unique group labels (in order of first appearance)
+    """
+    if groups is None:
+        return np.zeros(length, dtype=np.intp), pd.Index([0])
+    if isinstance(groups, (list, tuple)):
+        codes, uniques = pd.MultiIndex.from_arrays([np.asarray(group) for group in groups]).factorize()
+    else:
+        codes, uniques = pd.factorize(np.asarray(groups))
+        uniques = pd.Index(uniques)
+    return codes, uniques
+
+
+def group_sum_func(values, codes, n_groups, skipna=True):
+    """
+    Sums values per group in a single pass (values are added in row order within each group)
+
+    Parameters
+    ----------
+    values : array of float
+        values to sum
+    codes : array of int
+        integer group code for every value (negative codes are left out)
+    n_groups : int
+        number of groups
+    skipna : bool
+        True leaves NaN values out of the sums and counts, False makes a group NaN if it holds any NaN (default True)
+
+    Returns
+    -------
+    array of float, array of int
+        sum and number of values for every group
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes)
+    valid = codes >= 0
+    if skipna:
+        valid &= ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    return sums, counts
+
+
+def quadrant_wind_direction_func(x_tot, y_tot):
+    """
+    Converts summed east-west (x) and north-south (y) wind components into an average wind direction (0 to 360)
+
+    Vectorized form of the quadrant fix-up used by the pairing functions: the arctan of x/y is shifted into the
+    quadrant the summed components fall in.  If either sum is zero or NaN the direction is NaN.
+
+    Parameters
+    ----------
+    x_tot : array of float
+        summed sin(wdr) components
+    y_tot : array of float
+        summed cos(wdr) components
+
+    Returns
+    -------
+    array of float
+        average wind direction in degrees
+    """
+    x_tot = np.asarray(x_tot, dtype=float)
+    y_tot = np.asarray(y_tot, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg = np.arctan(x_tot / y_tot) * 57.2958
+    conditions = [(x_tot > 0) & (y_tot > 0), (x_tot > 0) & (y_tot < 0), (x_tot < 0) & (y_tot < 0),
+                  (x_tot < 0) & (y_tot > 0)]
+    choices = [avg, avg + 180, avg + 180, avg + 360]
+    return np.select(conditions, choices, default=np.nan)
+
+
+def arctan2_wind_direction_func(x_tot, y_tot):
+    """
+    Converts summed east-west (x) and north-south (y) wind components into a wind direction (0 to 360) with arctan2
+
+    Parameters
+    ----------
+    x_tot : array of float
+        summed (or averaged) sin(wdr) components
+    y_tot : array of float
+        summed (or averaged) cos(wdr) components
+
+    Returns
+    -------
+    array of float
+        wind direction in degrees, NaN if both components are zero or either is NaN
+    """
+    x_tot = np.asarray(x_tot, dtype=float)
+    y_tot = np.asarray(y_tot, dtype=float)
+    direction = np.mod(np.degrees(np.arctan2(x_tot, y_tot)), 360)
+    direction[(x_tot == 0) & (y_tot == 0)] = np.nan
+    return direction
+
+
+def wind_statistics_func(wdr, wsp, groups=None, direction='arctan2', skipna=True):
+    """
+    Computes wind statistics for many groups (EX: averaging windows, sites, hours) in one batched call
+
+    For every group the function returns the number of observations, the scalar mean wind speed, the unit-vector mean
+    wind direction, the speed weighted (resultant) wind direction, the resultant wind speed and the Yamartino
+    sigma-theta (standard deviation of wind direction).
+
+    Parameters
+    ----------
+    wdr : array of float
+        wind direction in degrees
+    wsp : array of float
+        wind speed
+    groups : array or list of arrays
+        group label for every row or a list of label arrays for multi key groups (EX: [df['site'], df['hour']])
+        (default None, all rows are one group)
+    direction : str
+        'arctan2' (default) or 'quadrant' to use the arctan/quadrant fix-up of the original pairing functions
+    skipna : bool
+        True leaves NaN values out of each statistic, False makes a group's statistics NaN if it holds any NaN wind
+        speed or direction (default True)
+
+    Returns
+    -------
+    object
+        DF indexed by group label with 'count', 'wsp', 'wdr', 'wdr_weighted', 'wsp_resultant' and 'sigma_theta'
+        columns
+    """
+    wdr = np.asarray(wdr, dtype=float)
+    wsp = np.asarray(wsp, dtype=float)
+    codes, uniques = group_codes_func(groups, len(wdr))
+    n_groups = len(uniques)
+
+    x = np.sin(wdr * np.pi / 180)  # converting wdr into east-west and north-south components
+    y = np.cos(wdr * np.pi / 180)
+    if skipna:
+        both_valid = ~(np.isnan(wdr) | np.isnan(wsp))
+        weighted_codes = np.where(both_valid, codes, -1)
+    else:
+        weighted_codes = codes
+
+    x_tot, wdr_count = group_sum_func(x, codes, n_groups, skipna)
+    y_tot = group_sum_func(y, codes, n_groups, skipna)[0]
+    wsp_tot, wsp_count = group_sum_func(wsp, codes, n_groups, skipna)
+    u_tot, weighted_count = group_sum_func(wsp * x, weighted_codes, n_groups, skipna)
+    v_tot = group_sum_func(wsp * y, weighted_codes, n_groups, skipna)[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x_tot / wdr_count
+        y_mean = y_tot / wdr_count
+        u_mean = u_tot / weighted_count
+        v_mean = v_tot / weighted_count
+        epsilon = np.sqrt(np.clip(1 - (x_mean ** 2 + y_mean ** 2), 0, 1))
+        sigma_theta = np.degrees(np.arcsin(epsilon)) * (1 + (2 / np.sqrt(3) - 1) * epsilon ** 3)
+        # Yamartino (1984) single pass estimate of the standard deviation of wind direction
+        stats_df = pd.DataFrame({'count': np.maximum(wdr_count, wsp_count),
+                                 'wsp': wsp_tot / wsp_count}, index=uniques)
+
+    if direction == 'quadrant':
+        stats_df['wdr'] = quadrant_wind_direction_func(x_tot, y_tot)
+        stats_df['wdr_weighted'] = quadrant_wind_direction_func(u_tot, v_tot)
+    else:
+        stats_df['wdr'] = arctan2_wind_direction_func(x_tot, y_tot)
+        stats_df['wdr_weighted'] = arctan2_wind_direction_func(u_tot, v_tot)
+    stats_df['wsp_resultant'] = np.sqrt(u_mean ** 2 + v_mean ** 2)
+    stats_df['sigma_theta'] = sigma_theta
+    return stats_df
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'BA_Code'))
+# the BA_Code scripts import each other as top level modules
+
+import numpy as np
+import pytest
+from Synthetic_IDAT import synthetic_quarter_func
+
+FIXTURE_SITE_LIST = ['BSE', 'CCF']
+
+FIXTURE_INSTRUMENT_LIST = ['ch4', 'voc']
+
+FIXTURE_DAYS = 2
+# days at the start of every quarter written to the fixture files
+
+
+@pytest.fixture(scope='session')
+def idat_dir(tmp_path_factory):
+    """
+    Small synthetic IDAT tree (site/instrument/site_instrument_2022_qN.csv) in the CSV_out format, the first
+    FIXTURE_DAYS of every quarter
+    """
+    base_dir = tmp_path_factory.mktemp('idat')
+    rng = np.random.default_rng(0)
+    for site in FIXTURE_SITE_LIST:
+        for instrument in FIXTURE_INSTRUMENT_LIST:
+            os.makedirs(os.path.join(base_dir, site, instrument))
+            for quarter in range(1, 5):
+                data = synthetic_quarter_func(site, instrument, 2022, quarter, rng)
+                data = data.loc[data['time'] < data['time'].iloc[0] + FIXTURE_DAYS * 86400]
+                path = os.path.join(base_dir, site, instrument, site + '_' + instrument + '_2022_q' + str(quarter) +
+                                    '.csv')
+                with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+                    csv_file.write(site + ' ' + instrument + ' CSV_out synthetic data\n')
+                    data.to_csv(csv_file, index=False)
+    return str(base_dir)
+
+
+@pytest.fixture(scope='session')
+def idat_paths(idat_dir):
+    """
+    CSV_out file paths of the fixture tree in the order file_path_generator_func lists them (site by site)
+    """
+    return [os.path.join(idat_dir, site, instrument, site + '_' + instrument + '_2022_q' + str(quarter) + '.csv')
+            for site in FIXTURE_SITE_LIST for instrument in FIXTURE_INSTRUMENT_LIST for quarter in range(1, 5)]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.cbook import boxplot_stats
+from Common_Functions import box_stats_func
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 20, 1000])
+def test_box_stats_match_matplotlib(size):
+    rng = np.random.default_rng(size)
+    df = pd.DataFrame({'site': np.repeat(['BSE', 'CCF'], size), 'ethane': rng.lognormal(size=2 * size)})
+    stats_df = box_stats_func(df, 'ethane', ['site'])
+    for site, row in stats_df.set_index('site').iterrows():
+        expected = boxplot_stats(df.loc[df['site'] == site, 'ethane'].to_numpy(), whis=(5, 95))[0]
+        assert row['count'] == size
+        assert row['mean'] == pytest.approx(expected['mean'])
+        assert row['p25'] == pytest.approx(expected['q1'])
+        assert row['p50'] == pytest.approx(expected['med'])
+        assert row['p75'] == pytest.approx(expected['q3'])
+        assert row['whislo'] == pytest.approx(expected['whislo'])
+        assert row['whishi'] == pytest.approx(expected['whishi'])
+
+
+def test_box_stats_whiskers_outside_box():
+    df = pd.DataFrame({'site': ['BSE', 'BSE'], 'ethane': [1.215, 2.313]})
+    row = box_stats_func(df, 'ethane', ['site']).iloc[0]
+    assert row['whislo'] <= row['p25'] <= row['p75'] <= row['whishi']
+
+
+def test_box_stats_skip_nan():
+    df = pd.DataFrame({'site': ['BSE'] * 4, 'ethane': [1.0, np.nan, 3.0, 2.0]})
+    row = box_stats_func(df, 'ethane', ['site']).iloc[0]
+    assert row['count'] == 3
+    assert row['p50'] == 2.0
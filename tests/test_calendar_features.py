@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+from Common_Functions import calendar_features_func, to_denver_tz_func
+
+
+def test_calendar_features_match_local_time():
+    df = pd.DataFrame({'time': pd.date_range('2021-01-01', '2022-01-01', freq='37min')})
+    features = calendar_features_func(df)
+    local = to_denver_tz_func(df.copy())['time']
+    assert (features['hour'] == local.dt.hour).all()
+    assert (features['weekday'] == local.dt.dayofweek).all()
+    assert (features['month'] == local.dt.month).all()
+    assert (features['year'] == local.dt.year).all()
+    assert (features['diurnal'] == np.where((local.dt.hour >= 8) & (local.dt.hour < 20), 'Day', 'Night')).all()
+
+
+def test_calendar_features_nat():
+    df = pd.DataFrame({'time': pd.to_datetime(['2021-07-01 15:00:00', None])})
+    features = calendar_features_func(df, local=False)
+    assert features['hour'].iloc[0] == 15
+    assert features[['hour', 'weekday', 'month', 'year', 'quarter']].iloc[1].isna().all()
+    assert list(features['diurnal']) == ['Day', 'Night']
+
+
+def test_calendar_features_follow_time_changes():
+    features = calendar_features_func(pd.DataFrame({'time': pd.to_datetime(['2021-07-01 15:00:00'])}), local=False)
+    shifted = features.copy()
+    shifted['time'] = shifted['time'] + pd.Timedelta(hours=12)
+    assert calendar_features_func(shifted, local=False)['hour'].iloc[0] == 3
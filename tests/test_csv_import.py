@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from Common_Functions import csv_import_func
+
+
+def baseline_csv_import_func(file_paths, sites, header_num=1):
+    """
+    The serial csv_import_func the parallel and stream join import replaced, kept as the reference for its output
+    """
+    count = 0
+    active_site = sites[0]
+    df_list = []
+    data_list = []
+    for path in file_paths:
+        data = pd.read_csv(path, header=header_num)
+        data['time'] = pd.to_datetime(data['time'], unit='s')
+        data['time'] = data['time'].dt.round('1min')
+        if active_site in path and path != file_paths[-1]:
+            df_list.append(data)
+        elif active_site not in path and path != file_paths[-1]:
+            data_list.append(df_list)
+            df_list = [data]
+            count += 1
+            active_site = sites[count]
+        elif active_site in path and path == file_paths[-1]:
+            df_list.append(data)
+            data_list.append(df_list)
+        else:
+            data_list.append(df_list)
+            data_list.append([data])
+
+    combine_data_list = []
+    for lst in data_list:
+        data_list_1 = [lst[0]] + [df for df in lst[1:] if df.columns[1] in lst[0].columns]
+        data_list_2 = [df for df in lst[1:] if df.columns[1] not in lst[0].columns]
+        data = pd.concat(data_list_1)
+        if len(data_list_2) > 0:
+            data = pd.merge(data, pd.concat(data_list_2), on='time', how='outer')
+        combine_data_list.append(data.sort_values(by=['time']))
+    return combine_data_list
+
+
+def test_csv_import_matches_baseline(idat_paths):
+    expected = baseline_csv_import_func(idat_paths, ['BSE', 'CCF'])
+    result = csv_import_func(idat_paths, ['BSE', 'CCF'])
+    assert len(result) == len(expected) == 2
+    for result_df, expected_df in zip(result, expected):
+        pd.testing.assert_frame_equal(result_df.reset_index(drop=True), expected_df.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('columns', [None, ['time', 'ethane']])
+def test_csv_import_workers_match_serial(idat_paths, columns):
+    serial = csv_import_func(idat_paths, ['BSE', 'CCF'], columns=columns)
+    parallel = csv_import_func(idat_paths, ['BSE', 'CCF'], workers=2, columns=columns)
+    for serial_df, parallel_df in zip(serial, parallel):
+        pd.testing.assert_frame_equal(serial_df, parallel_df)
+
+
+def test_csv_import_cache_matches_parse(idat_paths, tmp_path):
+    parsed = csv_import_func(idat_paths, ['BSE', 'CCF'])
+    for _ in range(2):
+        cached = csv_import_func(idat_paths, ['BSE', 'CCF'], cache_dir=str(tmp_path))
+        # the first import fills the feather cache, the second reads it
+        for parsed_df, cached_df in zip(parsed, cached):
+            pd.testing.assert_frame_equal(parsed_df, cached_df)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+import Common_Functions
+from Common_Functions import csv_read_func, cached_csv_read_func, epoch_minute_func
+
+WINDOW_LIST = [(None, None), ('2022-04-01 06:00:00', None), (None, '2022-04-01 12:30:00'),
+               ('2022-04-01 10:00:00', '2022-04-02 03:17:00'), ('2022-05-01 00:00:00', '2022-06-01 00:00:00')]
+
+
+def baseline_csv_read_func(path, header_num=1):
+    """
+    The original parse of a CSV_out file (pandas parser, datetimes rounded to the minute)
+    """
+    data = pd.read_csv(path, header=header_num)
+    data['time'] = pd.to_datetime(data['time'], unit='s').dt.round('1min')
+    return data
+
+
+def window_func(data, start_time, end_time):
+    keep = np.ones(len(data), dtype=bool)
+    if start_time is not None:
+        keep &= (data['time'] >= pd.Timestamp(start_time)).to_numpy()
+    if end_time is not None:
+        keep &= (data['time'] < pd.Timestamp(end_time)).to_numpy()
+    return data.loc[keep]
+
+
+@pytest.fixture(params=['pyarrow', 'pandas'])
+def csv_engine(request, monkeypatch):
+    if request.param == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    monkeypatch.setattr(Common_Functions, 'CSV_ENGINE', request.param)
+    monkeypatch.setattr(Common_Functions, 'CSV_CHUNK_ROWS', 500)
+    # small chunks so the windowed pandas reads stop early and join several chunks
+    return request.param
+
+
+@pytest.mark.parametrize('instrument', ['ch4', 'voc'])
+@pytest.mark.parametrize('start_time, end_time', WINDOW_LIST)
+def test_csv_read_window_matches_baseline(idat_dir, csv_engine, instrument, start_time, end_time):
+    path = idat_dir + '/BSE/' + instrument + '/BSE_' + instrument + '_2022_q2.csv'
+    expected = window_func(baseline_csv_read_func(path), start_time, end_time)
+    result = csv_read_func(path, start_time=start_time, end_time=end_time)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_csv_read_columns(idat_dir, csv_engine):
+    path = idat_dir + '/BSE/voc/BSE_voc_2022_q1.csv'
+    expected = baseline_csv_read_func(path)[['time', 'ethane']]
+    result = csv_read_func(path, columns=['ethane', 'not_a_column'])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_csv_read_chunk_dtypes(tmp_path, csv_engine):
+    times = 1640995200 + 60 * np.arange(2000)
+    counts = pd.Series(np.arange(2000), dtype='Int64')
+    counts.iloc[1500] = pd.NA
+    path = str(tmp_path / 'counts.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        csv_file.write('title row\n')
+        pd.DataFrame({'time': times, 'count': counts}).to_csv(csv_file, index=False)
+    # an integer column with one blank after the first chunks
+    expected = window_func(baseline_csv_read_func(path), '2022-01-01 02:00:00', None)
+    result = csv_read_func(path, start_time='2022-01-01 02:00:00')
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('start_time, end_time', WINDOW_LIST)
+def test_cached_csv_read_window(idat_dir, tmp_path, start_time, end_time):
+    path = idat_dir + '/CCF/ch4/CCF_ch4_2022_q2.csv'
+    expected = window_func(baseline_csv_read_func(path), start_time, end_time)
+    for _ in range(2):
+        result = cached_csv_read_func(path, cache_dir=str(tmp_path), start_time=start_time, end_time=end_time)
+        # a miss parses the whole file into the cache, the hit is cropped from the cache
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+    assert len(list(tmp_path.glob('*.feather'))) == 1
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'float64'])
+def test_epoch_minute_matches_round(dtype):
+    rng = np.random.default_rng(0)
+    epoch = pd.Series(rng.integers(1577836800, 1735689600, 20000)).astype(dtype)
+    epoch.iloc[:4] = [1640995230, 1640995290, 1640995229, 1640995231]
+    # half minutes round to the even minute
+    expected = pd.to_datetime(epoch, unit='s').dt.round('1min')
+    pd.testing.assert_series_equal(epoch_minute_func(epoch), expected)
+
+
+def test_epoch_minute_fractional_and_nan():
+    epoch = pd.Series([1640995230.5, np.nan, 1640995289.9, 1640995200.0])
+    expected = pd.to_datetime(epoch, unit='s').dt.round('1min')
+    pd.testing.assert_series_equal(epoch_minute_func(epoch), expected)
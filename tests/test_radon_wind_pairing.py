@@ -0,0 +1,64 @@
+from statistics import mean
+
+import numpy as np
+import pandas as pd
+import pytest
+from Common_Functions import radon_wind_pairing_func
+
+
+def baseline_radon_wind_pairing_func(met_df, radon_df):
+    """
+    The row by row implementation radon_wind_pairing_func replaced, kept as the reference for its output
+    """
+    radon_df['time'] = radon_df['time'].dt.round('1min')
+    met_df['bool'] = met_df['time'].isin(radon_df['time'])
+    data = pd.merge(radon_df, met_df, on='time', how='outer')
+    data = data.set_index(['time']).sort_index().reset_index()
+    goodind = data.loc[data['bool'] == True].index.tolist()
+    data['wdr'] = data['wdr'].astype(float)
+    data['wsp'] = data['wsp'].astype(float)
+    data['wdr_x'] = np.sin((data['wdr'] * np.pi / 180))
+    data['wdr_y'] = np.cos((data['wdr'] * np.pi / 180))
+
+    avg_wsp_list = []
+    avg_wdr_list = []
+    time_interval_list = []
+    for lst in [[ind - num for num in range(10)] for ind in goodind]:
+        wdr_x_tot = sum(data.iloc[ind]['wdr_x'] for ind in lst)
+        wdr_y_tot = sum(data.iloc[ind]['wdr_y'] for ind in lst)
+        avg_wsp_list.append(mean([data.iloc[ind]['wsp'] for ind in lst]))
+        time_interval_list.append(data.iloc[lst[0]]['time'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg = np.arctan(np.float64(wdr_x_tot) / np.float64(wdr_y_tot)) * 57.2958
+        if wdr_x_tot > 0 and wdr_y_tot > 0:
+            avg_wdr_list.append(avg)
+        elif wdr_x_tot > 0 and wdr_y_tot < 0:
+            avg_wdr_list.append(avg + 180)
+        elif wdr_x_tot < 0 and wdr_y_tot < 0:
+            avg_wdr_list.append(avg + 180)
+        elif wdr_x_tot < 0 and wdr_y_tot > 0:
+            avg_wdr_list.append(avg + 360)
+        else:
+            avg_wdr_list.append(np.nan)
+
+    combine_df = pd.DataFrame()
+    combine_df['wdr'] = avg_wdr_list
+    combine_df['wsp'] = avg_wsp_list
+    combine_df['time'] = time_interval_list
+    return pd.merge(combine_df, radon_df, on='time', how='outer')
+
+
+@pytest.mark.parametrize('seed, n', [(1, 3000), (2, 6000)])
+def test_radon_wind_pairing_matches_baseline(seed, n):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2022-01-01', periods=n, freq='1min')
+    times = times[rng.random(n) > 0.05]
+    met = pd.DataFrame({'time': times, 'wsp': rng.gamma(2, 1.5, len(times)), 'wdr': rng.uniform(0, 360, len(times))})
+    met.loc[rng.random(len(times)) < 0.01, 'wsp'] = np.nan
+    radon_times = (pd.date_range('2022-01-01 00:15', periods=n // 10 - 3, freq='10min') +
+                   pd.to_timedelta(rng.integers(-20, 20, n // 10 - 3), 's'))
+    radon = pd.DataFrame({'time': radon_times, 'radon': rng.random(len(radon_times))})
+    expected = baseline_radon_wind_pairing_func(met.copy(), radon.copy())
+    result = radon_wind_pairing_func(met.copy(), radon.copy())
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+    assert result['wdr'].equals(expected['wdr'])
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Common_Functions import resample_func
+
+
+def minute_frame(minutes=180):
+    return pd.DataFrame({'time': pd.date_range('2021-01-01', periods=minutes, freq='min'),
+                         'ethane': np.arange(minutes, dtype=float),
+                         'wdr': np.where(np.arange(minutes) % 2 == 0, 350.0, 10.0)})
+
+
+def test_resample_mean_and_coverage():
+    df = minute_frame()
+    df.loc[60:89, 'ethane'] = np.nan
+    result = resample_func(df, ['ethane'], 'h', min_coverage=0.75)
+    assert list(result['time']) == list(pd.date_range('2021-01-01', periods=3, freq='h'))
+    assert result['ethane'].iloc[0] == pytest.approx(29.5)
+    assert np.isnan(result['ethane'].iloc[1])
+    assert list(result['ethane_count']) == [60, 30, 60]
+
+
+def test_resample_wind_direction_vector_mean():
+    result = resample_func(minute_frame(), ['wdr'], 'h')
+    assert np.allclose(np.mod(result['wdr'] + 180, 360) - 180, 0, atol=1e-9)
+
+
+def test_resample_wind_direction_rejects_other_aggregates():
+    with pytest.raises(ValueError):
+        resample_func(minute_frame(), ['wdr'], 'h', how='median')
+
+
+def test_resample_month_end_frequency_rejected():
+    with pytest.raises(ValueError):
+        resample_func(minute_frame(), ['ethane'], 'ME')
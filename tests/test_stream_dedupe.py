@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import Run_Profiler
+from Common_Functions import sorted_stream_join_func, stream_dedupe_func
+
+
+def stream_frame(times, values, column='ethane'):
+    return pd.DataFrame({'time': pd.to_datetime(times), column: values})
+
+
+def test_stream_dedupe_keeps_last_row():
+    first = stream_frame(['2022-03-31 23:58', '2022-03-31 23:59', '2022-04-01 00:00'], [1.0, 2.0, 3.0])
+    second = stream_frame(['2022-04-01 00:00', '2022-04-01 00:01'], [4.0, 5.0])
+    # the next quarter's file repeats the row rounded into it
+    result = stream_dedupe_func([first, second])
+    expected = stream_frame(['2022-03-31 23:58', '2022-03-31 23:59', '2022-04-01 00:00', '2022-04-01 00:01'],
+                            [1.0, 2.0, 4.0, 5.0])
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_stream_dedupe_unsorted_matches_baseline():
+    rng = np.random.default_rng(0)
+    times = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 300, 1000), 'min')
+    df_list = [stream_frame(times[:600], np.arange(600.0)), stream_frame(times[600:], np.arange(600.0, 1000.0))]
+    result = stream_dedupe_func(df_list)
+    expected = pd.concat(df_list, ignore_index=True).drop_duplicates('time', keep='last')
+    expected = expected.sort_values('time').reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_stream_dedupe_rows_in_profile():
+    first = stream_frame(['2022-01-01 00:00', '2022-01-01 00:01'], [1.0, 2.0])
+    second = stream_frame(['2022-01-01 00:01', '2022-01-01 00:02'], [3.0, 4.0])
+    with Run_Profiler.profile_run_func():
+        stream_dedupe_func([first, second])
+    record = [record for record in Run_Profiler.PROFILE_RECORD_LIST if record['stage'] == 'stream_dedupe_func'][-1]
+    assert record['rows_in'] - record['rows_out'] == 1
+
+
+def test_sorted_stream_join_matches_merge():
+    voc = stream_frame(['2022-01-01 00:05', '2022-01-01 00:15'], [1.0, 2.0])
+    methane = stream_frame(['2022-01-01 00:04', '2022-01-01 00:05', '2022-01-01 00:06'], [1900.0, 1901.0, 1902.0],
+                           'ch4')
+    result = sorted_stream_join_func([voc, methane])
+    expected = pd.merge(voc, methane, on='time', how='outer').sort_values('time').reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+import Time_Series_Store
+from Common_Functions import csv_import_func, store_build_all_func
+from Time_Series_Store import store_frame_func, store_meta_func, store_open_func, store_write_func
+
+
+def minute_frame(rows=500):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'time': pd.date_range('2022-01-01', periods=rows, freq='min').as_unit('s'),
+                         'ethane': rng.random(rows), 'propane': rng.random(rows), 'site': 'BSE'})
+
+
+def test_store_round_trip(tmp_path):
+    data = minute_frame()
+    path = str(tmp_path / 'BSE' / 'voc')
+    meta = store_write_func(path, data, {})
+    assert meta['columns'] == ['ethane', 'propane'] and meta['rows'] == len(data)
+    pd.testing.assert_frame_equal(store_frame_func(path), data[['time', 'ethane', 'propane']])
+    window = store_frame_func(path, ['ethane'], '2022-01-01 01:00:00', '2022-01-01 02:00:00')
+    expected = data.loc[(data['time'] >= '2022-01-01 01:00:00') & (data['time'] < '2022-01-01 02:00:00'),
+                        ['time', 'ethane']]
+    pd.testing.assert_frame_equal(window, expected.reset_index(drop=True))
+
+
+def test_store_keeps_previous_version(tmp_path):
+    data = minute_frame()
+    path = str(tmp_path / 'store')
+    for _ in range(4):
+        store_write_func(path, data, {})
+    versions = sorted({int(name.rsplit('.', 2)[1]) for name in os.listdir(path) if name.endswith('.npy')})
+    assert versions == [2, 3] and store_meta_func(path)['version'] == 3
+    previous = np.load(os.path.join(path, 'c0.2.npy'))
+    np.testing.assert_array_equal(previous, data['ethane'].to_numpy())
+    # a reader that read the old description can still load its arrays
+
+
+def test_store_open_rereads_description(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    stale_meta = store_write_func(path, minute_frame(), {})
+    data = minute_frame().assign(ethane=1.0)
+    for _ in range(2):
+        store_write_func(path, data, {})
+    meta_list = [stale_meta]
+    monkeypatch.setattr(Time_Series_Store, 'store_meta_func',
+                        lambda path: meta_list.pop() if meta_list else store_meta_func(path))
+    # the first description read is the one replaced by the two later writes (its arrays are removed)
+    meta, store = store_open_func(path, 'c')
+    assert meta['version'] == 2
+    np.testing.assert_array_equal(store['ethane'], 1.0)
+
+
+@pytest.fixture(scope='module')
+def store_dir(idat_dir, tmp_path_factory):
+    store_dir = str(tmp_path_factory.mktemp('store'))
+    store_build_all_func(idat_dir, store_dir, ['BSE', 'CCF'])
+    return store_dir
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'columns': ['time', 'ethane']}, {'workers': 2},
+                                    {'start_time': '2022-04-01 12:00:00', 'end_time': '2022-07-01 06:00:00'}])
+def test_store_import_matches_parse(idat_paths, store_dir, kwargs):
+    parsed = csv_import_func(idat_paths, ['BSE', 'CCF'], **kwargs)
+    stored = csv_import_func(idat_paths, ['BSE', 'CCF'], store_dir=store_dir, **kwargs)
+    for parsed_df, stored_df in zip(parsed, stored):
+        pd.testing.assert_frame_equal(parsed_df, stored_df)
+
+
+def test_store_import_changed_file(idat_dir, idat_paths, tmp_path):
+    copy_dir = str(tmp_path / 'idat')
+    shutil.copytree(idat_dir, copy_dir)
+    paths = [path.replace(idat_dir, copy_dir) for path in idat_paths]
+    store_dir = str(tmp_path / 'store')
+    store_build_all_func(copy_dir, store_dir, ['BSE', 'CCF'])
+    changed = pd.read_csv(paths[5], header=1)
+    changed['ethane'] = changed['ethane'] * 2
+    with open(paths[5], 'w', newline='', encoding='utf-8') as csv_file:
+        csv_file.write('changed file\n')
+        changed.to_csv(csv_file, index=False)
+    # the store of the changed file's directory is out of date, those files are parsed and the rest read from stores
+    parsed = csv_import_func(paths, ['BSE', 'CCF'])
+    stored = csv_import_func(paths, ['BSE', 'CCF'], store_dir=store_dir, workers=2)
+    for parsed_df, stored_df in zip(parsed, stored):
+        pd.testing.assert_frame_equal(parsed_df, stored_df)
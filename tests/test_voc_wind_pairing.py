@@ -0,0 +1,124 @@
+from statistics import mean
+
+import numpy as np
+import pandas as pd
+import pytest
+from Common_Functions import voc_wind_pairing_func
+
+
+def baseline_voc_wind_pairing_func(met_df, voc_df):
+    """
+    The iterrows implementation voc_wind_pairing_func replaced (the ch4 and no ch4 loops merged), kept as the
+    reference for its output
+    """
+    voc_df['time'] = voc_df['time'].dt.round('1min')
+    met_df['bool'] = met_df['time'].isin(voc_df['time'])
+    data = pd.merge(voc_df, met_df, on='time', how='outer')
+    data = data.set_index(['time']).sort_index().reset_index()
+    goodind = data.loc[data['bool'] == True].index.tolist()
+
+    reallygoodind = []
+    for i in goodind:
+        reallygoodind += [i - 4, i - 3, i - 2, i - 1, i, i + 1, i + 2, i + 3, i + 4]
+    data['index'] = data.index
+    data['bool2'] = np.transpose([data['index'].isin(reallygoodind)])
+    data = data.loc[data['bool2'] == True]
+    if 'wsp_avg_ms' in list(data.columns) or 'wdr_avg' in list(data.columns):
+        data = data.rename(columns={'wsp_avg_ms': 'wsp', 'wdr_avg': 'wdr'})
+    ch4_bool = 'ch4' in data.columns
+    if ch4_bool:
+        data['ch4'] = data['ch4'].astype(float)
+    data['wdr'] = data['wdr'].astype(float)
+    data['wsp'] = data['wsp'].astype(float)
+    data['x'] = np.sin((data['wdr'] * np.pi / 180))
+    data['y'] = np.cos((data['wdr'] * np.pi / 180))
+
+    avg_wsp_list = []
+    avg_ch4_list = []
+    avg_list = []
+    fixedind = []
+    last_ind = None
+    for ind, row in data.iterrows():
+        if ind - 1 == last_ind:
+            xlist.append(row['x'])
+            ylist.append(row['y'])
+            last_ind = ind
+            avgwsplist.append(row['wsp'])
+            if ch4_bool:
+                avgch4list.append(row['ch4'])
+        elif ind == reallygoodind[0]:
+            avgch4list = [row['ch4']] if ch4_bool else []
+            avgwsplist = [row['wsp']]
+            xlist = [row['x']]
+            ylist = [row['y']]
+            last_ind = ind
+        else:
+            fixedind.append(last_ind - 4)
+            xtot = np.float64(sum(xlist))
+            ytot = np.float64(sum(ylist))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                avg = np.arctan(xtot / ytot) * 57.2958
+            # numpy division, the iterrows rows hold python floats that raise on a zero north-south sum
+            if xtot > 0 and ytot > 0:
+                avg_list.append(avg)
+            elif xtot > 0 and ytot < 0:
+                avg_list.append(avg + 180)
+            elif xtot < 0 and ytot < 0:
+                avg_list.append(avg + 180)
+            elif xtot < 0 and ytot > 0:
+                avg_list.append(avg + 360)
+            else:
+                avg_list.append(np.nan)
+            avg_wsp_list.append(mean(avgwsplist))
+            if ch4_bool:
+                avg_ch4_list.append(mean(avgch4list))
+            avgch4list = [row['ch4']] if ch4_bool else []
+            avgwsplist = [row['wsp']]
+            xlist = [row['x']]
+            ylist = [row['y']]
+            last_ind = ind
+
+    avgdata = pd.DataFrame(fixedind, columns=['index'])
+    avgdata['avg_wdr'] = avg_list
+    avgdata['avg_wsp'] = avg_wsp_list
+    if ch4_bool:
+        avgdata['avg_ch4'] = avg_ch4_list
+    data = pd.merge(data, avgdata, on=['index'], how='outer')
+    data = data.loc[data['bool'] == True]
+    data = data.drop(columns=['x', 'y', 'wsp', 'wdr', 'bool', 'bool2', 'index'] + (['ch4'] if ch4_bool else []))
+    return data.rename(columns={'avg_wdr': 'wdr', 'avg_wsp': 'wsp', 'avg_ch4': 'ch4'})
+
+
+def pairing_case(seed, n=3000, voc_step=10, ch4=False, quadrants=False):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2022-01-01', periods=n, freq='1min')
+    times = times[rng.random(n) > 0.05]
+    met = pd.DataFrame({'time': times, 'wsp': rng.gamma(2, 1.5, len(times)), 'wdr': rng.uniform(0, 360, len(times))})
+    if quadrants:
+        met['wdr'] = rng.choice([0.0, 90.0, 180.0, 270.0], len(times))
+    met.loc[rng.random(len(times)) < 0.01, 'wsp'] = np.nan
+    if ch4:
+        met['ch4'] = rng.normal(1900, 10, len(times))
+    voc_times = (pd.date_range('2022-01-01 00:07', periods=n // voc_step - 2, freq=str(voc_step) + 'min') +
+                 pd.to_timedelta(rng.integers(-40, 40, n // voc_step - 2), 's'))
+    voc = pd.DataFrame({'time': voc_times, 'ethane': rng.random(len(voc_times))})
+    return met, voc
+
+
+@pytest.mark.parametrize('seed, kwargs', [(1, {}), (2, {'ch4': True}), (3, {'voc_step': 5}),
+                                          (4, {'voc_step': 7, 'ch4': True}), (5, {'voc_step': 3}),
+                                          (6, {'quadrants': True})])
+def test_voc_wind_pairing_matches_baseline(seed, kwargs):
+    met, voc = pairing_case(seed, **kwargs)
+    expected = baseline_voc_wind_pairing_func(met.copy(), voc.copy()).reset_index(drop=True)
+    result = voc_wind_pairing_func(met.copy(), voc.copy()).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+    assert result['wdr'].equals(expected['wdr'])
+
+
+def test_voc_wind_pairing_average_wind_columns():
+    met, voc = pairing_case(7)
+    met = met.rename(columns={'wsp': 'wsp_avg_ms', 'wdr': 'wdr_avg'})
+    expected = baseline_voc_wind_pairing_func(met.copy(), voc.copy()).reset_index(drop=True)
+    result = voc_wind_pairing_func(met.copy(), voc.copy()).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)